@@ -0,0 +1,64 @@
+"""Control the handler profiler of a running MPF instance."""
+import argparse
+import asyncio
+
+from terminaltables import AsciiTable
+
+from mpf.commands import MpfCommandLineParser
+from mpf.core.bcp.bcp_socket_client import AsyncioBcpClientSocket
+
+subcommand = True
+
+
+def run_profiler_command(bcp_client, loop, profiler_subcommand, count=20, sort_by="total"):
+    """Send a profiler command via BCP and return the result as text."""
+    bcp_client.send("profiler", {"subcommand": profiler_subcommand, "count": count, "sort_by": sort_by})
+    _, args = loop.run_until_complete(bcp_client.wait_for_response("profiler"))
+    if not args["enabled"]:
+        return "Handler profiling is disabled. Run 'mpf profile start' first.\n"
+
+    data = [["Calls", "Total ms", "Max ms", "Source", "Handler"]]
+    for row in args["handlers"]:
+        data.append([row["count"], row["total"], row["max"], row["source"], row["handler"]])
+
+    return AsciiTable(data).table + "\n"
+
+
+class Command(MpfCommandLineParser):
+
+    """Start, stop, reset or dump the handler profiler of a running machine."""
+
+    def __init__(self, args, path):
+        """Parse args and send profiler command."""
+        super().__init__(args, path)
+
+        parser = argparse.ArgumentParser(description='Profiles event, switch and delay handlers of a running MPF')
+
+        parser.add_argument("subcommand", choices=["start", "stop", "reset", "dump"], nargs="?", default="dump",
+                            help="start/stop profiling, reset all counters or dump the top handlers. "
+                                 "Default is dump")
+
+        parser.add_argument("-n", "--count",
+                            action="store", dest="count", type=int, default=20,
+                            help="Number of handlers to show. Default is 20")
+
+        parser.add_argument("--sort",
+                            action="store", dest="sort_by", choices=["total", "max", "count"], default="total",
+                            help="Sort handlers by total time, max time or call count. Default is total")
+
+        parser.add_argument("--host",
+                            action="store", dest="host", default="localhost",
+                            help="Host of the MPF BCP server. Default is localhost")
+
+        parser.add_argument("--port",
+                            action="store", dest="port", type=int, default=5051,
+                            help="Port of the MPF BCP server. Default is 5051")
+
+        self.args = parser.parse_args(self.argv[1:])
+
+        loop = asyncio.get_event_loop()
+        reader, writer = loop.run_until_complete(asyncio.open_connection(self.args.host, self.args.port))
+        client = AsyncioBcpClientSocket(writer, reader)
+        loop.run_until_complete(client.handshake())
+        print(run_profiler_command(client, loop, self.args.subcommand, self.args.count, self.args.sort_by), end="")
+        writer.close()
@@ -326,6 +326,7 @@ class Command(object):
 
         reader, writer = asyncio.get_event_loop().run_until_complete(asyncio.open_connection("localhost", 5051))
         client = AsyncioBcpClientSocket(writer, reader)
+        asyncio.get_event_loop().run_until_complete(client.handshake())
         cli = ServiceCli(client, asyncio.get_event_loop())
         try:
             cli.cmdloop()
@@ -0,0 +1,315 @@
+"""Command to soak test a machine by simulating games faster than real time."""
+
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import time
+
+import asyncio
+
+from mpf.core.machine import MachineController
+from mpf.core.utility_functions import Util
+from mpf.tests.TestDataManager import TestDataManager
+from mpf.tests.loop import TimeTravelLoop, TestClock
+
+try:
+    import resource
+except ImportError:     # pragma: no cover
+    resource = None
+
+
+class SimulationMachineController(MachineController):
+
+    """Machine controller which runs on a time travel clock.
+
+    The loop skips forward to the next scheduled timer instead of sleeping so
+    the machine runs as fast as the CPU allows. Persistent data (audits, high
+    scores, machine vars) is kept in memory and never written to disk.
+    """
+
+    def __init__(self, mpf_path, machine_path, options, switch_player_config=None):
+        """Initialise simulation machine."""
+        self._switch_player_config = switch_player_config
+        super().__init__(mpf_path, machine_path, options)
+
+    def _load_clock(self):
+        loop = TimeTravelLoop()
+        loop.set_exception_handler(self._exception_handler)
+        return TestClock(loop)
+
+    def create_data_manager(self, config_name):
+        return TestDataManager({})
+
+    def _load_config(self):
+        super()._load_config()
+        if self._switch_player_config and 'switch_player' not in self.config:
+            self.config['switch_player'] = self._switch_player_config
+        self.config.setdefault('smart_virtual', {})['simulate_manual_plunger'] = True
+        # nobody connects to a simulation. do not open any BCP ports
+        self.config.setdefault('bcp', {})['servers'] = {}
+        # loop lag is always zero on the time travel loop
+        self.config.setdefault('loop_monitor', {}).setdefault('enabled', False)
+
+
+class SoakSimulator(object):
+
+    """Plays games on a smart_virtual machine and collects statistics.
+
+    Presses start whenever no game is running and drains balls from the
+    playfield after a random time. Switch activity on the playfield is done by
+    the switch player plugin.
+    """
+
+    # pylint: disable-msg=too-many-arguments
+    def __init__(self, machine, games, seed=None, min_ball_time=5, max_ball_time=60, max_game_time=3600,
+                 progress_callback=None):
+        """Initialise soak simulator."""
+        self.machine = machine
+        self.progress_callback = progress_callback
+        self.games = games
+        self.random = random.Random(seed)
+        self.min_ball_time = min_ball_time
+        self.max_ball_time = max_ball_time
+        self.max_game_time = max_game_time
+        self.log = logging.getLogger("Simulator")
+
+        self.games_started = 0
+        self.games_ended = 0
+        self.balls_drained = 0
+        self.done = asyncio.Future(loop=self.machine.clock.loop)
+
+        self._periodic_task = None
+        self._drain_time = None
+        self._game_start_time = None
+        self._start_time = None
+        self._start_wall_time = None
+        self._start_events = 0
+        self._start_objects = 0
+
+    def start(self):
+        """Fill troughs and start playing games."""
+        self.machine.events.add_handler("game_started", self._game_started)
+        self.machine.events.add_handler("game_ended", self._game_ended)
+
+        self._fill_troughs()
+
+        self._start_time = self.machine.clock.get_time()
+        self._start_wall_time = time.time()
+        self._start_events = self.machine.events.posted_events
+        self._start_objects = len(gc.get_objects())
+        self._periodic_task = self.machine.clock.schedule_interval(self._tick, 1)
+
+    def stop(self, exception=None):
+        """Stop simulation."""
+        if self._periodic_task:
+            self._periodic_task.cancel()
+            self._periodic_task = None
+
+        if self.done.done():
+            return
+
+        if exception:
+            self.done.set_exception(exception)
+        else:
+            self.done.set_result(True)
+
+    def _fill_troughs(self):
+        for trough in self.machine.ball_devices.items_tagged("trough"):
+            if any(self.machine.switch_controller.is_active(switch.name)
+                   for switch in trough.config['ball_switches']):
+                continue
+
+            for switch in trough.config['ball_switches']:
+                self.machine.switch_controller.process_switch(switch.name, 1, logical=True)
+
+    def _game_started(self, **kwargs):
+        del kwargs
+        self.games_started += 1
+        self._game_start_time = self.machine.clock.get_time()
+        self._drain_time = None
+
+    def _game_ended(self, **kwargs):
+        del kwargs
+        self.games_ended += 1
+        self._game_start_time = None
+
+        if self.progress_callback:
+            self.progress_callback(self)
+
+        if self.games_ended >= self.games:
+            self.stop()
+
+    def _tick(self):
+        now = self.machine.clock.get_time()
+
+        if not self.machine.game:
+            self._press_start()
+            return
+
+        if self._game_start_time is not None and now - self._game_start_time > self.max_game_time:
+            self.stop(AssertionError("Game {} did not end within {}s. Machine seems stuck.".format(
+                self.games_started, self.max_game_time)))
+            return
+
+        if self.machine.playfield.balls <= 0:
+            self._drain_time = None
+        elif self._drain_time is None:
+            self._drain_time = now + self.random.uniform(self.min_ball_time, self.max_ball_time)
+        elif now >= self._drain_time:
+            self._drain_time = None
+            self._drain_ball()
+
+    def _press_start(self):
+        for switch in self.machine.switches.items_tagged("start"):
+            self.machine.switch_controller.process_switch(switch.name, 1, logical=True)
+            self.machine.switch_controller.process_switch(switch.name, 0, logical=True)
+
+    def _drain_ball(self):
+        drains = self.machine.ball_devices.items_tagged("drain") or self.machine.ball_devices.items_tagged("trough")
+        for device in drains:
+            if device.balls < device.config['ball_capacity']:
+                self.balls_drained += 1
+                self.machine.hardware_platforms['smart_virtual'].add_ball_to_device(device)
+                return
+
+        self.log.warning("Could not drain ball. All drain devices are full.")
+
+    def get_report(self):
+        """Return statistics of the simulation so far."""
+        simulated_time = self.machine.clock.get_time() - self._start_time
+        wall_time = max(time.time() - self._start_wall_time, 1e-6)
+        events = self.machine.events.posted_events - self._start_events
+
+        return {
+            "games": self.games_ended,
+            "balls_drained": self.balls_drained,
+            "simulated_seconds": simulated_time,
+            "wall_seconds": wall_time,
+            "speedup": simulated_time / wall_time,
+            "games_per_hour": self.games_ended / wall_time * 3600,
+            "events": events,
+            "events_per_second": events / wall_time,
+            "object_growth": len(gc.get_objects()) - self._start_objects,
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+        }
+
+    @staticmethod
+    def format_report(report):
+        """Return a human readable report."""
+        return ("Games: {games} ({games_per_hour:.0f} games/hour). Simulated {simulated_seconds:.0f}s in "
+                "{wall_seconds:.1f}s ({speedup:.0f}x). Events: {events} ({events_per_second:.0f}/s). "
+                "Object growth: {object_growth}. Peak RSS: {peak_rss_kb}kB".format(**report))
+
+
+class Command(object):
+
+    """Runs a headless soak simulation."""
+
+    def __init__(self, mpf_path, machine_path, args):
+        """Run simulation."""
+        parser = argparse.ArgumentParser(description='Simulates games on the smart_virtual platform')
+
+        parser.add_argument("-c",
+                            action="store", dest="configfile",
+                            default="config.yaml", metavar='config_file',
+                            help="The name of a config file to load. Default "
+                                 "is config.yaml. Multiple files can be used "
+                                 "via a comma-separated list (no spaces between)")
+
+        parser.add_argument("-C",
+                            action="store", dest="mpfconfigfile",
+                            default=os.path.join(mpf_path, "mpfconfig.yaml"),
+                            metavar='config_file',
+                            help="The MPF framework default config file. Default is mpf/mpfconfig.yaml")
+
+        parser.add_argument("-g", "--games",
+                            action="store", dest="games", type=int, default=1000,
+                            help="Number of games to play. Default is 1000")
+
+        parser.add_argument("-s", "--seed",
+                            action="store", dest="seed", type=int, default=None,
+                            help="Seed for the random number generator to make runs reproducible")
+
+        parser.add_argument("--ball-time",
+                            action="store", dest="ball_time", default="5-60",
+                            help="Range of seconds a ball stays on the playfield before it drains. "
+                                 "Default is 5-60")
+
+        parser.add_argument("--switch-tags",
+                            action="store", dest="switch_tags", default="playfield_active",
+                            help="Tags of switches which are hit randomly while a ball is on the "
+                                 "playfield. Default is playfield_active. Ignored when the machine "
+                                 "config contains a switch_player section")
+
+        parser.add_argument("--report-interval",
+                            action="store", dest="report_interval", type=int, default=100,
+                            help="Print statistics every n games. Default is 100")
+
+        parser.add_argument("-v",
+                            action="store_const", dest="loglevel",
+                            const=logging.DEBUG, default=logging.WARNING,
+                            help="Enables verbose logging to the console")
+
+        self.args = parser.parse_args(args)
+
+        logging.basicConfig(level=self.args.loglevel, format='%(levelname)s : %(name)s : %(message)s')
+
+        min_ball_time, max_ball_time = (float(x) for x in self.args.ball_time.split("-"))
+
+        options = {
+            'force_platform': 'smart_virtual',
+            'mpfconfigfile': self.args.mpfconfigfile,
+            'configfile': Util.string_to_list(self.args.configfile),
+            'bcp': False,
+            'no_load_cache': False,
+            'create_config_cache': True,
+            'text_ui': False,
+            'production': False,
+            'force_assets_load': False,
+        }
+
+        switch_player_config = {
+            'start_event': 'game_started',
+            'random_switch_tags': self.args.switch_tags,
+            'random_seed': self.args.seed,
+        }
+
+        machine = SimulationMachineController(mpf_path, machine_path, options, switch_player_config)
+        machine.initialise_mpf()
+
+        simulator = SoakSimulator(machine, self.args.games, self.args.seed, min_ball_time, max_ball_time,
+                                  progress_callback=self._print_progress)
+        simulator.start()
+
+        try:
+            machine.clock.loop.run_until_complete(Util.first([simulator.done, machine.stop_future],
+                                                             loop=machine.clock.loop, cancel_others=False))
+        except KeyboardInterrupt:
+            pass
+
+        print("Result: " + SoakSimulator.format_report(simulator.get_report()))
+
+        self._cancel_pending_tasks(machine.clock.loop)
+        machine.shutdown()
+
+        if machine._exception:     # pylint: disable-msg=protected-access
+            raise machine._exception['exception']   # pylint: disable-msg=protected-access
+
+        if simulator.done.done() and simulator.done.exception():
+            print(simulator.done.exception())
+            sys.exit(1)
+
+    @staticmethod
+    def _cancel_pending_tasks(loop):
+        """Cancel all tasks which are still running in the machine."""
+        tasks = [task for task in asyncio.Task.all_tasks(loop=loop) if not task.done()]
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, loop=loop, return_exceptions=True))
+
+    def _print_progress(self, simulator):
+        if self.args.report_interval and simulator.games_ended % self.args.report_interval == 0:
+            print(SoakSimulator.format_report(simulator.get_report()))
@@ -1,34 +1,247 @@
+"""Run MPF doc tests and unit tests from cli."""
 import argparse
-import unittest
+import fnmatch
+import hashlib
+import io
+import json
+import multiprocessing
+import os
 import sys
+import tempfile
+import time
+import unittest
 
 from mpf.commands import MpfCommandLineParser
+from mpf.core.config_validator import ConfigValidator
 from mpf.tests.MpfDocTestCase import MpfDocTestCase
 
 subcommand = True
 
 
+
+def get_durations_filename(paths) -> str:
+    """Return the file in the temp dir which stores the durations of the tests in paths."""
+    paths_key = "\n".join(sorted(os.path.abspath(path) for path in paths))
+    paths_hash = hashlib.md5(bytes(paths_key, 'UTF-8')).hexdigest()
+    return os.path.join(tempfile.gettempdir(), paths_hash + ".mpf_test_durations")
+
+
+def _init_worker(sys_path):
+    """Prepare a worker process which is reused for many tests."""
+    sys.path[:] = sys_path
+    # load the config spec once per worker instead of once per test
+    if not ConfigValidator.config_spec:
+        ConfigValidator.load_config_spec()
+
+
+def _load_task(task):
+    """Return test suite for a task."""
+    kind, name = task
+    if kind == "doc":
+        with open(name) as f:
+            test_string = f.read()
+        return unittest.TestSuite([MpfDocTestCase(config_string=test_string)])
+
+    return unittest.defaultTestLoader.loadTestsFromName(name)
+
+
+def run_task(task, verbosity=1, stream=None):
+    """Run one task (a doc test file or a test class) and return a picklable summary.
+
+    The output of the test runner is written to stream. Without stream it is
+    captured and returned in the summary.
+    """
+    captured = io.StringIO() if stream is None else None
+    start = time.time()
+    try:
+        suite = _load_task(task)
+    except Exception as e:     # pylint: disable-msg=broad-except
+        return {"task": task[1], "duration": time.time() - start, "tests_run": 1, "skipped": 0,
+                "failures": [], "errors": [(task[1], "Could not load test: {}".format(e))], "output": ""}
+
+    result = unittest.TextTestRunner(stream=stream or captured, verbosity=verbosity).run(suite)
+    return {
+        "task": task[1],
+        "duration": time.time() - start,
+        "tests_run": result.testsRun,
+        "skipped": len(result.skipped),
+        "failures": [(str(test), text) for test, text in result.failures],
+        "errors": [(str(test), text) for test, text in result.errors],
+        "output": captured.getvalue() if captured else "",
+    }
+
+
+def _iterate_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iterate_tests(test)
+        else:
+            yield test
+
+
+def collect_tasks(paths, doc_pattern="*.yaml"):
+    """Return tasks for paths.
+
+    Python test modules and directories are sharded by test class. Directories
+    and their subdirectories are also searched for doc tests (files matching
+    doc_pattern). Any other file is a doc test.
+    """
+    tasks = []
+    for path in paths:
+        # use a new loader for every path because discover() remembers the top level dir
+        if os.path.isdir(path):
+            suite = unittest.TestLoader().discover(os.path.abspath(path))
+            for subdir, dirs, files in os.walk(path):
+                dirs.sort()
+                for file_name in sorted(files):
+                    if fnmatch.fnmatch(file_name, doc_pattern):
+                        tasks.append(("doc", os.path.join(subdir, file_name)))
+        elif path.endswith(".py"):
+            suite = unittest.TestLoader().discover(os.path.dirname(os.path.abspath(path)),
+                                                        pattern=os.path.basename(path))
+        else:
+            tasks.append(("doc", path))
+            continue
+
+        for test in _iterate_tests(suite):
+            task = ("unittest", "{}.{}".format(test.__class__.__module__, test.__class__.__qualname__))
+            if isinstance(test, unittest.loader._FailedTest):     # pylint: disable-msg=protected-access
+                task = ("unittest", test.id())
+            if task not in tasks:
+                tasks.append(task)
+
+    return tasks
+
+
+def order_by_duration(tasks, durations):
+    """Order tasks longest first so that short tasks fill the gaps at the end.
+
+    Tasks without a recorded duration are assumed to be long.
+    """
+    unknown = max(durations.values()) if durations else 0
+    return sorted(tasks, key=lambda task: -durations.get(task[1], unknown + 1))
+
+
+def _load_durations(durations_file):
+    try:
+        with open(durations_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_durations(durations_file, durations):
+    try:
+        with open(durations_file, "w") as f:
+            json.dump(durations, f, indent=1, sort_keys=True)
+    except OSError as e:
+        print("Could not save durations to {}: {}".format(durations_file, e))
+
+
+def report(results, jobs, wall_time, print_failures=True):
+    """Print merged results and timing.
+
+    Set print_failures to False if the test runner already printed failures.
+    """
+    tests_run = sum(result["tests_run"] for result in results)
+    skipped = sum(result["skipped"] for result in results)
+    failures = [failure for result in results for failure in result["failures"]]
+    errors = [error for result in results for error in result["errors"]]
+    test_time = sum(result["duration"] for result in results)
+
+    for result in results:
+        if result["output"]:
+            print(result["output"])
+
+    for kind, entries in (("ERROR", errors), ("FAIL", failures)):
+        for test, text in entries if print_failures else []:
+            print("=" * 70)
+            print("{}: {}".format(kind, test))
+            print("-" * 70)
+            print(text)
+
+    print("-" * 70)
+    print("Slowest tasks:")
+    for result in sorted(results, key=lambda x: -x["duration"])[:5]:
+        print("  {:6.2f}s {}".format(result["duration"], result["task"]))
+
+    print("Ran {} tests in {} tasks on {} worker(s) in {:.2f}s (test time {:.2f}s)".format(
+        tests_run, len(results), jobs, wall_time, test_time))
+
+    if failures or errors:
+        print("FAILED (failures={}, errors={}, skipped={})".format(len(failures), len(errors), skipped))
+        return False
+
+    print("OK (skipped={})".format(skipped))
+    return True
+
+
+# pylint: disable-msg=too-many-arguments
+def run_tests(paths, jobs=1, verbose=False, durations_file=None, doc_pattern="*.yaml") -> bool:
+    """Run all tests in paths and print a merged report. Return true on success.
+
+    jobs is the number of worker processes. 0 starts one per CPU. Durations are
+    stored in the temp dir unless durations_file is set.
+    """
+    start = time.time()
+    if not durations_file:
+        durations_file = get_durations_filename(paths)
+    tasks = collect_tasks(paths, doc_pattern)
+    durations = _load_durations(durations_file)
+    tasks = order_by_duration(tasks, durations)
+
+    verbosity = 2 if verbose else 1
+    jobs = jobs or multiprocessing.cpu_count()
+    jobs = max(1, min(jobs, len(tasks)))
+
+    if jobs == 1:
+        # a single worker writes its output right away like unittest does
+        results = [run_task(task, verbosity, sys.stderr) for task in tasks]
+    else:
+        pool = multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(list(sys.path),))
+        try:
+            results = pool.starmap(run_task, [(task, verbosity) for task in tasks], chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    for result in results:
+        durations[result["task"]] = round(result["duration"], 3)
+    _save_durations(durations_file, durations)
+
+    return report(results, jobs, time.time() - start, print_failures=jobs > 1)
+
+
 class Command(MpfCommandLineParser):
 
-    """Run a text unit test from cli."""
+    """Run doc tests and unit tests from cli. Optionally in parallel."""
 
     def __init__(self, args, path):
-        """Parse args."""
+        """Parse args and run tests."""
         super().__init__(args, path)
-        test_file = self.argv.pop(1)
 
-        parser = argparse.ArgumentParser(description='MPF Command')
+        parser = argparse.ArgumentParser(description='Runs MPF tests')
+
+        parser.add_argument("paths", nargs="+",
+                            help="Doc test files, python test modules or directories with tests")
 
         parser.add_argument("-v", help="verbose",
                             default=False, action="store_true", dest="verbose")
-        args = parser.parse_args(self.argv[1:])
 
-        with open(test_file) as f:
-            test_string = f.read()
+        parser.add_argument("-j", "--jobs",
+                            action="store", dest="jobs", type=int, default=1,
+                            help="Number of worker processes. 0 uses one per CPU. Default is 1")
+
+        parser.add_argument("--durations",
+                            action="store", dest="durations_file", default=None,
+                            help="File to read and store test durations which are used to balance "
+                                 "the workers. Default is a file per set of paths in the temp dir")
+
+        parser.add_argument("--doc-pattern",
+                            action="store", dest="doc_pattern", default="*.yaml",
+                            help="Pattern of doc test files in directories. Default is *.yaml")
 
-        test = MpfDocTestCase(config_string=test_string)
-        suite = unittest.TestSuite()
-        suite.addTest(test)
-        result = unittest.TextTestRunner(verbosity=1 if not args.verbose else 99).run(suite)
+        self.args = parser.parse_args(self.argv[1:])
 
-        sys.exit(not result.wasSuccessful())
+        sys.exit(not run_tests(self.args.paths, self.args.jobs, self.args.verbose, self.args.durations_file,
+                               self.args.doc_pattern))
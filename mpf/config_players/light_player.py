@@ -13,7 +13,36 @@ class LightPlayer(DeviceConfigPlayer):
     show_section = 'lights'
     machine_collection_name = 'lights'
 
-    __slots__ = []
+    __slots__ = ["_light_name_cache", "_light_name_cache_version"]
+
+    def __init__(self, machine):
+        """Initialise light player."""
+        super().__init__(machine)
+        self._light_name_cache = {}
+        self._light_name_cache_version = None
+
+    def _get_lights_by_name(self, light_name):
+        """Return lights for a light name or tag.
+
+        Results are cached until lights are added or removed or tags change.
+        """
+        lights_collection = self.machine.lights
+        if self._light_name_cache_version != lights_collection.index_version:
+            self._light_name_cache = {}
+            self._light_name_cache_version = lights_collection.index_version
+
+        try:
+            return self._light_name_cache[light_name]
+        except KeyError:
+            pass
+
+        try:
+            lights = [lights_collection[light_name]]
+        except KeyError:
+            lights = lights_collection.items_tagged(light_name)
+
+        self._light_name_cache[light_name] = lights
+        return lights
 
     def play(self, settings, context, calling_context, priority=0, **kwargs):
         """Set light color based on config."""
@@ -55,10 +84,7 @@ class LightPlayer(DeviceConfigPlayer):
                 self._light_remove(light, instance_dict, full_context, s.get("fade_ms", None))
 
     def _light_remove_named(self, light_name, instance_dict, full_context, fade_ms):
-        try:
-            lights = [self.machine.lights[light_name]]
-        except KeyError:
-            lights = self.machine.lights.items_tagged(light_name)
+        lights = self._get_lights_by_name(light_name)
 
         for light in lights:
             self._light_remove(light, instance_dict, full_context, fade_ms)
@@ -80,10 +106,7 @@ class LightPlayer(DeviceConfigPlayer):
 
     def _light_named_color(self, light_name, instance_dict,
                            full_context, color, **s):
-        try:
-            lights = [self.machine.lights[light_name]]
-        except KeyError:
-            lights = self.machine.lights.items_tagged(light_name)
+        lights = self._get_lights_by_name(light_name)
 
         if not lights:
             raise AssertionError("Could not find light or tag {} in {}".format(light_name, full_context))
@@ -0,0 +1,132 @@
+"""Scans asset folders and caches the directory listings in a manifest."""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MYPY = False
+if MYPY:   # pragma: no cover
+    from typing import Dict, Iterable, List, Optional, Tuple
+
+MANIFEST_VERSION = 1
+
+# directories modified less than this many seconds before they were listed are
+# listed again on the next scan because a change in the same mtime tick would
+# go unnoticed
+RACY_SECONDS = 2
+
+
+class AssetDirectoryScanner(object):
+
+    """Walks asset folders and remembers the listing of every directory.
+
+    A directory is listed again only if its mtime or inode changed since it was
+    last listed. Unchanged directories are only stat'ed. Multiple roots are
+    scanned in parallel.
+    """
+
+    __slots__ = ["manifest_file", "max_workers", "_manifest", "_new_manifest", "dirs_listed", "dirs_reused", "log"]
+
+    def __init__(self, manifest_file: "Optional[str]" = None, max_workers: int = 4) -> None:
+        """Initialise scanner with an empty manifest."""
+        self.manifest_file = manifest_file
+        self.max_workers = max_workers
+        self._manifest = dict()         # type: Dict[str, Tuple[Optional[Tuple[int, int]], List[str], List[str]]]
+        self._new_manifest = dict()     # type: Dict[str, Tuple[Optional[Tuple[int, int]], List[str], List[str]]]
+        self.dirs_listed = 0
+        self.dirs_reused = 0
+        self.log = logging.getLogger("AssetDirectoryScanner")
+
+    @staticmethod
+    def get_manifest_filename(machine_path: str) -> str:
+        """Return manifest file name for a machine folder."""
+        path_hash = hashlib.md5(bytes(os.path.abspath(machine_path), 'UTF-8')).hexdigest()
+        return os.path.join(tempfile.gettempdir(), path_hash + ".mpf_asset_manifest")
+
+    def load(self) -> bool:
+        """Load manifest from disk. Return True if it could be loaded."""
+        if not self.manifest_file or not os.path.isfile(self.manifest_file):
+            return False
+
+        with open(self.manifest_file, 'rb') as f:
+            try:
+                data = pickle.load(f)
+            # unfortunately pickle can raise all kinds of exceptions and we dont want to crash on corrupted cache
+            # pylint: disable-msg=broad-except
+            except Exception:   # pragma: no cover
+                self.log.warning("Could not load asset manifest: %s", self.manifest_file)
+                return False
+
+        if not isinstance(data, tuple) or len(data) != 2 or data[0] != MANIFEST_VERSION:
+            return False
+
+        self._manifest = data[1]
+        return True
+
+    def save(self) -> None:
+        """Store all directories scanned since the last save to disk."""
+        if not self.manifest_file:
+            return
+
+        with open(self.manifest_file, 'wb') as f:
+            pickle.dump((MANIFEST_VERSION, self._new_manifest), f, protocol=4)
+        self.log.debug("Asset manifest stored: %s. Listed %s directories. Reused %s.", self.manifest_file,
+                       self.dirs_listed, self.dirs_reused)
+
+    def _list_dir(self, path: str) -> "Optional[Tuple[List[str], List[str]]]":
+        """Return subfolders and files of a directory or None if it does not exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        key = (stat.st_mtime_ns, stat.st_ino)
+        entry = self._manifest.get(path)
+        if entry and entry[0] == key:
+            self.dirs_reused += 1
+            self._new_manifest[path] = entry
+            return entry[1], entry[2]
+
+        # uses scandir when available
+        listing = next(os.walk(path), None)
+        if listing is None:
+            return None
+        self.dirs_listed += 1
+
+        if time.time() - stat.st_mtime < RACY_SECONDS:
+            key = None
+        self._new_manifest[path] = (key, listing[1], listing[2])
+        return listing[1], listing[2]
+
+    def scan(self, root_path: str) -> "List[Tuple[str, Optional[str], List[str]]]":
+        """Walk a folder top-down and following links like os.walk.
+
+        Returns a list of (path, first level subfolder, files). The first level
+        subfolder is None for files in root_path.
+        """
+        result = []
+        stack = [(root_path, None)]     # type: List[Tuple[str, Optional[str]]]
+        while stack:
+            path, first_level_subfolder = stack.pop()
+            listing = self._list_dir(path)
+            if listing is None:
+                continue
+            dirs, files = listing
+            result.append((path, first_level_subfolder, files))
+            for directory in reversed(dirs):
+                stack.append((os.path.join(path, directory),
+                              directory if first_level_subfolder is None else first_level_subfolder))
+
+        return result
+
+    def scan_all(self, root_paths: "Iterable[str]") -> "Dict[str, List[Tuple[str, Optional[str], List[str]]]]":
+        """Scan multiple folders in parallel and return the listing of every root."""
+        root_paths = list(set(root_paths))
+        if len(root_paths) < 2 or self.max_workers < 2:
+            return {root_path: self.scan(root_path) for root_path in root_paths}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(root_paths, executor.map(self.scan, root_paths)))
@@ -1,16 +1,19 @@
 """Contains AssetManager, AssetLoader, and Asset base classes."""
 import copy
+import heapq
 import os
 import random
 import threading
-from collections import deque, namedtuple
-from pathlib import PurePath
+from collections import deque, namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import asyncio
 
-from typing import Iterable, Optional, Set, Callable, Tuple
+from typing import Dict, Iterable, Optional, Set, Callable, Tuple
 from typing import List
 
+from mpf.core.asset_manifest import AssetDirectoryScanner
 from mpf.core.mode import Mode
 
 from mpf.core.machine import MachineController
@@ -30,8 +33,9 @@ class BaseAssetManager(MpfController, LogMixin):
     module_name = 'AssetManager'
     config_name = 'asset_manager'
 
-    __slots__ = ["_asset_classes", "num_assets_to_load", "num_assets_loaded", "num_bcp_assets_to_load",
-                 "num_bcp_assets_loaded", "_next_id", "_last_asset_event_time"]
+    __slots__ = ["_asset_classes", "_assets_by_load_key", "_scanner", "_folder_listings", "num_assets_to_load",
+                 "num_assets_loaded", "num_bcp_assets_to_load", "num_bcp_assets_loaded", "_next_id",
+                 "_last_asset_event_time"]
 
     def __init__(self, machine: MachineController) -> None:
         """Initialise asset manager.
@@ -47,6 +51,14 @@ class BaseAssetManager(MpfController, LogMixin):
         # List of dicts, with each dict being an asset class. See
         # register_asset_class() method for details.
 
+        self._assets_by_load_key = dict()   # type: Dict[str, Dict[Asset, None]]
+        # Index of load: key -> ordered set of assets with that key. Kept up
+        # to date by add_asset() and remove_asset().
+
+        self._scanner = AssetDirectoryScanner()
+        self._folder_listings = dict()      # type: Dict[str, List[Tuple[str, Optional[str], List[str]]]]
+        # Listings of all asset folders. Scanned in parallel on boot.
+
         self.num_assets_to_load = 0
         # Total number of assets that are/will be loaded. Used for
         # calculating progress. Reset to 0 when num_assets_loaded matches it.
@@ -193,8 +205,9 @@ class BaseAssetManager(MpfController, LogMixin):
             force_assets_load = False
 
         # Called once on boot to create all the asset objects
-        # Create the machine-wide assets
+        self._scan_asset_folders()
 
+        # Create the machine-wide assets
         self._create_assets_from_disk(config=self.machine.machine_config)
         self._create_asset_groups(config=self.machine.machine_config)
 
@@ -203,13 +216,15 @@ class BaseAssetManager(MpfController, LogMixin):
             self._create_assets_from_disk(config=mode.config, mode=mode)
             self._create_asset_groups(config=mode.config, mode=mode)
 
-        # load the assets marked for preload:
-        preload_assets = list()
+        self._folder_listings = dict()
 
-        for ac in self._asset_classes:
-            preload_assets.extend(
-                [x for x in getattr(self.machine, ac.attribute).values() if
-                 x.config['load'] == 'preload' or force_assets_load])
+        # load the assets marked for preload:
+        if force_assets_load:
+            preload_assets = list()
+            for ac in self._asset_classes:
+                preload_assets.extend(getattr(self.machine, ac.attribute).values())
+        else:
+            preload_assets = list(self._assets_by_load_key.get('preload', []))
 
         wait_for_assets = False
         for asset in preload_assets:
@@ -219,6 +234,23 @@ class BaseAssetManager(MpfController, LogMixin):
         if not wait_for_assets:
             self.machine.clear_boot_hold('assets')
 
+    def _scan_asset_folders(self) -> None:
+        """Scan the asset folders of the machine and all modes in parallel.
+
+        Unchanged directories are taken from the manifest of the last boot.
+        """
+        self._scanner = AssetDirectoryScanner(
+            AssetDirectoryScanner.get_manifest_filename(self.machine.machine_path))
+        if not self.machine.options['no_load_cache']:
+            self._scanner.load()
+
+        paths = [self.machine.machine_path] + [mode.path for mode in self.machine.modes.values()]
+        self._folder_listings = self._scanner.scan_all(
+            os.path.join(path, ac.path_string) for path in paths for ac in self._asset_classes)
+
+        if self.machine.options['create_config_cache']:
+            self._scanner.save()
+
     def _create_assets_from_disk(self, config: dict, mode: Optional[Mode] = None) -> dict:
         """Walk a folder (and subfolders) and finds all the assets.
 
@@ -314,10 +346,10 @@ class BaseAssetManager(MpfController, LogMixin):
                     self.error_log(msg)
                     raise FileNotFoundError(msg)
 
-                getattr(self.machine, ac.attribute)[asset] = ac.cls(
+                self.add_asset(ac.attribute, asset, ac.cls(
                     self.machine, name=asset,
                     file=config[ac.disk_asset_section][asset]['file'],
-                    config=config[ac.disk_asset_section][asset])
+                    config=config[ac.disk_asset_section][asset]))
 
         return config
 
@@ -383,17 +415,14 @@ class BaseAssetManager(MpfController, LogMixin):
         # do not get fooled by windows or mac garbage
         ignore_files = ("desktop.ini", "Thumbs.db")
 
-        # walk files in the asset root directory (include all subfolders)
-        for this_path, _, files in os.walk(root_path, followlinks=True):
-            # Determine the first-level sub-folder of the current path relative to the
-            # asset root path.  The first level sub-folder is used to determine the
-            # default asset keys based on the assets config section.
-            relative_path = PurePath(this_path).relative_to(root_path)
-            if relative_path.parts:
-                first_level_subfolder = relative_path.parts[0]
-            else:
-                first_level_subfolder = None
+        listing = self._folder_listings.get(root_path)
+        if listing is None:
+            listing = self._scanner.scan(root_path)
 
+        # walk files in the asset root directory (include all subfolders). The
+        # first level sub-folder is used to determine the default asset keys
+        # based on the assets config section.
+        for this_path, first_level_subfolder, files in listing:
             valid_files = [f for f in files if f.endswith(
                            asset_class.extensions) and not f.startswith(ignore_prefixes) and f != ignore_files]
 
@@ -464,9 +493,46 @@ class BaseAssetManager(MpfController, LogMixin):
 
             if ac.pool_config_section in config:
                 for name, settings in config[ac.pool_config_section].items():
-                    getattr(self.machine, ac.attribute)[name] = (
-                        ac.cls.asset_group_class(self.machine, name, settings,
-                                                 ac.cls))
+                    self.add_asset(ac.attribute, name, ac.cls.asset_group_class(self.machine, name, settings,
+                                                                                ac.cls))
+
+    def add_asset(self, attribute: str, name: str, asset) -> None:
+        """Add an asset (or asset pool) to the machine and index it by its load key.
+
+        An existing asset with the same name is replaced.
+
+        Args:
+            attribute: Name of the machine attribute dict of the asset class.
+                e.g. 'images'
+            name: Name of the asset.
+            asset: The asset object.
+        """
+        self.remove_asset(attribute, name)
+        getattr(self.machine, attribute)[name] = asset
+        key = asset.config['load']
+        if key not in self._assets_by_load_key:
+            self._assets_by_load_key[key] = OrderedDict()
+        self._assets_by_load_key[key][asset] = None
+
+    def remove_asset(self, attribute: str, name: str) -> None:
+        """Remove an asset from the machine and from the load key index.
+
+        Args:
+            attribute: Name of the machine attribute dict of the asset class.
+            name: Name of the asset.
+        """
+        asset = getattr(self.machine, attribute).pop(name, None)
+        if asset is None:
+            return
+        assets = self._assets_by_load_key.get(asset.config['load'])
+        if assets is not None:
+            assets.pop(asset, None)
+            if not assets:
+                del self._assets_by_load_key[asset.config['load']]
+
+    def get_assets_by_load_key(self, key_name: str) -> List["Asset"]:
+        """Return all assets (and asset pools) with a given load key."""
+        return list(self._assets_by_load_key.get(key_name, []))
 
     def _load_mode_assets(self, config, priority: int, mode: Mode) -> \
             Tuple[Callable[[Iterable["Asset"]], None], Set["Asset"]]:
@@ -483,17 +549,13 @@ class BaseAssetManager(MpfController, LogMixin):
 
         Args:
             key_name: String of the load: key name.
+            priority: Priority of the caller (e.g. of the mode). It is added
+                to the priority of every asset.
         """
-        del priority
         assets = set()
-        # loop through all the registered assets of each class and look for
-        # this key name
-        for ac in self._asset_classes:
-            asset_objects = getattr(self.machine, ac.attribute).values()
-            for asset in [x for x in asset_objects if
-                          x.config['load'] == key_name]:
-                asset.load()
-                assets.add(asset)
+        for asset in self.get_assets_by_load_key(key_name):
+            asset.load(priority=priority + asset.config.get('priority', 0))
+            assets.add(asset)
 
         return assets
 
@@ -512,6 +574,10 @@ class BaseAssetManager(MpfController, LogMixin):
         """Load an asset."""
         raise NotImplementedError("implement")
 
+    def update_asset_priority(self, asset: "Asset") -> None:
+        """Handle that the priority of an asset which is loading has been raised."""
+        pass
+
     def _bcp_client_asset_load(self, total, remaining, **kwargs):
         # Callback for the BCP assets_to_load command which tracks asset
         # loading from a connected BCP client.
@@ -628,6 +694,187 @@ class AsyncioSyncAssetManager(BaseAssetManager):
         future.result()
 
 
+class AssetLoader(object):
+
+    """Loads assets in the order of their priority with a limited number of concurrent loads.
+
+    With an executor do_load() runs in the executor. Otherwise every asset is
+    loaded in its own callback on the loop. callback is called on the loop
+    with the asset and whether the load has been cancelled.
+    """
+
+    __slots__ = ["_loop", "_executor", "max_concurrent", "_callback", "_queue", "_queued", "_running",
+                 "_cancelled", "_sequence"]
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_concurrent: int,
+                 callback: Callable[["Asset", bool], None], executor=None) -> None:
+        """Initialise empty loader."""
+        self._loop = loop
+        self._executor = executor
+        self.max_concurrent = max(1, max_concurrent)
+        self._callback = callback
+        self._queue = []            # type: List[List]
+        self._queued = {}           # type: Dict[Asset, List]
+        self._running = set()       # type: Set[Asset]
+        self._cancelled = set()     # type: Set[Asset]
+        self._sequence = 0
+
+    def add(self, asset: "Asset") -> bool:
+        """Queue asset for loading.
+
+        Returns False if the asset was already queued or loading.
+        """
+        if asset in self._running:
+            # a cancelled load which is still running is used again
+            self._cancelled.discard(asset)
+            return False
+
+        if asset in self._queued:
+            self.update_priority(asset)
+            return False
+
+        self._push(asset)
+        self._start_loads()
+        return True
+
+    def _push(self, asset):
+        self._sequence += 1
+        # higher priority first. same priority in the order they were added
+        entry = [-asset.priority, self._sequence, asset]
+        self._queued[asset] = entry
+        heapq.heappush(self._queue, entry)
+
+    def update_priority(self, asset: "Asset") -> None:
+        """Move a queued asset according to its current priority."""
+        entry = self._queued.get(asset)
+        if entry and entry[0] != -asset.priority:
+            entry[2] = None
+            self._push(asset)
+
+    def cancel(self, asset: "Asset") -> bool:
+        """Cancel the load of an asset.
+
+        Queued assets are removed from the queue and True is returned. Assets
+        which are loading are handed to callback as cancelled when they are
+        done.
+        """
+        entry = self._queued.pop(asset, None)
+        if entry:
+            entry[2] = None
+            return True
+
+        if asset in self._running:
+            self._cancelled.add(asset)
+        return False
+
+    def is_running(self, asset: "Asset") -> bool:
+        """Return true if the asset is loading right now."""
+        return asset in self._running
+
+    def get_queued_count(self) -> int:
+        """Return the number of queued assets."""
+        return len(self._queued)
+
+    def get_running_count(self) -> int:
+        """Return the number of assets which are loading right now."""
+        return len(self._running)
+
+    def _start_loads(self):
+        while self._queue and len(self._running) < self.max_concurrent:
+            asset = heapq.heappop(self._queue)[2]
+            if asset is None:
+                continue
+
+            del self._queued[asset]
+            self._running.add(asset)
+            if self._executor:
+                future = self._loop.run_in_executor(self._executor, asset.do_load)
+                future.add_done_callback(partial(self._executor_done, asset))
+            else:
+                self._loop.call_soon(self._load_inline, asset)
+
+    def _load_inline(self, asset):
+        try:
+            asset.do_load()
+        finally:
+            self._finish(asset)
+
+    def _executor_done(self, asset, future):
+        self._finish(asset)
+        # raise exceptions from do_load
+        future.result()
+
+    def _finish(self, asset):
+        self._running.discard(asset)
+        cancelled = asset in self._cancelled
+        self._cancelled.discard(asset)
+        self._start_loads()
+        self._callback(asset, cancelled)
+
+
+class AsyncioThreadedAssetManager(BaseAssetManager):
+
+    """AssetManager which loads assets in a thread pool ordered by priority.
+
+    Assets of a mode are loaded with the priority of the mode so assets of a
+    higher priority mode are loaded first. Loads of assets which are unloaded
+    before they finished (e.g. because their mode stopped) are cancelled.
+    """
+
+    __slots__ = ["loader", "_executor"]
+
+    def __init__(self, machine: MachineController) -> None:
+        """Initialise asset manager and loader."""
+        super().__init__(machine)
+        self.machine.validate_machine_config_section('asset_manager')
+        config = self.machine.config['asset_manager']
+        if config['load_in_threads']:
+            self._executor = ThreadPoolExecutor(max_workers=config['max_concurrent_loads'])
+        else:
+            self._executor = None
+        self.loader = AssetLoader(self.machine.clock.loop, config['max_concurrent_loads'], self._asset_done,
+                                  self._executor)
+        self.machine.events.add_handler('shutdown', self._shutdown)
+
+    def _shutdown(self, **kwargs):
+        del kwargs
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+    def load_asset(self, asset):
+        """Queue an asset for loading."""
+        if self.loader.add(asset):
+            self.num_assets_to_load += 1
+
+    def update_asset_priority(self, asset):
+        """Move an asset in the queue after its priority has been raised."""
+        self.loader.update_priority(asset)
+
+    def unload_assets(self, assets: Iterable["Asset"]) -> None:
+        """Cancel loads and unload multiple assets."""
+        for asset in assets:
+            if self.loader.cancel(asset):
+                # never started loading. nothing to unload
+                asset.loading = False
+                self.num_assets_loaded += 1
+                self._post_loading_event()
+            elif self.loader.is_running(asset):
+                # _asset_done() unloads it once the running load finished. loading it again revives the load
+                asset.loading = False
+            else:
+                asset.unload()
+
+    def _asset_done(self, asset, cancelled):
+        if cancelled:
+            # unloaded while loading. free what has been loaded
+            asset.unload()
+        else:
+            asset.is_loaded()
+
+        self.num_assets_loaded += 1
+        self._post_loading_event()
+
+
 # pylint: disable=too-many-instance-attributes
 class AssetPool(object):
 
@@ -924,6 +1171,9 @@ class Asset(object):
             # Add the supplied callback before returning
             if callback:
                 self._callbacks.add(callback)
+            if priority is not None and priority > self.priority:
+                self.priority = priority
+                self.machine.asset_manager.update_asset_priority(self)
             return False
 
         if priority is not None:
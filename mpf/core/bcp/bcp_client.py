@@ -5,6 +5,25 @@ import asyncio
 
 from mpf.core.mpf_controller import MpfController
 
+SEND_PRIORITY_CONTROL = 0
+SEND_PRIORITY_MONITOR = 1
+SEND_PRIORITY_FRAME = 2
+
+SEND_PRIORITY_NAMES = ("control", "monitor", "frames")
+
+# commands which may be dropped when a client cannot keep up
+_MONITOR_COMMANDS = frozenset(["monitored_event", "device", "switch", "driver_event"])
+_FRAME_COMMANDS = frozenset(["dmd_frame", "rgb_dmd_frame"])
+
+
+def get_send_priority(bcp_command):
+    """Return the send priority class of a BCP command."""
+    if bcp_command in _MONITOR_COMMANDS:
+        return SEND_PRIORITY_MONITOR
+    if bcp_command in _FRAME_COMMANDS:
+        return SEND_PRIORITY_FRAME
+    return SEND_PRIORITY_CONTROL
+
 
 class BaseBcpClient(MpfController, metaclass=abc.ABCMeta):
 
@@ -16,6 +35,20 @@ class BaseBcpClient(MpfController, metaclass=abc.ABCMeta):
         self.name = name
         self.bcp = bcp
         self.exit_on_close = False
+        self.offer_binary_framing = False
+
+    def configure(self, config):
+        """Apply settings from a validated bcp connection or server config."""
+        self.offer_binary_framing = config.get('framing') == "binary"
+
+    @property
+    def encoding_key(self):
+        """Return the wire format of this client.
+
+        Clients with the same key get the same bytes for a command. Return
+        None if the client cannot send pre-encoded messages.
+        """
+        return None
 
     @asyncio.coroutine
     def connect(self, config):
@@ -35,6 +68,18 @@ class BaseBcpClient(MpfController, metaclass=abc.ABCMeta):
         """Send data to client."""
         raise NotImplementedError("implement")
 
+    def encode(self, bcp_command, kwargs):
+        """Encode data in the wire format of this client."""
+        raise NotImplementedError("implement")
+
+    def send_encoded(self, data, priority=SEND_PRIORITY_CONTROL):
+        """Send data which has been encoded by encode."""
+        raise NotImplementedError("implement")
+
+    def get_send_queue_stats(self):
+        """Return depth and dropped messages per send priority class."""
+        return {}
+
     def stop(self):
         """Stop client connection."""
         raise NotImplementedError("implement")
@@ -4,6 +4,7 @@ from copy import deepcopy
 
 from mpf.core.rgb_color import ColorException
 
+from mpf.core.bcp.bcp_transport import EncodedBcpMessage
 from mpf.core.events import PostedEvent
 from mpf.core.player import Player
 from mpf.core.utility_functions import Util
@@ -63,6 +64,8 @@ class BcpInterface(MpfController):
             monitor_stop=self._bcp_receive_monitor_stop,
             set_machine_var=self._bcp_receive_set_machine_var,
             service=self._service,
+            profiler=self._bcp_receive_profiler,
+            flight_recorder=self._bcp_receive_flight_recorder,
         )
         self._shows = {}
 
@@ -103,6 +106,40 @@ class BcpInterface(MpfController):
         del client
         self.machine.set_machine_var(name, value)
 
+    @asyncio.coroutine
+    def _bcp_receive_profiler(self, client, subcommand, count=20, sort_by="total", **kwargs):
+        """Start, stop, reset or dump the event, switch and delay handler profiler."""
+        del kwargs
+        if subcommand not in ("start", "stop", "reset", "dump") or sort_by not in ("count", "total", "max"):
+            self.machine.bcp.transport.send_to_client(client, "error",
+                                                      cmd="profiler?subcommand={}".format(subcommand),
+                                                      error="Invalid subcommand or sort_by value")
+            return
+
+        events = self.machine.events
+        if subcommand == "start":
+            events.enable_profiling()
+        elif subcommand == "stop":
+            events.disable_profiling()
+        elif subcommand == "reset" and events.profiler:
+            events.profiler.reset()
+
+        self.machine.bcp.transport.send_to_client(
+            client, "profiler", enabled=bool(events.profiler),
+            handlers=events.profiler.get_top(int(count), sort_by) if events.profiler else [])
+
+    @asyncio.coroutine
+    def _bcp_receive_flight_recorder(self, client, **kwargs):
+        """Dump the flight recorder to disk and send the file name."""
+        del kwargs
+        if not self.machine.events.flight_recorder:
+            self.machine.bcp.transport.send_to_client(client, "flight_recorder", file=None,
+                                                      error="Flight recorder is disabled")
+            return
+
+        file_name = self.machine.events.flight_recorder.dump("bcp")
+        self.machine.bcp.transport.send_to_client(client, "flight_recorder", file=file_name, error=False)
+
     @asyncio.coroutine
     def _service_stop(self, client):
         for show in self._shows.values():
@@ -230,15 +267,27 @@ class BcpInterface(MpfController):
 
         self.machine.bcp.transport.send_to_client(client, "light_color", error=False)
 
+    @staticmethod
+    def _get_optional_parts(kwargs, *optional_parts):
+        """Return the optional monitor parts a client asked for.
+
+        Clients can exclude heavy parts of monitor messages by passing them as
+        False in monitor_start. All other parts are included.
+        """
+        if not kwargs:
+            return None
+
+        return frozenset(part for part in optional_parts if kwargs.get(part, True) not in (False, "false"))
+
     @asyncio.coroutine
-    def _bcp_receive_monitor_start(self, client, category):
+    def _bcp_receive_monitor_start(self, client, category, **kwargs):
         """Start monitoring the specified category."""
         category = str.lower(category)
 
         if category == "events":
-            self._monitor_events(client)
+            self._monitor_events(client, self._get_optional_parts(kwargs, "registered_handlers"))
         elif category == "devices":
-            self._monitor_devices(client)
+            self._monitor_devices(client, self._get_optional_parts(kwargs, "state"))
         elif category == "drivers":
             self._monitor_drivers(client)
         elif category == "switches":
@@ -253,6 +302,8 @@ class BcpInterface(MpfController):
             self._monitor_core_events(client)
         elif category == "status_request":
             self._monitor_status_request(client)
+        elif category == "loop":
+            self._monitor_loop(client)
         else:
             self.machine.bcp.transport.send_to_client(client,
                                                       "error",
@@ -282,6 +333,8 @@ class BcpInterface(MpfController):
             self._monitor_core_events_stop(client)
         elif category == "status_request":
             self._monitor_status_request_stop(client)
+        elif category == "loop":
+            self._monitor_loop_stop(client)
         else:
             self.machine.bcp.transport.send_to_client(client,
                                                       "error",
@@ -296,9 +349,9 @@ class BcpInterface(MpfController):
         """Monitor all drivers."""
         self.machine.bcp.transport.remove_transport_from_handle("_monitor_drivers", client)
 
-    def _monitor_events(self, client):
+    def _monitor_events(self, client, optional_parts=None):
         """Monitor all events."""
-        self.machine.bcp.transport.add_handler_to_transport("_monitor_events", client)
+        self.machine.bcp.transport.add_handler_to_transport("_monitor_events", client, optional_parts)
         self.machine.events.monitor_events = True
 
     def _monitor_events_stop(self, client):
@@ -310,20 +363,21 @@ class BcpInterface(MpfController):
 
     def monitor_posted_event(self, posted_event: PostedEvent):
         """Send monitored posted event to bcp clients."""
-        self.machine.bcp.transport.send_to_clients_with_handler(
-            handler="_monitor_events",
-            bcp_command="monitored_event",
-            event_name=posted_event.event,
-            event_type=posted_event.type,
-            event_callback=posted_event.callback,
-            event_kwargs=Util.convert_to_simply_type(posted_event.kwargs),
-            registered_handlers=Util.convert_to_simply_type(
-                self.machine.events.registered_handlers.get(posted_event.event, []))
+        self.machine.bcp.transport.send_message_to_clients_with_handler(
+            "_monitor_events",
+            EncodedBcpMessage(
+                "monitored_event",
+                dict(event_name=posted_event.event,
+                     event_type=posted_event.type,
+                     event_callback=posted_event.callback,
+                     event_kwargs=Util.convert_to_simply_type(posted_event.kwargs)),
+                dict(registered_handlers=lambda: Util.convert_to_simply_type(
+                    self.machine.events.registered_handlers.get(posted_event.event, []))))
         )
 
-    def _monitor_devices(self, client):
+    def _monitor_devices(self, client, optional_parts=None):
         """Register client to get notified of device changes."""
-        self.machine.bcp.transport.add_handler_to_transport("_devices", client)
+        self.machine.bcp.transport.add_handler_to_transport("_devices", client, optional_parts)
         # trigger updates of lights
         self.machine.light_controller.monitor_lights()
 
@@ -347,13 +401,15 @@ class BcpInterface(MpfController):
         if not self.configured:
             return
 
-        self.machine.bcp.transport.send_to_clients_with_handler(
-            handler="_devices",
-            bcp_command='device',
-            type=device.class_label,
-            name=device.name,
-            changes=(attribute_name, Util.convert_to_simply_type(old_value), Util.convert_to_simply_type(new_value)),
-            state=device.get_monitorable_state())
+        self.machine.bcp.transport.send_message_to_clients_with_handler(
+            "_devices",
+            EncodedBcpMessage(
+                'device',
+                dict(type=device.class_label,
+                     name=device.name,
+                     changes=(attribute_name, Util.convert_to_simply_type(old_value),
+                              Util.convert_to_simply_type(new_value))),
+                dict(state=device.get_monitorable_state)))
 
     def _monitor_switches(self, client):
         """Register client to get notified of switch changes."""
@@ -508,6 +564,18 @@ class BcpInterface(MpfController):
         """Stop monitoring status_request messages via the specified client."""
         self.machine.bcp.transport.remove_transport_from_handle("_status_request", client)
 
+    def _monitor_loop(self, client):
+        """Begin sending loop lag and callback statistics to the specified client."""
+        self.machine.bcp.transport.add_handler_to_transport("_monitor_loop", client)
+        self.machine.loop_monitor.start_reporting()
+
+    def _monitor_loop_stop(self, client):
+        """Stop sending loop statistics to the specified client."""
+        self.machine.bcp.transport.remove_transport_from_handle("_monitor_loop", client)
+
+        if not self.machine.bcp.transport.get_transports_for_handler("_monitor_loop"):
+            self.machine.loop_monitor.stop_reporting()
+
     def _ball_started(self, ball, player, **kwargs):
         del kwargs
         self.machine.bcp.transport.send_to_clients_with_handler(
@@ -577,6 +645,10 @@ class BcpInterface(MpfController):
         self.warning_log('Received Error command from host with parameters: %s, from client %s',
                          kwargs, str(client))
 
+    def has_driver_monitors(self) -> bool:
+        """Return true if any client monitors driver events."""
+        return bool(self.machine.bcp.transport.get_transports_for_handler("_monitor_drivers"))
+
     def send_driver_event(self, **kwargs):
         """Notify all observers about driver event."""
         self.machine.bcp.transport.send_to_clients_with_handler("_monitor_drivers", "driver_event", **kwargs)
@@ -12,13 +12,15 @@ class BcpServer(MpfController):
 
     config_name = "bcp_server"
 
-    def __init__(self, machine, ip, port, server_type):
+    # pylint: disable-msg=too-many-arguments
+    def __init__(self, machine, ip, port, server_type, client_config=None):
         """Initialise BCP server."""
         super().__init__(machine)
         self._server = None
         self._ip = ip
         self._port = port
         self._type = server_type
+        self._client_config = client_config
 
     @asyncio.coroutine
     def start(self):
@@ -38,6 +40,8 @@ class BcpServer(MpfController):
         """Accept an connection and create client."""
         self.info_log("New client connected.")
         client = Util.string_to_class(self._type)(self.machine, None, self.machine.bcp)
+        if self._client_config:
+            client.configure(self._client_config)
         client.accept_connection(client_reader, client_writer)
         client.exit_on_close = False
         self.machine.bcp.transport.register_transport(client)
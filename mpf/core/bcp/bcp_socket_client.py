@@ -1,11 +1,27 @@
 """BCP socket client."""
 import json
+import struct
+from collections import deque
 from urllib.parse import urlsplit, parse_qs, quote, unquote, urlunparse
 
 import asyncio
 
 from mpf._version import __version__, __bcp_version__
-from mpf.core.bcp.bcp_client import BaseBcpClient
+from mpf.core.bcp.bcp_client import BaseBcpClient, SEND_PRIORITY_CONTROL, SEND_PRIORITY_NAMES, get_send_priority
+
+# pylint: disable-msg=ungrouped-imports
+try:
+    import msgpack
+except ImportError:     # pragma: no cover
+    msgpack = None
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+CODEC_NAMES = {"json": CODEC_JSON, "msgpack": CODEC_MSGPACK}
+
+# codec, payload length, rawbytes length
+BINARY_FRAME_HEADER = struct.Struct("!BII")
 
 
 class MpfJSONEncoder(json.JSONEncoder):
@@ -120,6 +136,107 @@ def encode_command_string(bcp_command, **kwargs):
     return str(urlunparse(('', '', bcp_command.lower(), '', kwarg_string, '')))
 
 
+def get_supported_codecs():
+    """Return the names of all binary frame codecs available in this installation."""
+    if msgpack:
+        return ["msgpack", "json"]
+    return ["json"]
+
+
+def select_codec(remote_codecs):
+    """Select the best binary frame codec which is supported by both sides.
+
+    Args:
+        remote_codecs: Comma separated string of codec names supported by the
+            remote side.
+
+    Returns:
+        The codec id (CODEC_MSGPACK or CODEC_JSON).
+    """
+    remote_codecs = [codec.strip().lower() for codec in str(remote_codecs or "json").split(",")]
+    for codec in get_supported_codecs():
+        if codec in remote_codecs:
+            return CODEC_NAMES[codec]
+
+    return CODEC_JSON
+
+
+def encode_command_frame(bcp_command, codec=CODEC_JSON, **kwargs):
+    """Encode a BCP command and kwargs into a length-prefixed binary frame.
+
+    Args:
+        bcp_command: String of the BCP command name.
+        codec: CODEC_JSON or CODEC_MSGPACK. Determines how command and kwargs
+            are serialised.
+        **kwargs: Optional pair(s) of kwargs which will be appended to the
+            command. A bytes value in ``rawbytes`` is appended to the frame
+            as it is without any encoding.
+
+    Returns:
+        Bytes of the complete frame.
+
+    A frame consists of a header (codec as unsigned byte, payload length and
+    rawbytes length as unsigned 32 bit big endian integers), the payload which
+    contains the encoded list of command and kwargs, and the rawbytes.
+
+    """
+    rawbytes = kwargs.pop('rawbytes', b'')
+    if not isinstance(rawbytes, (bytes, bytearray)):
+        kwargs['rawbytes'] = rawbytes
+        rawbytes = b''
+
+    if codec == CODEC_MSGPACK:
+        payload = msgpack.packb([bcp_command.lower(), kwargs], use_bin_type=True, default=str)
+    else:
+        payload = json.dumps([bcp_command.lower(), kwargs], cls=MpfJSONEncoder).encode()
+
+    return BINARY_FRAME_HEADER.pack(codec, len(payload), len(rawbytes)) + payload + rawbytes
+
+
+def decode_command_frame(codec, payload, rawbytes=None):
+    """Decode the payload of a binary BCP frame into command and parameter parts.
+
+    Args:
+        codec: Codec id from the frame header.
+        payload: Encoded command and kwargs.
+        rawbytes: Optional raw bytes from the end of the frame.
+
+    Returns:
+        A tuple of the command string and a dictionary of kwarg pairs.
+    """
+    if codec == CODEC_MSGPACK:
+        if not msgpack:
+            raise AssertionError("Received msgpack frame but msgpack is not installed.")
+        bcp_command, kwargs = msgpack.unpackb(payload, raw=False)
+    elif codec == CODEC_JSON:
+        bcp_command, kwargs = json.loads(payload.decode())
+    else:
+        raise AssertionError("Invalid codec {} in BCP frame.".format(codec))
+
+    if rawbytes:
+        kwargs['rawbytes'] = rawbytes
+
+    return bcp_command.lower(), kwargs
+
+
+@asyncio.coroutine
+def read_command_frame(receiver):
+    """Read one binary frame from a StreamReader and decode it."""
+    try:
+        header = yield from receiver.readexactly(BINARY_FRAME_HEADER.size)
+        codec, payload_length, rawbytes_length = BINARY_FRAME_HEADER.unpack(header)
+        payload = yield from receiver.readexactly(payload_length)
+        if rawbytes_length:
+            rawbytes = yield from receiver.readexactly(rawbytes_length)
+        else:
+            rawbytes = None
+    except asyncio.IncompleteReadError:
+        # handle EOF
+        raise BrokenPipeError()
+
+    return decode_command_frame(codec, payload, rawbytes)
+
+
 class AsyncioBcpClientSocket():
 
     """Simple asyncio bcp client."""
@@ -129,12 +246,18 @@ class AsyncioBcpClientSocket():
         self._sender = sender
         self._receiver = receiver
         self._receive_buffer = b''
+        self._binary_receive = False
+        self._binary_send = False
+        self._codec = CODEC_JSON
 
     # pylint: disable-msg=inconsistent-return-statements
     @asyncio.coroutine
     def read_message(self):
         """Read the next message."""
         while True:
+            if self._binary_receive:
+                return (yield from read_command_frame(self._receiver))
+
             message = yield from self._receiver.readline()
 
             # handle EOF
@@ -155,6 +278,11 @@ class AsyncioBcpClientSocket():
             else:  # no bytes in the message
                 message_obj = self._process_command(message)
 
+            if message_obj[0] == "framing":
+                # the remote side will send binary frames from now on
+                self._binary_receive = message_obj[1].get("mode") == "binary"
+                continue
+
             if message_obj:
                 return message_obj
 
@@ -165,8 +293,44 @@ class AsyncioBcpClientSocket():
             bcp_command: command to send
             kwargs: parameters to command
         """
-        bcp_string = encode_command_string(bcp_command, **kwargs)
-        self._sender.write((bcp_string + '\n').encode())
+        if self._binary_send:
+            self._sender.write(encode_command_frame(bcp_command, self._codec, **kwargs))
+        else:
+            bcp_string = encode_command_string(bcp_command, **kwargs)
+            self._sender.write((bcp_string + '\n').encode())
+
+    def accept_binary_framing(self, hello_kwargs):
+        """Answer a BCP hello and switch to binary framing if the host offered it.
+
+        Args:
+            hello_kwargs: Parameters of the hello command received from the
+                host.
+
+        Returns:
+            True if binary framing will be used.
+        """
+        if hello_kwargs.get("framing") != "binary":
+            return False
+
+        self._codec = select_codec(hello_kwargs.get("codecs"))
+        self.send("hello", {"version": __bcp_version__,
+                            "controller_name": "Mission Pinball Framework",
+                            "controller_version": __version__,
+                            "framing": "binary",
+                            "codecs": ",".join(get_supported_codecs())})
+        # everything after our hello is sent in binary frames
+        self._binary_send = True
+        return True
+
+    @asyncio.coroutine
+    def handshake(self):
+        """Wait for the hello of the host and accept binary framing if the host offered it.
+
+        Returns:
+            True if binary framing will be used.
+        """
+        _, kwargs = yield from self.wait_for_response("hello")
+        return self.accept_binary_framing(kwargs)
 
     @asyncio.coroutine
     def wait_for_response(self, bcp_command):
@@ -211,6 +375,18 @@ class BCPClientSocket(BaseBcpClient):
         self._receiver = None
         self._send_goodbye = True
         self._receive_buffer = b''
+        self._binary_receive = False
+        self._binary_send = False
+        self._codec = CODEC_JSON
+
+        # one queue per send priority class. used when the remote side does
+        # not read fast enough
+        self._send_queues = tuple(deque() for _ in SEND_PRIORITY_NAMES)
+        self._send_queue_limits = [1000, 250, 3]
+        self._dropped_messages = [0] * len(SEND_PRIORITY_NAMES)
+        self._disconnect_on_stall = False
+        self._stalled = False
+        self._send_task = None
 
         self._bcp_client_socket_commands = {'hello': self._receive_hello,
                                             'goodbye': self._receive_goodbye}
@@ -219,10 +395,18 @@ class BCPClientSocket(BaseBcpClient):
         """Return str representation."""
         return self.module_name
 
+    def configure(self, config):
+        """Apply framing and send queue settings."""
+        super().configure(config)
+        self._send_queue_limits = [config['max_queued_control'], config['max_queued_monitor'],
+                                   config['max_queued_frames']]
+        self._disconnect_on_stall = config['disconnect_on_stall']
+
     def connect(self, config):
         """Actively connect to server."""
         config = self.machine.config_validator.validate_config(
             'bcp:connections', config, 'bcp:connections')
+        self.configure(config)
 
         # return a future
         return self._setup_client_socket(config['host'], config['port'], config.get('required'))
@@ -267,35 +451,188 @@ class BCPClientSocket(BaseBcpClient):
         if self._send_goodbye:
             self.send_goodbye()
 
+        if self._send_task:
+            self._send_task.cancel()
+            self._send_task = None
+        self._flush_send_queues()
+
         self._sender.close()
 
-    def send(self, bcp_command, kwargs):
-        """Send a message to the BCP host.
+    @property
+    def encoding_key(self):
+        """Return the wire format which is currently used to send to this client."""
+        if self._binary_send:
+            return "binary", self._codec
+        return "text"
+
+    def encode(self, bcp_command, kwargs):
+        """Encode a message in the wire format of this client.
 
         Args:
-            bcp_command: command to send
+            bcp_command: command to encode
             kwargs: parameters to command
+
+        Returns:
+            The encoded bytes or None if the message cannot be encoded.
         """
         try:
-            bcp_string = encode_command_string(bcp_command, **kwargs)
+            if self._binary_send:
+                data = encode_command_frame(bcp_command, self._codec, **kwargs)
+            else:
+                data = (encode_command_string(bcp_command, **kwargs) + '\n').encode()
         # pylint: disable-msg=broad-except
         except Exception as e:
             self.warning_log("Failed to encode bcp_command %s with args %s. %s", bcp_command, kwargs, e)
-            return
+            return None
 
         if self.debug_log:
-            self.debug_log('Sending "%s"', bcp_string)
+            self.debug_log('Sending "%s" with args %s', bcp_command, kwargs)
+
+        return data
+
+    def send_encoded(self, data, priority=SEND_PRIORITY_CONTROL):
+        """Send an already encoded message to the BCP host.
+
+        The message is written directly if the transport buffer has room.
+        Otherwise, it is queued in the bounded queue of its priority class.
+
+        Args:
+            data: bytes returned by encode
+            priority: send priority class of the message
+        """
+        if data is None:
+            return
 
         if hasattr(self._sender.transport, "is_closing") and self._sender.transport.is_closing():
             self.warning_log("Failed to write to bcp since transport is closing. Transport %s", self._sender.transport)
             return
-        self._sender.write((bcp_string + '\n').encode())
+
+        if not self._send_task and not self._is_write_buffer_full():
+            self._sender.write(data)
+            return
+
+        self._queue_message(data, priority)
+
+    def send(self, bcp_command, kwargs):
+        """Send a message to the BCP host.
+
+        Args:
+            bcp_command: command to send
+            kwargs: parameters to command
+        """
+        self.send_encoded(self.encode(bcp_command, kwargs), get_send_priority(bcp_command))
+
+    def get_send_queue_stats(self):
+        """Return depth and dropped messages per send priority class."""
+        return {name: {"depth": len(self._send_queues[priority]), "dropped": self._dropped_messages[priority]}
+                for priority, name in enumerate(SEND_PRIORITY_NAMES)}
+
+    def _is_write_buffer_full(self):
+        """Return true if the transport buffers more than its high-water mark."""
+        transport = self._sender.transport
+        if not hasattr(transport, "get_write_buffer_limits"):
+            return False
+        return transport.get_write_buffer_size() >= transport.get_write_buffer_limits()[1]
+
+    def _queue_message(self, data, priority):
+        """Add message to the send queue of its priority class.
+
+        Control messages are never reordered or replaced. When their queue is
+        full the remote side stopped reading. New control messages are dropped
+        or the client is disconnected if disconnect_on_stall is set. Monitor
+        messages and frames replace the oldest queued message instead since
+        only recent ones are relevant.
+        """
+        queue = self._send_queues[priority]
+        if len(queue) >= self._send_queue_limits[priority]:
+            self._dropped_messages[priority] += 1
+            if priority == SEND_PRIORITY_CONTROL:
+                if self._disconnect_on_stall:
+                    self._disconnect_stalled()
+                if not self._stalled:
+                    self._stalled = True
+                    self.warning_log("Control send queue full. Remote side stopped reading. Dropping control "
+                                     "messages until it reads again.")
+                return
+            queue.popleft()
+
+        queue.append(data)
+
+        if not self._send_task:
+            self._send_task = self.machine.clock.loop.create_task(self._send_queued_messages())
+            self._send_task.add_done_callback(self._send_done)
+
+    def _disconnect_stalled(self):
+        """Drop all queued messages, abort the connection and raise BrokenPipeError.
+
+        The transport manager stops and unregisters clients which raise IOError on send.
+        This does not stop the machine even if exit_on_close is set.
+        """
+        self.warning_log("Control send queue full. Remote side stopped reading. Disconnecting.")
+        self.exit_on_close = False
+        for priority, queue in enumerate(self._send_queues):
+            self._dropped_messages[priority] += len(queue)
+            queue.clear()
+        if self._send_task:
+            self._send_task.cancel()
+            self._send_task = None
+        # there is no point in waiting for the buffer to drain
+        self._send_goodbye = False
+        self._sender.transport.abort()
+        raise BrokenPipeError("BCP client {} stopped reading.".format(self.name))
+
+    @asyncio.coroutine
+    def _send_queued_messages(self):
+        """Write queued messages by priority whenever the transport can take more data.
+
+        After every drain as many messages are written as fit below the high-water mark.
+        """
+        while True:
+            try:
+                yield from self._sender.drain()
+            except IOError:
+                # connection is gone. the receive loop will unregister us
+                self._send_task = None
+                return
+
+            for queue in self._send_queues:
+                while queue and not self._is_write_buffer_full():
+                    self._sender.write(queue.popleft())
+
+            if self._stalled and not self._send_queues[SEND_PRIORITY_CONTROL]:
+                self._stalled = False
+                self.info_log("Remote side reads again. Dropped %s control messages in total.",
+                              self._dropped_messages[SEND_PRIORITY_CONTROL])
+
+            if not any(self._send_queues):
+                self._send_task = None
+                return
+
+    def _send_done(self, future):
+        """Forget send task and raise exceptions from within task."""
+        if self._send_task is future:
+            self._send_task = None
+        if not future.cancelled():
+            future.result()
+
+    def _flush_send_queues(self):
+        """Write all queued messages without waiting for the transport."""
+        for queue in self._send_queues:
+            while queue:
+                self._sender.write(queue.popleft())
 
     # pylint: disable-msg=inconsistent-return-statements
     @asyncio.coroutine
     def read_message(self):
         """Read the next message."""
         while True:
+            if self._binary_receive:
+                cmd, kwargs = yield from read_command_frame(self._receiver)
+                message_obj = self._handle_command(cmd, kwargs)
+                if message_obj:
+                    return message_obj
+                continue
+
             message = yield from self._receiver.readline()
 
             # handle EOF
@@ -327,6 +664,9 @@ class BCPClientSocket(BaseBcpClient):
         if rawbytes:
             kwargs['rawbytes'] = rawbytes
 
+        return self._handle_command(cmd, kwargs)
+
+    def _handle_command(self, cmd, kwargs):
         if cmd in self._bcp_client_socket_commands:
             self._bcp_client_socket_commands[cmd](**kwargs)
             return None
@@ -337,6 +677,27 @@ class BCPClientSocket(BaseBcpClient):
         """Process incoming BCP 'hello' command."""
         self.debug_log('Received BCP Hello from host with kwargs: %s', kwargs)
 
+        if self.offer_binary_framing and kwargs.get("framing") == "binary" and not self._binary_send:
+            self._switch_to_binary_framing(kwargs.get("codecs"))
+
+    def _switch_to_binary_framing(self, remote_codecs):
+        """Switch both directions to binary frames.
+
+        The remote side sends frames right after its hello. We tell it with a
+        last text command that our frames will follow.
+        """
+        self._codec = select_codec(remote_codecs)
+        self._binary_receive = True
+        # queued text messages have to go out before the remote side expects frames
+        if self._send_task:
+            self._send_task.cancel()
+            self._send_task = None
+        self._flush_send_queues()
+        self.send('framing', {"mode": "binary",
+                              "codec": "msgpack" if self._codec == CODEC_MSGPACK else "json"})
+        self._binary_send = True
+        self.info_log("Switched BCP connection to binary framing.")
+
     def _receive_goodbye(self):
         """Process incoming BCP 'goodbye' command."""
         self._send_goodbye = False
@@ -344,9 +705,13 @@ class BCPClientSocket(BaseBcpClient):
 
     def send_hello(self):
         """Send BCP 'hello' command."""
-        self.send('hello', {"version": __bcp_version__,
-                            "controller_name": 'Mission Pinball Framework',
-                            "controller_version": __version__})
+        kwargs = {"version": __bcp_version__,
+                  "controller_name": 'Mission Pinball Framework',
+                  "controller_version": __version__}
+        if self.offer_binary_framing:
+            kwargs["framing"] = "binary"
+            kwargs["codecs"] = ",".join(get_supported_codecs())
+        self.send('hello', kwargs)
 
     def send_goodbye(self):
         """Send BCP 'goodbye' command."""
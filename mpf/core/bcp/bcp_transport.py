@@ -3,7 +3,65 @@ import asyncio
 
 from typing import Union
 
-from mpf.core.bcp.bcp_client import BaseBcpClient
+from mpf.core.bcp.bcp_client import BaseBcpClient, get_send_priority
+
+
+class EncodedBcpMessage:
+
+    """A BCP command which is encoded at most once per wire format.
+
+    Optional parts of the message are passed as callables in lazy_kwargs. They
+    are only evaluated (once) when the message is sent to a client which asked
+    for them.
+    """
+
+    __slots__ = ["bcp_command", "priority", "kwargs", "_lazy_kwargs", "_lazy_values", "_encoded"]
+
+    def __init__(self, bcp_command, kwargs, lazy_kwargs=None):
+        """Initialise message."""
+        self.bcp_command = bcp_command
+        self.priority = get_send_priority(bcp_command)
+        self.kwargs = kwargs
+        self._lazy_kwargs = lazy_kwargs or {}
+        self._lazy_values = {}
+        self._encoded = {}
+
+    def _get_optional_parts(self, optional_parts):
+        """Return the names of all lazy kwargs which should be included."""
+        if optional_parts is None:
+            return frozenset(self._lazy_kwargs)
+        return frozenset(name for name in optional_parts if name in self._lazy_kwargs)
+
+    def get_kwargs(self, optional_parts=None):
+        """Return kwargs including the requested optional parts.
+
+        Args:
+            optional_parts: Set of lazy kwargs to include. None includes all.
+        """
+        parts = self._get_optional_parts(optional_parts)
+        if not parts:
+            return self.kwargs
+
+        kwargs = dict(self.kwargs)
+        for name in parts:
+            if name not in self._lazy_values:
+                self._lazy_values[name] = self._lazy_kwargs[name]()
+            kwargs[name] = self._lazy_values[name]
+
+        return kwargs
+
+    def encode_for(self, client: BaseBcpClient, optional_parts=None):
+        """Return the message encoded in the wire format of a client.
+
+        Args:
+            client: The client which will receive the message.
+            optional_parts: Set of lazy kwargs to include. None includes all.
+        """
+        key = (client.encoding_key, self._get_optional_parts(optional_parts))
+        if key not in self._encoded:
+            self._encoded[key] = client.encode(self.bcp_command, self.get_kwargs(optional_parts))
+
+        return self._encoded[key]
 
 
 class BcpTransportManager:
@@ -16,10 +74,27 @@ class BcpTransportManager:
         self._transports = []
         self._readers = {}
         self._handlers = {}
+        self._handler_options = {}
         self._machine.events.add_handler("shutdown", self.shutdown)
+        self._machine.events.add_handler("debug_dump_stats", self._debug_dump_send_queues)
 
-    def add_handler_to_transport(self, handler, transport: BaseBcpClient):
-        """Register client as handler."""
+    def _debug_dump_send_queues(self, **kwargs):
+        """Log send queue depth and dropped messages of all clients."""
+        del kwargs
+        for transport in self._transports:
+            for name, stats in transport.get_send_queue_stats().items():
+                self._machine.log.info("BCP client %s: %s queue depth: %s. Dropped messages: %s",
+                                       transport.name, name, stats["depth"], stats["dropped"])
+
+    def add_handler_to_transport(self, handler, transport: BaseBcpClient, optional_parts=None):
+        """Register client as handler.
+
+        Args:
+            handler: Name of the handler.
+            transport: The client.
+            optional_parts: Set of optional message parts the client wants for
+                this handler. None means all parts.
+        """
         if handler not in self._handlers:
             self._handlers[handler] = []
 
@@ -27,12 +102,20 @@ class BcpTransportManager:
             raise AssertionError("Cannot register None transport.")
 
         self._handlers[handler].append(transport)
+        self._handler_options[(handler, transport)] = optional_parts
 
     def remove_transport_from_handle(self, handler, transport: BaseBcpClient):
         """Remove client from a certain handler."""
         if transport in self._handlers[handler]:
             self._handlers[handler].remove(transport)
 
+        if transport not in self._handlers[handler]:
+            self._handler_options.pop((handler, transport), None)
+
+    def get_optional_parts_for_handler(self, handler, transport: BaseBcpClient):
+        """Return the optional message parts a client wants for a certain handler."""
+        return self._handler_options.get((handler, transport))
+
     def get_transports_for_handler(self, handler):
         """Get clients which registered for a certain handler."""
         return self._handlers.get(handler, [])
@@ -76,6 +159,7 @@ class BcpTransportManager:
         for handler in self._handlers:
             if transport in self._handlers[handler]:
                 self._handlers[handler].remove(transport)
+            self._handler_options.pop((handler, transport), None)
 
         if transport in self._readers:
             self._readers[transport].cancel()
@@ -97,13 +181,45 @@ class BcpTransportManager:
 
     def send_to_clients(self, clients, bcp_command, **kwargs):
         """Send command to a list of clients."""
+        self.send_message_to_clients(clients, EncodedBcpMessage(bcp_command, kwargs))
+
+    def send_message_to_clients(self, clients, message: EncodedBcpMessage, handler=None):
+        """Send a message to a list of clients.
+
+        The message is encoded only once per wire format and the same bytes
+        are written to all clients which use that format.
+
+        Args:
+            clients: List of clients.
+            message: The message to send.
+            handler: If set, only optional parts which the clients requested
+                for this handler are included.
+        """
         for client in set(clients):
-            self.send_to_client(client, bcp_command, **kwargs)
+            if handler is None:
+                optional_parts = None
+            else:
+                optional_parts = self._handler_options.get((handler, client))
+
+            try:
+                if client.encoding_key is None:
+                    client.send(message.bcp_command, message.get_kwargs(optional_parts))
+                else:
+                    client.send_encoded(message.encode_for(client, optional_parts), message.priority)
+            except IOError:
+                client.stop()
+                self.unregister_transport(client)
 
     def send_to_clients_with_handler(self, handler, bcp_command, **kwargs):
         """Send command to clients which registered for a specific handler."""
         clients = self.get_transports_for_handler(handler)
-        self.send_to_clients(clients, bcp_command, **kwargs)
+        self.send_message_to_clients(clients, EncodedBcpMessage(bcp_command, kwargs), handler)
+
+    def send_message_to_clients_with_handler(self, handler, message: EncodedBcpMessage):
+        """Send a message to clients which registered for a specific handler."""
+        clients = self.get_transports_for_handler(handler)
+        if clients:
+            self.send_message_to_clients(clients, message, handler)
 
     def send_to_client(self, client: BaseBcpClient, bcp_command, **kwargs):
         """Send command to a specific bcp client."""
@@ -115,8 +231,7 @@ class BcpTransportManager:
 
     def send_to_all_clients(self, bcp_command, **kwargs):
         """Send command to all bcp clients."""
-        for client in self._transports:
-            self.send_to_client(client, bcp_command, **kwargs)
+        self.send_to_clients(self._transports, bcp_command, **kwargs)
 
     def shutdown(self, **kwargs):
         """Prepare the BCP clients for MPF shutdown."""
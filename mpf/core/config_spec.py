@@ -66,6 +66,10 @@ achievements:
 
 animations:
     __valid_in__: machine, mode                 # todo add to validator
+asset_manager:
+    __valid_in__: machine
+    load_in_threads: single|bool|True
+    max_concurrent_loads: single|int|2
 assets:
     __valid_in__: machine, mode
     common:
@@ -206,10 +210,20 @@ bcp:
         type: single|str|
         required: single|bool|True
         exit_on_close: single|bool|True
+        framing: single|enum(text,binary)|text
+        max_queued_control: single|int|1000
+        max_queued_monitor: single|int|250
+        max_queued_frames: single|int|3
+        disconnect_on_stall: single|bool|False
     servers:
         ip: single|str|None
         port: single|int|5050
         type: single|str|
+        framing: single|enum(text,binary)|text
+        max_queued_control: single|int|1000
+        max_queued_monitor: single|int|250
+        max_queued_frames: single|int|3
+        disconnect_on_stall: single|bool|False
 bitmap_fonts:
     __valid_in__: machine, mode
     file: single|str|None
@@ -247,6 +261,7 @@ coils:
     pulse_events: dict|str:ms|None
     platform_settings: single|dict|None
     psu: single|machine(psus)|default
+    psu_amps: single|float|None
     platform: single|str|None
 custom_code:
     __valid_in__: machine
@@ -519,6 +534,14 @@ fast_firmware_update:
     version: single|str|
 file_shows:
     __valid_in__: machine, mode                      # todo add to validator
+flight_recorder:
+    __valid_in__: machine
+    enabled: single|bool|True
+    size: single|int|1000
+    dump_on_crash: single|bool|True
+    dump_on_stop: single|bool|False
+    folder: single|str|logs
+    max_value_length: single|int|200
 flasher_player:
     __valid_in__: machine, mode, show
     __allow_others__:
@@ -551,6 +574,8 @@ game:
     add_player_switch_tag: single|str|start
     allow_start_with_loose_balls: single|bool|False
     allow_start_with_ball_in_drain: single|bool|False
+    player_var_events: single|enum(immediate,coalesce)|immediate
+    player_var_storage: single|enum(dict,slots)|dict
 hardware:
     __valid_in__: machine
     platform: list|str|virtual
@@ -667,6 +692,7 @@ lisy:
     port: single|str|None
     baud: single|int|None
     poll_hz: single|int|1000
+    poll_pipeline_depth: single|int|4
     console_log: single|enum(none,basic,full)|none
     display_flash_frequency: single|float|1.0
     file_log: single|enum(none,basic,full)|basic
@@ -703,6 +729,15 @@ sequences:
 logging:
     __valid_in__: machine
     __allow_others__: true
+loop_monitor:
+    __valid_in__: machine
+    enabled: single|bool|True
+    sample_interval: single|ms|100ms
+    lag_warning_threshold: single|ms|100ms
+    callback_profiling: single|bool|False
+    slow_callback_threshold: single|ms|5ms
+    slowest_callbacks: single|int|10
+    report_interval: single|ms|1s
 machine:
     __valid_in__: machine
     balls_installed: single|int|1
@@ -775,6 +810,7 @@ mpf:
     save_machine_vars_to_disk: single|bool|true
     default_show_sync_ms: single|int|0
     default_platform_hz: single|float|1000
+    handler_profiling: single|bool|False
     core_modules: ignore
     config_players: ignore
     device_modules: ignore
@@ -838,6 +874,7 @@ p_roc:
     __valid_in__: machine
     lamp_matrix_strobe_time: single|ms|100ms
     watchdog_time: single|ms|1s
+    idle_service_interval: single|ms|5ms
     use_watchdog: single|bool|True
     dmd_timing_cycles: list|int|None
     dmd_update_interval: single|ms|33ms
@@ -847,6 +884,7 @@ p_roc:
 p3_roc:
     lamp_matrix_strobe_time: single|ms|100ms
     watchdog_time: single|ms|1s
+    idle_service_interval: single|ms|5ms
     use_watchdog: single|bool|True
     debug: single|bool|False
     console_log: single|enum(none,basic,full)|none
@@ -854,7 +892,7 @@ p3_roc:
 psus:
     __valid_in__: machine
     voltage: single|int|None
-    max_amps: single|int|None
+    max_amps: single|float|None
     release_wait_ms: single|ms|10
 player_vars:
     __valid_in__: machine
@@ -1339,6 +1377,13 @@ switch_player:
     __valid_in__: machine
     start_event: single|str|machine_reset_phase_3
     steps: ignore
+    repeat: single|bool|False
+    random_switches: list|machine(switches)|None
+    random_switch_tags: list|str|None
+    random_min_interval: single|ms|100ms
+    random_max_interval: single|ms|1s
+    random_only_with_ball: single|bool|True
+    random_seed: single|int|None
 sequence_shots:
     __valid_in__: machine, mode
     switch_sequence: list|machine(switches)|None
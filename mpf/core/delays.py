@@ -2,6 +2,7 @@
 
 import uuid
 from functools import partial
+from time import perf_counter
 
 from typing import Any, Callable, Dict, Set
 
@@ -208,5 +209,11 @@ class DelayManager(MpfController):
             del self.delays[name]
         except KeyError:
             pass
-        callback(**kwargs)
+        profiler = self.machine.events.profiler
+        if profiler:
+            start = perf_counter()
+            callback(**kwargs)
+            profiler.record("delay", callback, perf_counter() - start)
+        else:
+            callback(**kwargs)
         self.machine.events.process_event_queue()
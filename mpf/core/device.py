@@ -29,7 +29,7 @@ class Device(LogMixin, metaclass=abc.ABCMeta):
     # Can a config for this device be empty?
     allow_empty_configs = False
 
-    __slots__ = ["machine", "name", "tags", "platform", "label", "config"]
+    __slots__ = ["machine", "name", "_tags", "platform", "label", "config"]
 
     def __init__(self, machine: MachineController, name: str) -> None:
         """Set up default attributes of every device.
@@ -41,7 +41,7 @@ class Device(LogMixin, metaclass=abc.ABCMeta):
         super().__init__()
         self.machine = machine
         self.name = name
-        self.tags = []          # type: List[str]
+        self._tags = []         # type: List[str]
         self.platform = None    # type: SmartVirtualHardwarePlatform
         """List of tags applied to this device."""
 
@@ -52,6 +52,19 @@ class Device(LogMixin, metaclass=abc.ABCMeta):
         the User Documentation.
         """
 
+    @property
+    def tags(self) -> List[str]:
+        """Return tags of this device."""
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags: List[str]):
+        """Set tags and update the tag index of the collection."""
+        self._tags = tags
+        collection = getattr(self.machine, self.collection, None) if self.collection else None
+        if hasattr(collection, "invalidate_indexes"):
+            collection.invalidate_indexes()
+
     def __lt__(self, other):
         """Compare two devices."""
         return self.name < other.name
@@ -337,7 +337,7 @@ class DeviceCollection(dict):
     hardware device (such as coils, lights, switches, ball devices, etc.).
     """
 
-    __slots__ = ["machine", "name", "config_section"]
+    __slots__ = ["machine", "name", "config_section", "index_version", "_tag_index", "_number_index"]
 
     def __init__(self, machine, collection, config_section):
         """Initialise device collection."""
@@ -346,6 +346,49 @@ class DeviceCollection(dict):
         self.machine = machine
         self.name = collection
         self.config_section = config_section
+        self.index_version = 0
+        self._tag_index = None
+        self._number_index = None
+
+    def __setitem__(self, key, value):
+        """Add device and invalidate indexes."""
+        super().__setitem__(key, value)
+        self.invalidate_indexes()
+
+    def __delitem__(self, key):
+        """Remove device and invalidate indexes."""
+        super().__delitem__(key)
+        self.invalidate_indexes()
+
+    def invalidate_indexes(self):
+        """Rebuild tag and number indexes on next access.
+
+        Called when devices are added or removed and when the tags or config
+        of a device in this collection change.
+        """
+        self._tag_index = None
+        self._number_index = None
+        self.index_version += 1
+
+    def _build_tag_index(self):
+        """Build tag to devices index."""
+        self._tag_index = {}
+        for item in self:
+            for tag in item.tags:
+                devices = self._tag_index.setdefault(tag, [])
+                if item not in devices:
+                    devices.append(item)
+
+    def _build_number_index(self):
+        """Build number to device index."""
+        self._number_index = {}
+        for obj in self.values():
+            if 'number' in obj.config:
+                try:
+                    self._number_index.setdefault(obj.config['number'], obj)
+                except TypeError:
+                    # unhashable numbers cannot be indexed
+                    pass
 
     def __getattr__(self, attr):
         """Return device by key."""
@@ -373,11 +416,17 @@ class DeviceCollection(dict):
             A list of device objects. If no devices are found with that tag, it
             will return an empty list.
         """
-        return [item for item in self if tag in item.tags]
+        if self._tag_index is None:
+            self._build_tag_index()
+
+        return list(self._tag_index.get(tag, []))
 
     def number(self, number):
         """Return a device object based on its number."""
-        for name, obj in self.items():
-            if obj.config['number'] == number:
-                return self[name]
-        raise AssertionError("Object not found for number {}".format(number))
+        if self._number_index is None:
+            self._build_number_index()
+
+        try:
+            return self._number_index[number]
+        except (KeyError, TypeError):
+            raise AssertionError("Object not found for number {}".format(number))
@@ -1,6 +1,7 @@
 """Classes for the EventManager and QueuedEvents."""
 import inspect
 from collections import deque, namedtuple
+from time import perf_counter
 import uuid
 
 import asyncio
@@ -10,12 +11,14 @@ from unittest.mock import MagicMock
 
 from typing import Dict, Any, Tuple, Optional, Generator, Callable, List
 
+from mpf.core.handler_profiler import HandlerProfiler
 from mpf.core.mpf_controller import MpfController
 
 MYPY = False
 if MYPY:   # pragma: no cover
     from mpf.core.machine import MachineController
     from mpf.core.placeholder_manager import BaseTemplate
+    from mpf.core.flight_recorder import FlightRecorder
     from typing import Deque
 
 EventHandlerKey = namedtuple("EventHandlerKey", ["key", "event"])
@@ -30,7 +33,8 @@ class EventManager(MpfController):
 
     config_name = "event_manager"
 
-    __slots__ = ["registered_handlers", "event_queue", "callback_queue", "monitor_events", "_queue_tasks"]
+    __slots__ = ["registered_handlers", "event_queue", "callback_queue", "monitor_events", "_queue_tasks",
+                 "posted_events", "profiler", "flight_recorder", "_event_handles"]
 
     def __init__(self, machine: "MachineController") -> None:
         """Initialize EventManager."""
@@ -41,15 +45,64 @@ class EventManager(MpfController):
         self.callback_queue = deque([])     # type: Deque[Tuple[Any, dict]]
         self.monitor_events = False
         self._queue_tasks = []              # type: List[asyncio.Task]
+        self.posted_events = 0
+        # set when handler profiling is enabled. also used by switch handlers and delays
+        self.profiler = None                # type: Optional[HandlerProfiler]
+        # set by the flight recorder. also used by switches and drivers
+        self.flight_recorder = None         # type: Optional[FlightRecorder]
+        self._event_handles = {}            # type: Dict[str, EventHandle]
 
         self.add_handler("debug_dump_stats", self._debug_dump_events)
 
+        # the mpf section is validated after the core modules are loaded
+        if self.machine.config['mpf'].get('handler_profiling'):
+            self.enable_profiling()
+
+    def enable_profiling(self):
+        """Start recording call counts and run times of event, switch and delay handlers."""
+        if not self.profiler:
+            self.profiler = HandlerProfiler()
+
+    def disable_profiling(self):
+        """Stop recording handler run times and discard all counters."""
+        self.profiler = None
+
+    def get_event_handle(self, event: str) -> "EventHandle":
+        """Return the interned handle for an event name.
+
+        Code which posts the same event often can create the handle once (e.g.
+        during init) and post through it. The name is lowercased only once and
+        the handle knows if any handlers are registered without a lookup.
+        """
+        event = event.lower()
+        handle = self._event_handles.get(event)
+        if handle is None:
+            handle = EventHandle(self, event, self.registered_handlers.get(event))
+            self._event_handles[event] = handle
+        return handle
+
+    def _create_handler_list(self, event: str) -> List[RegisteredHandler]:
+        """Create the handler list of an event and update its handle."""
+        handlers = []   # type: List[RegisteredHandler]
+        self.registered_handlers[event] = handlers
+        handle = self._event_handles.get(event)
+        if handle:
+            handle.handlers = handlers
+        return handlers
+
+    def _delete_handler_list(self, event: str) -> None:
+        """Delete the handler list of an event and update its handle."""
+        del self.registered_handlers[event]
+        handle = self._event_handles.get(event)
+        if handle:
+            handle.handlers = None
+
     def _debug_dump_events(self, **kwargs):
         del kwargs
         self.log.info("--- DEBUG DUMP EVENTS ---")
         self.log.info("Total registered_handlers: %s. Total event_queue: %s. Total callback_queue: %s. "
-                      "Total _queue_tasks: %s", len(self.registered_handlers), len(self.event_queue),
-                      len(self.callback_queue), len(self._queue_tasks))
+                      "Total _queue_tasks: %s. Total posted events: %s", len(self.registered_handlers),
+                      len(self.event_queue), len(self.callback_queue), len(self._queue_tasks), self.posted_events)
         self.log.info("Registered Handlers:")
         handlers = sorted(self.registered_handlers.items(), key=lambda x: -len(x[1]))
         for event_name, event_list in handlers:
@@ -59,6 +112,9 @@ class EventManager(MpfController):
         for event_task in self._queue_tasks:
             self.log.info(" %s:", event_task)
 
+        if self.profiler:
+            self.log.info("Slowest handlers:\n%s", self.profiler.format_top())
+
         self.log.info("--- DEBUG DUMP EVENTS END ---")
 
     def get_event_and_condition_from_string(self, event_string: str) -> Tuple[str, Optional["BaseTemplate"]]:
@@ -159,7 +215,7 @@ class EventManager(MpfController):
 
         # Add an entry for this event if it's not there already
         if event not in self.registered_handlers:
-            self.registered_handlers[event] = []
+            self._create_handler_list(event)
 
         key = uuid.uuid4()
 
@@ -269,7 +325,7 @@ class EventManager(MpfController):
         Use carefully. This is currently used to remove handlers for all init events which only occur once.
         """
         if event in self.registered_handlers:
-            del self.registered_handlers[event]
+            self._delete_handler_list(event)
 
     def remove_handler(self, method: Any) -> None:
         """Remove an event handler from all events a method is registered to handle.
@@ -349,7 +405,7 @@ class EventManager(MpfController):
             return
 
         if not self.registered_handlers[event]:  # if value is empty list
-            del self.registered_handlers[event]
+            self._delete_handler_list(event)
             self.debug_log("Removing event %s since there are no more"
                            " handlers registered for it", event)
 
@@ -366,8 +422,14 @@ class EventManager(MpfController):
                                                              _future=future,
                                                              _keys=keys,
                                                              event=event_name)))
+        future.add_done_callback(partial(self._wait_done, _keys=keys))
         return future
 
+    def _wait_done(self, future: asyncio.Future, _keys: List[EventHandlerKey]):
+        # remove handlers right away when the future got cancelled
+        if future.cancelled():
+            self.remove_handlers_by_keys(_keys)
+
     def _wait_handler(self, _future: asyncio.Future, _keys: List[EventHandlerKey], **kwargs):
         for key in _keys:
             self.remove_handler_by_key(key)
@@ -546,8 +608,16 @@ class EventManager(MpfController):
         self._post(event, ev_type='relay', callback=callback, **kwargs)
 
     def _post(self, event: str, ev_type: Optional[str], callback, **kwargs: dict) -> None:
-
         event = event.lower()
+        self._post_lowercase(event, ev_type, callback, kwargs, self.registered_handlers.get(event))
+
+    def _post_lowercase(self, event: str, ev_type: Optional[str], callback, kwargs: dict,
+                        handlers: Optional[List[RegisteredHandler]]) -> None:
+        """Post an event with a lowercase name. handlers is the list of registered handlers or None."""
+        self.posted_events += 1
+
+        if self.flight_recorder:
+            self.flight_recorder.record_event(event, kwargs)
 
         if self._debug_to_console or self._debug_to_file:
             self.debug_log("Event: ===='%s'==== Type: %s, Callback: %s, "
@@ -556,7 +626,7 @@ class EventManager(MpfController):
             self.info_log("Event: ======'%s'====== Args=%s", event, kwargs)
 
         # fast path for events without handler
-        if not callback and not self.monitor_events and event not in self.registered_handlers:
+        if not callback and not self.monitor_events and not handlers:
             return
 
         if not self.event_queue and hasattr(self.machine.clock, "loop"):
@@ -613,7 +683,12 @@ class EventManager(MpfController):
             except KeyError:
                 queue = QueuedEvent(self.debug_log)
 
-            handler.callback(queue=queue, **merged_kwargs)
+            if self.profiler:
+                start = perf_counter()
+                handler.callback(queue=queue, **merged_kwargs)
+                self.profiler.record(event, handler.callback, perf_counter() - start)
+            else:
+                handler.callback(queue=queue, **merged_kwargs)
 
             if queue.waiter:
                 queue.event = asyncio.Event(loop=self.machine.clock.loop)
@@ -655,7 +730,12 @@ class EventManager(MpfController):
                 pass
 
             # call the handler and save the results
-            result = handler.callback(**merged_kwargs)
+            if self.profiler:
+                start = perf_counter()
+                result = handler.callback(**merged_kwargs)
+                self.profiler.record(event, handler.callback, perf_counter() - start)
+            else:
+                result = handler.callback(**merged_kwargs)
 
             # If whatever handler we called returns False, we stop
             # processing the remaining handlers for boolean or queue events
@@ -747,6 +827,52 @@ class EventManager(MpfController):
                 callback(**kwargs)
 
 
+class EventHandle(object):
+
+    """Interned event which can be posted without building or lowercasing its name.
+
+    Get handles via :meth:`EventManager.get_event_handle`. ``handlers`` is the
+    list of registered handlers (or None) which is kept up to date by the
+    event manager.
+    """
+
+    __slots__ = ["name", "handlers", "_manager"]
+
+    def __init__(self, manager: EventManager, name: str, handlers: Optional[List[RegisteredHandler]]) -> None:
+        """Initialise event handle."""
+        self._manager = manager
+        self.name = name
+        self.handlers = handlers
+
+    def __repr__(self):
+        """Return string representation."""
+        return "<EventHandle {}>".format(self.name)
+
+    def has_handlers(self) -> bool:
+        """Return true if any handlers are registered for this event."""
+        return bool(self.handlers)
+
+    def post(self, callback=None, **kwargs) -> None:
+        """Post this event. See :meth:`EventManager.post`."""
+        # pylint: disable-msg=protected-access
+        self._manager._post_lowercase(self.name, None, callback, kwargs, self.handlers)
+
+    def post_boolean(self, callback=None, **kwargs) -> None:
+        """Post this event as boolean event. See :meth:`EventManager.post_boolean`."""
+        # pylint: disable-msg=protected-access
+        self._manager._post_lowercase(self.name, 'boolean', callback, kwargs, self.handlers)
+
+    def post_queue(self, callback, **kwargs) -> None:
+        """Post this event as queue event. See :meth:`EventManager.post_queue`."""
+        # pylint: disable-msg=protected-access
+        self._manager._post_lowercase(self.name, 'queue', callback, kwargs, self.handlers)
+
+    def post_relay(self, callback=None, **kwargs) -> None:
+        """Post this event as relay event. See :meth:`EventManager.post_relay`."""
+        # pylint: disable-msg=protected-access
+        self._manager._post_lowercase(self.name, 'relay', callback, kwargs, self.handlers)
+
+
 class QueuedEvent(object):
 
     """Base class for an event queue which is created each time a queue event is called."""
@@ -0,0 +1,155 @@
+"""Records the last events, switch changes and coil pulses in a ring buffer."""
+import os
+import reprlib
+import time
+from array import array
+from datetime import datetime
+
+from mpf.core.mpf_controller import MpfController
+
+MYPY = False
+if MYPY:   # pragma: no cover
+    from mpf.core.machine import MachineController
+
+KIND_EVENT = 1
+KIND_SWITCH = 2
+KIND_PULSE = 3
+
+KIND_NAMES = {KIND_EVENT: "EVENT", KIND_SWITCH: "SWITCH", KIND_PULSE: "PULSE"}
+
+# values of these types are immutable and stored as they are
+SCALAR_TYPES = (int, float, bool, str, type(None))
+
+
+class RecordedRepr(str):
+
+    """Limited repr of a kwarg value which was recorded instead of the value."""
+
+    __slots__ = []
+
+
+class FlightRecorder(MpfController):
+
+    """Always records the last ``size`` events, switch changes and coil pulses.
+
+    Entries are stored in preallocated arrays which are overwritten in a
+    ring. Switch states and pulse ms are stored as they are. Event kwargs are
+    stored as a tuple of (key, value) items where every value which is not a
+    number, string, bool or None is replaced by a repr which is limited to
+    ``max_value_length`` while it is built. Strings are truncated only when
+    dumping. So entries neither keep objects alive nor change when the
+    objects change later. The recorder is dumped to a file on a
+    crash, on shutdown and on the ``flight_recorder`` BCP command.
+    """
+
+    config_name = "flight_recorder"
+
+    def __init__(self, machine: "MachineController") -> None:
+        """Initialise flight recorder."""
+        super().__init__(machine)
+        self.machine.validate_machine_config_section('flight_recorder')
+        self.config = self.machine.config['flight_recorder']
+
+        self.size = self.config['size']
+        self.max_value_length = self.config['max_value_length']
+        self._repr = reprlib.Repr()
+        self._repr.maxstring = self.max_value_length
+        self._repr.maxother = self.max_value_length
+        self.recorded = 0
+        self._index = 0
+        self._times = array('d', [0.0]) * self.size
+        self._kinds = bytearray(self.size)
+        self._names = [None] * self.size
+        self._values = [None] * self.size
+
+        if self.config['enabled']:
+            self.machine.events.flight_recorder = self
+            self.machine.events.add_handler('shutdown', self._shutdown)
+
+    def record_event(self, event: str, kwargs: dict):
+        """Record an event with a snapshot of its kwargs."""
+        if kwargs:
+            self.record(KIND_EVENT, event, tuple((key, self._snapshot(value)) for key, value in kwargs.items()))
+        else:
+            self.record(KIND_EVENT, event, ())
+
+    def _snapshot(self, value):
+        """Return value if it is a scalar or its limited repr."""
+        if isinstance(value, SCALAR_TYPES):
+            return value
+        return RecordedRepr(self._repr.repr(value))
+
+    def _format_value(self, value) -> str:
+        """Return repr of a recorded value truncated to max_value_length."""
+        if isinstance(value, RecordedRepr):
+            return value
+        if isinstance(value, str) and len(value) > self.max_value_length:
+            return repr(value[:self.max_value_length]) + "..."
+        return repr(value)
+
+    def record(self, kind: int, name: str, value):
+        """Record an entry and overwrite the oldest one if the buffer is full.
+
+        value has to be immutable and must not reference machine objects.
+        """
+        index = self._index
+        self._times[index] = self.machine.clock.loop.time()
+        self._kinds[index] = kind
+        self._names[index] = name
+        self._values[index] = value
+        index += 1
+        self._index = 0 if index == self.size else index
+        self.recorded += 1
+
+    def get_entries(self):
+        """Return a list of (time, kind, name, value) tuples. Oldest first."""
+        count = min(self.recorded, self.size)
+        start = (self._index - count) % self.size
+        entries = []
+        for i in range(count):
+            index = (start + i) % self.size
+            entries.append((self._times[index], KIND_NAMES[self._kinds[index]], self._names[index],
+                            self._values[index]))
+        return entries
+
+    def format_entries(self):
+        """Return all entries as lines of text with wall clock time."""
+        # the recorder stores loop time which is converted only when dumping
+        offset = time.time() - self.machine.clock.loop.time()
+        lines = []
+        for entry_time, kind, name, value in self.get_entries():
+            if isinstance(value, tuple):
+                # event kwargs
+                value = "{" + ", ".join("{!r}: {}".format(key, self._format_value(item))
+                                        for key, item in value) + "}"
+            else:
+                value = self._format_value(value)
+            if len(value) > self.max_value_length:
+                value = value[:self.max_value_length] + "..."
+            lines.append("{} {:<6} {} {}".format(
+                datetime.fromtimestamp(entry_time + offset).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+                kind, name, value))
+        return lines
+
+    def dump(self, reason: str) -> str:
+        """Write all entries to a new file in the dump folder and return its path."""
+        folder = os.path.join(self.machine.machine_path, self.config['folder'])
+        os.makedirs(folder, exist_ok=True)
+        file_name = os.path.join(folder, "flight_recorder_{}.txt".format(
+            datetime.now().strftime("%Y-%m-%d-%H-%M-%S-%f")))
+        with open(file_name, "w") as f:
+            f.write("# Flight recorder dump ({}). {} of {} entries recorded.\n".format(
+                reason, min(self.recorded, self.size), self.recorded))
+            for line in self.format_entries():
+                f.write(line + "\n")
+
+        self.info_log("Dumped flight recorder to %s", file_name)
+        return file_name
+
+    def _shutdown(self, **kwargs):
+        del kwargs
+        # pylint: disable-msg=protected-access
+        if self.machine._exception and self.config['dump_on_crash']:
+            self.dump("crash")
+        elif self.config['dump_on_stop']:
+            self.dump("stop")
@@ -0,0 +1,69 @@
+"""Records how much time event, switch and delay handlers take."""
+import asyncio
+import functools
+import heapq
+
+MYPY = False
+if MYPY:   # pragma: no cover
+    from typing import Dict, List, Tuple
+
+
+def get_callback_name(callback) -> str:
+    """Return the qualified name of a callback or the coroutine of a task."""
+    while isinstance(callback, functools.partial):
+        callback = callback.func
+
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        # pylint: disable-msg=protected-access
+        coro = owner._coro
+        return getattr(coro, "__qualname__", repr(coro))
+
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+class HandlerProfiler(object):
+
+    """Call count, cumulative and max time per (source, handler).
+
+    The source is the event name for event handlers, ``switch:<name>-<state>``
+    for switch handlers and ``delay`` for delays. Times include everything the
+    handler runs synchronously (e.g. events posted by it which are processed
+    immediately).
+    """
+
+    __slots__ = ["stats"]
+
+    def __init__(self) -> None:
+        """Initialise empty profiler."""
+        self.stats = {}     # type: Dict[Tuple[str, str], List]
+
+    def record(self, source: str, callback, duration: float):
+        """Record one call of callback for source."""
+        name = get_callback_name(callback)
+        entry = self.stats.get((source, name))
+        if entry is None:
+            self.stats[(source, name)] = [1, duration, duration]
+        else:
+            entry[0] += 1
+            entry[1] += duration
+            if duration > entry[2]:
+                entry[2] = duration
+
+    def get_top(self, count=20, sort_by="total") -> "List[dict]":
+        """Return the top handlers sorted by total, max or count with times in ms."""
+        column = {"count": 0, "total": 1, "max": 2}[sort_by]
+        top = heapq.nlargest(count, self.stats.items(), key=lambda item: item[1][column])
+        return [{"source": source, "handler": name, "count": entry[0], "total": round(entry[1] * 1000, 3),
+                 "max": round(entry[2] * 1000, 3)} for (source, name), entry in top]
+
+    def format_top(self, count=20, sort_by="total") -> str:
+        """Return a text table of the top handlers."""
+        lines = ["{:>8} {:>10} {:>9}  {} -> {}".format("Calls", "Total ms", "Max ms", "Source", "Handler")]
+        for row in self.get_top(count, sort_by):
+            lines.append("{count:>8} {total:>10.3f} {max:>9.3f}  {source} -> {handler}".format(**row))
+        return "\n".join(lines)
+
+    def reset(self):
+        """Clear all counters."""
+        self.stats = {}
@@ -1,6 +1,6 @@
 """Handles all light updates."""
 import asyncio
-from typing import Dict
+from typing import Dict, List, Set
 
 from mpf.core.machine import MachineController
 from mpf.core.settings_controller import SettingEntry
@@ -9,6 +9,10 @@ from mpf.core.rgb_color import RGBColorCorrectionProfile, RGBColor
 
 from mpf.core.mpf_controller import MpfController
 
+MYPY = False
+if MYPY:   # pragma: no cover
+    from mpf.devices.light import Light
+
 
 class LightController(MpfController):
 
@@ -28,6 +32,16 @@ class LightController(MpfController):
 
         self._monitor_update_task = None                    # type: asyncio.Task
 
+        # lights which changed during this loop turn. they are flushed once at the end of it
+        self._dirty_lights = []                             # type: List[Light]
+        self._dirty_lights_set = set()                      # type: Set[Light]
+        self.updates_requested = 0
+        self.updates_coalesced = 0
+        self.flushes = 0
+        self.light_syncs = 0
+
+        self.machine.events.add_handler("debug_dump_stats", self._debug_dump_stats)
+
         if 'named_colors' in self.machine.config:
             self._load_named_colors()
 
@@ -72,6 +86,46 @@ class LightController(MpfController):
         self.machine.settings.add_setting(SettingEntry("brightness", "Brightness", 100, "brightness", 1.0,
                                                        {0.25: "25%", 0.5: "50%", 0.75: "75%", 1.0: "100% (default)"}))
 
+    def schedule_update(self, light: "Light"):
+        """Update the hw drivers of a light and sync its platforms at the end of this loop turn.
+
+        Multiple updates of the same light are coalesced and every platform is
+        synced only once per turn even if hundreds of lights changed.
+        """
+        self.updates_requested += 1
+        if light in self._dirty_lights_set:
+            self.updates_coalesced += 1
+            return
+
+        if not self._dirty_lights:
+            self.machine.clock.loop.call_soon(self._flush)
+        self._dirty_lights.append(light)
+        self._dirty_lights_set.add(light)
+
+    def _flush(self):
+        """Update all dirty lights and sync their platforms."""
+        lights = self._dirty_lights
+        self._dirty_lights = []
+        self._dirty_lights_set = set()
+
+        platforms = set()
+        for light in lights:
+            light.update_hw_drivers()
+            platforms.update(light.platforms)
+
+        for platform in platforms:
+            platform.light_sync()
+
+        self.flushes += 1
+        self.light_syncs += len(platforms)
+
+    def _debug_dump_stats(self, **kwargs):
+        del kwargs
+        self.log.info("--- DEBUG DUMP LIGHTS ---")
+        self.log.info("Light updates requested: %s. Coalesced: %s. Flushes: %s. Platform syncs: %s",
+                      self.updates_requested, self.updates_coalesced, self.flushes, self.light_syncs)
+        self.log.info("--- DEBUG DUMP LIGHTS END ---")
+
     def monitor_lights(self):
         """Update the color of lights for the monitor."""
         if not self._monitor_update_task:
@@ -85,11 +85,13 @@ class LogMixin(object):
         if not self.log:
             self._logging_not_configured()
 
-        code = None
         if self._info_to_console or self._debug_to_console:
             code = 21
         elif self._info_to_file or self._debug_to_file:
             code = 11
+        else:
+            # info logging is off for this module
+            return
 
         if context:
             self.log.log(code, msg + " context: " + context, *args, **kwargs)
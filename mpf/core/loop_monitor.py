@@ -0,0 +1,255 @@
+"""Monitors the lag of the event loop and the run time of callbacks."""
+import asyncio
+import heapq
+import time
+
+from mpf.core.handler_profiler import get_callback_name
+from mpf.core.mpf_controller import MpfController
+
+MYPY = False
+if MYPY:   # pragma: no cover
+    from mpf.core.machine import MachineController
+    from typing import Dict, List
+
+# loops with callback profiling enabled and the original Handle._run
+_PROFILED_LOOPS = {}    # type: Dict[asyncio.AbstractEventLoop, LoopMonitor]
+_ORIGINAL_HANDLE_RUN = None
+
+
+def _profiled_handle_run(handle):
+    """Run an asyncio handle and record its run time if the loop is profiled."""
+    # pylint: disable-msg=protected-access
+    monitor = _PROFILED_LOOPS.get(handle._loop)
+    if monitor is None:
+        return _ORIGINAL_HANDLE_RUN(handle)
+
+    start = time.perf_counter()
+    try:
+        return _ORIGINAL_HANDLE_RUN(handle)
+    finally:
+        monitor.record_callback(handle._callback, time.perf_counter() - start)
+
+
+class LatencyHistogram(object):
+
+    """Histogram with a fixed relative precision (like HdrHistogram).
+
+    Values are stored in microseconds. Values below 32us have their own bucket.
+    Above that every power of two is split into 16 buckets which results in an
+    error of less than 7%. Recording a value is O(1) and does not allocate.
+    """
+
+    __slots__ = ["counts", "count", "total", "max", "_highest_index"]
+
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+    def __init__(self, highest_trackable_value=60.0):
+        """Initialise histogram for values up to highest_trackable_value seconds."""
+        self._highest_index = self._index_for(int(highest_trackable_value * 1000000))
+        self.counts = [0] * (self._highest_index + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @classmethod
+    def _index_for(cls, value_us: int) -> int:
+        """Return bucket index for a value in us."""
+        exponent = value_us.bit_length() - cls.SUB_BUCKET_BITS
+        if exponent <= 0:
+            return value_us
+        return cls.SUB_BUCKET_HALF * exponent + (value_us >> exponent)
+
+    @classmethod
+    def _highest_value_for(cls, index: int) -> int:
+        """Return highest value in us which is stored in bucket index."""
+        if index < 2 * cls.SUB_BUCKET_HALF:
+            return index
+        exponent = index // cls.SUB_BUCKET_HALF - 1
+        mantissa = index - cls.SUB_BUCKET_HALF * exponent
+        return ((mantissa + 1) << exponent) - 1
+
+    def record(self, value: float):
+        """Record a value in seconds."""
+        if value < 0:
+            value = 0.0
+        index = self._index_for(int(value * 1000000))
+        self.counts[min(index, self._highest_index)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def get_percentile(self, percentile: float) -> float:
+        """Return the value in seconds below which percentile percent of all values are."""
+        if not self.count:
+            return 0.0
+        target = max(1, percentile / 100 * self.count)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                if index == self._highest_index:
+                    return self.max
+                return min(self._highest_value_for(index) / 1000000, self.max)
+
+        return self.max     # pragma: no cover
+
+    def get_mean(self) -> float:
+        """Return mean in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def get_summary(self) -> dict:
+        """Return count and percentiles in ms."""
+        return {
+            "count": self.count,
+            "mean": round(self.get_mean() * 1000, 3),
+            "p50": round(self.get_percentile(50) * 1000, 3),
+            "p90": round(self.get_percentile(90) * 1000, 3),
+            "p99": round(self.get_percentile(99) * 1000, 3),
+            "max": round(self.max * 1000, 3),
+        }
+
+    def reset(self):
+        """Clear all values."""
+        self.counts = [0] * (self._highest_index + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class LoopMonitor(MpfController):
+
+    """Samples the scheduling delay of the loop and profiles slow callbacks.
+
+    A timer is scheduled every ``sample_interval`` and the difference between
+    the time it was due and the time it ran is recorded as lag. With
+    ``callback_profiling`` enabled the run time of every callback on the loop
+    is recorded and callbacks above ``slow_callback_threshold`` are tracked
+    by their qualified name.
+    """
+
+    config_name = "loop_monitor"
+
+    def __init__(self, machine: "MachineController") -> None:
+        """Initialise loop monitor."""
+        super().__init__(machine)
+        self.machine.validate_machine_config_section('loop_monitor')
+        self.config = self.machine.config['loop_monitor']
+
+        self.lag_histogram = LatencyHistogram()
+        self.callback_histogram = LatencyHistogram()
+        self.slow_callbacks = {}        # type: Dict[str, List]
+
+        self._sample_interval = self.config['sample_interval'] / 1000
+        self._slow_callback_threshold = self.config['slow_callback_threshold'] / 1000
+        self._lag_warning_threshold = self.config['lag_warning_threshold'] / 1000
+        self._expected_time = None
+        self._sample_handle = None      # type: asyncio.TimerHandle
+        self._report_task = None
+
+        if self.config['enabled']:
+            self.start()
+
+    def start(self):
+        """Start sampling and profiling."""
+        self.machine.events.add_handler('shutdown', self.stop)
+        self._schedule_sample()
+        if self.config['callback_profiling']:
+            self._enable_callback_profiling()
+
+    def stop(self, **kwargs):
+        """Stop sampling and restore the loop."""
+        del kwargs
+        if self._sample_handle:
+            self._sample_handle.cancel()
+            self._sample_handle = None
+        self.stop_reporting()
+        self._disable_callback_profiling()
+
+    def reset(self):
+        """Clear all histograms and slow callbacks."""
+        self.lag_histogram.reset()
+        self.callback_histogram.reset()
+        self.slow_callbacks = {}
+
+    def _schedule_sample(self):
+        self._expected_time = self.machine.clock.loop.time() + self._sample_interval
+        self._sample_handle = self.machine.clock.loop.call_at(self._expected_time, self._sample)
+
+    def _sample(self):
+        lag = self.machine.clock.loop.time() - self._expected_time
+        self.lag_histogram.record(lag)
+        if lag > self._lag_warning_threshold:
+            self.warning_log("Loop lag of %sms. A callback blocked the loop.", round(lag * 1000))
+        self._schedule_sample()
+
+    def _enable_callback_profiling(self):
+        global _ORIGINAL_HANDLE_RUN     # pylint: disable-msg=global-statement
+        if not isinstance(self.machine.clock.loop, asyncio.BaseEventLoop):
+            self.warning_log("Callback profiling is not supported on %s.", self.machine.clock.loop)
+            return
+
+        if _ORIGINAL_HANDLE_RUN is None:
+            # pylint: disable-msg=protected-access
+            _ORIGINAL_HANDLE_RUN = asyncio.events.Handle._run
+            asyncio.events.Handle._run = _profiled_handle_run
+        _PROFILED_LOOPS[self.machine.clock.loop] = self
+
+    def _disable_callback_profiling(self):
+        global _ORIGINAL_HANDLE_RUN     # pylint: disable-msg=global-statement
+        if _PROFILED_LOOPS.get(self.machine.clock.loop) is not self:
+            return
+
+        del _PROFILED_LOOPS[self.machine.clock.loop]
+        if not _PROFILED_LOOPS:
+            # pylint: disable-msg=protected-access
+            asyncio.events.Handle._run = _ORIGINAL_HANDLE_RUN
+            _ORIGINAL_HANDLE_RUN = None
+
+    def record_callback(self, callback, duration: float):
+        """Record the run time of a callback."""
+        self.callback_histogram.record(duration)
+        if duration < self._slow_callback_threshold:
+            return
+
+        name = get_callback_name(callback)
+        entry = self.slow_callbacks.get(name)
+        if entry is None:
+            self.slow_callbacks[name] = [1, duration, duration]
+        else:
+            entry[0] += 1
+            entry[1] += duration
+            if duration > entry[2]:
+                entry[2] = duration
+
+    def get_slowest_callbacks(self, count=None) -> "List[dict]":
+        """Return name, count, total and max time in ms of the slowest callbacks."""
+        slowest = heapq.nlargest(count or self.config['slowest_callbacks'], self.slow_callbacks.items(),
+                                 key=lambda item: item[1][2])
+        return [{"name": name, "count": entry[0], "total": round(entry[1] * 1000, 3),
+                 "max": round(entry[2] * 1000, 3)} for name, entry in slowest]
+
+    def get_status(self) -> dict:
+        """Return lag and callback statistics."""
+        return {
+            "lag": self.lag_histogram.get_summary(),
+            "callbacks": self.callback_histogram.get_summary(),
+            "slowest_callbacks": self.get_slowest_callbacks(),
+        }
+
+    def start_reporting(self):
+        """Send statistics to BCP clients which monitor the loop."""
+        if not self._report_task:
+            self._report_task = self.machine.clock.schedule_interval(self._report,
+                                                                     self.config['report_interval'] / 1000)
+
+    def stop_reporting(self):
+        """Stop sending statistics to BCP clients."""
+        if self._report_task:
+            self._report_task.cancel()
+            self._report_task = None
+
+    def _report(self):
+        self.machine.bcp.transport.send_to_clients_with_handler(
+            handler="_monitor_loop", bcp_command="loop_monitor", **self.get_status())
@@ -21,13 +21,14 @@ from mpf.core.config_validator import ConfigValidator
 from mpf.core.data_manager import DataManager
 from mpf.core.delays import DelayManager, DelayManagerRegistry
 from mpf.core.device_manager import DeviceCollection, DeviceCollectionType
+from mpf.core.platform_service import PlatformService
 from mpf.core.utility_functions import Util
 from mpf.core.logging import LogMixin
 
 MYPY = False
 if MYPY:   # pragma: no cover
     from mpf.modes.game.code.game import Game
-    from mpf.core.events import EventManager
+    from mpf.core.events import EventManager, EventHandle
     from mpf.core.switch_controller import SwitchController
     from mpf.core.show_controller import ShowController
     from mpf.core.service_controller import ServiceController
@@ -116,6 +117,7 @@ class MachineController(LogMixin):
         self.game = None            # type: Game
         self.machine_vars = dict()
         self.machine_var_monitor = False
+        self._machine_var_event_handles = dict()    # type: Dict[str, EventHandle]
         self.machine_var_data_manager = None    # type: DataManager
         self.thread_stopper = threading.Event()
 
@@ -176,6 +178,7 @@ class MachineController(LogMixin):
 
         self.hardware_platforms = dict()    # type: Dict[str, SmartVirtualHardwarePlatform]
         self.default_platform = None        # type: SmartVirtualHardwarePlatform
+        self.platform_services = []         # type: List[PlatformService]
 
         self.clock = self._load_clock()
         self.stop_future = asyncio.Future(loop=self.clock.loop)     # type: asyncio.Future
@@ -298,7 +301,9 @@ class MachineController(LogMixin):
         for hardware_platform in list(self.hardware_platforms.values()):
             yield from hardware_platform.start()
             if not hardware_platform.features['tickless']:
-                self.clock.schedule_interval(hardware_platform.tick, 1 / self.config['mpf']['default_platform_hz'])
+                service = PlatformService(hardware_platform, self.clock.loop)
+                service.start()
+                self.platform_services.append(service)
 
     def _initialize_credit_string(self):
         """Set default credit string."""
@@ -729,6 +734,10 @@ class MachineController(LogMixin):
 
     def _platform_stop(self) -> None:
         """Stop all platforms."""
+        for service in self.platform_services:
+            service.stop()
+        self.platform_services = []
+
         for hardware_platform in list(self.hardware_platforms.values()):
             hardware_platform.stop()
 
@@ -810,10 +819,14 @@ class MachineController(LogMixin):
             self.debug_log("Setting machine_var '%s' to: %s, (prior: %s, "
                            "change: %s)", name, value, prev_value,
                            change)
-            self.events.post('machine_var_' + name,
-                             value=value,
-                             prev_value=prev_value,
-                             change=change)
+            handle = self._machine_var_event_handles.get(name)
+            if handle is None:
+                handle = self.events.get_event_handle('machine_var_' + name)
+                self._machine_var_event_handles[name] = handle
+
+            handle.post(value=value,
+                        prev_value=prev_value,
+                        change=change)
             '''event: machine_var_(name)
 
             desc: Posted when a machine variable is added or changes value.
@@ -31,7 +31,8 @@ class Mode(LogMixin):
     __slots__ = ["machine", "config", "name", "path", "priority", "_active", "_starting", "_mode_start_wait_queue",
                  "stop_methods", "start_callback", "stop_callbacks", "event_handlers", "switch_handlers",
                  "mode_stop_kwargs", "mode_devices", "start_event_kwargs", "stopping", "delay", "player",
-                 "auto_stop_on_ball_end", "restart_on_next_ball"]
+                 "auto_stop_on_ball_end", "restart_on_next_ball", "_will_start_event", "_starting_event",
+                 "_started_event", "_will_stop_event", "_stopping_event", "_stopped_event"]
 
     def __init__(self, machine: "MachineController", config, name: str, path) -> None:
         """Initialise mode.
@@ -64,6 +65,14 @@ class Mode(LogMixin):
         self.start_event_kwargs = None          # type: Dict[str, Any]
         self.stopping = False
 
+        events = self.machine.events
+        self._will_start_event = events.get_event_handle('mode_{}_will_start'.format(self.name))
+        self._starting_event = events.get_event_handle('mode_{}_starting'.format(self.name))
+        self._started_event = events.get_event_handle('mode_{}_started'.format(self.name))
+        self._will_stop_event = events.get_event_handle('mode_{}_will_stop'.format(self.name))
+        self._stopping_event = events.get_event_handle('mode_{}_stopping'.format(self.name))
+        self._stopped_event = events.get_event_handle('mode_{}_stopped'.format(self.name))
+
         self.delay = DelayManager(self.machine.delayRegistry)
         '''DelayManager instance for delays in this mode. Note that all delays
         scheduled here will be automatically canceled when the mode stops.'''
@@ -172,7 +181,7 @@ class Mode(LogMixin):
 
         self._starting = True
 
-        self.machine.events.post('mode_{}_will_start'.format(self.name), **kwargs)
+        self._will_start_event.post(**kwargs)
         '''event: mode_(name)_will_start
 
         desc: Posted when a mode is about to start. The "name" part is replaced
@@ -225,8 +234,7 @@ class Mode(LogMixin):
 
         self._setup_device_control_events()
 
-        self.machine.events.post_queue(event='mode_{}_starting'.format(self.name),
-                                       callback=self._started, **kwargs)
+        self._starting_event.post_queue(callback=self._started, **kwargs)
         '''event: mode_(name)_starting
 
         desc: The mode called "name" is starting.
@@ -246,8 +254,7 @@ class Mode(LogMixin):
         for event_name in self.config['mode']['events_when_started']:
             self.machine.events.post(event_name)
 
-        self.machine.events.post(event='mode_{}_started'.format(self.name), callback=self._mode_started_callback,
-                                 **self.start_event_kwargs)
+        self._started_event.post(callback=self._mode_started_callback, **self.start_event_kwargs)
         '''event: mode_(name)_started
 
         desc: Posted when a mode has started. The "name" part is replaced
@@ -296,7 +303,7 @@ class Mode(LogMixin):
             # mode is still running
             return True
 
-        self.machine.events.post('mode_' + self.name + '_will_stop')
+        self._will_stop_event.post()
         '''event: mode_(name)_will_stop
 
         desc: Posted when a mode is about to stop. The "name" part is replaced
@@ -316,8 +323,7 @@ class Mode(LogMixin):
 
         self.delay.clear()
 
-        self.machine.events.post_queue(event='mode_' + self.name + '_stopping',
-                                       callback=self._stopped)
+        self._stopping_event.post_queue(callback=self._stopped)
         '''event: mode_(name)_stopping
 
         desc: The mode called "name" is stopping. This is a queue event. The
@@ -345,8 +351,7 @@ class Mode(LogMixin):
         for event_name in self.config['mode']['events_when_stopped']:
             self.machine.events.post(event_name)
 
-        self.machine.events.post('mode_' + self.name + '_stopped',
-                                 callback=self._mode_stopped_callback)
+        self._stopped_event.post(callback=self._mode_stopped_callback)
         '''event: mode_(name)_stopped
 
         desc: Posted when a mode has stopped. The "name" part is replaced
@@ -5,7 +5,7 @@ import asyncio
 import operator as op
 import abc
 import re
-from typing import Tuple, List, Any
+from typing import Tuple, List, Any, Optional
 
 from mpf.core.utility_functions import Util
 
@@ -225,7 +225,12 @@ class MpfFormatter(string.Formatter):
 
 class TextTemplate:
 
-    """Text placeholder."""
+    """Text placeholder.
+
+    The text is compiled once into literals and placeholder templates. Texts
+    which the compiler cannot handle (e.g. nested fields in format specs) are
+    evaluated by the MpfFormatter.
+    """
 
     var_finder = re.compile("(?<=\\()[a-zA-Z_0-9|]+(?=\\))")
     string_finder = re.compile("(?<=\\$)[a-zA-Z_0-9]+")
@@ -236,23 +241,68 @@ class TextTemplate:
         self.text = text
         self.vars = self.var_finder.findall(text)
         self._change_callback = None
+        self._formatter = MpfFormatter(machine, {}, False)
+        self._parts = self._compile(text)
+
+    def _compile(self, text) -> Optional[List[Tuple[str, Any, str, str]]]:
+        """Return literals and templates of all fields or None if the formatter has to be used."""
+        parts = []
+        try:
+            for literal, field_name, format_spec, conversion in self._formatter.parse(text):
+                if field_name is None:
+                    parts.append((literal, None, None, None))
+                elif not field_name or "{" in format_spec:
+                    return None
+                else:
+                    parts.append((literal, self.machine.placeholder_manager.build_raw_template(field_name),
+                                  format_spec, conversion))
+        except (ValueError, SyntaxError):
+            return None
+        return parts
+
+    def _format(self, parameters, subscriptions: Optional[List[asyncio.Future]]) -> str:
+        """Evaluate compiled text and add futures to subscriptions if it is not None."""
+        result = []
+        for literal, template, format_spec, conversion in self._parts:
+            result.append(literal)
+            if template is None:
+                continue
+            if subscriptions is None:
+                value = template.evaluate(parameters)
+            else:
+                value, future = template.evaluate_and_subscribe(parameters)
+                if future:
+                    subscriptions.append(future)
+            value = self._formatter.convert_field(value, conversion)
+            result.append(self._formatter.format_field(value, format_spec))
+        return "".join(result)
 
     def evaluate(self, parameters) -> str:
         """Evaluate placeholder to string."""
+        if self._parts is not None:
+            return self._format(parameters, None)
         f = MpfFormatter(self.machine, parameters, False)
         return f.format(self.text)
 
     def evaluate_and_subscribe(self, parameters) -> Tuple[str, asyncio.Future]:
-        """Evaluate placeholder to string and subscribe to changes."""
-        f = MpfFormatter(self.machine, parameters, True)
-        value = f.format(self.text)
-        subscriptions = f.subscriptions
+        """Evaluate placeholder to string and subscribe to changes.
+
+        The returned future is done when any of the variables changed.
+        """
+        if self._parts is not None:
+            subscriptions = []  # type: List[asyncio.Future]
+            value = self._format(parameters, subscriptions)
+        else:
+            f = MpfFormatter(self.machine, parameters, True)
+            value = f.format(self.text)
+            subscriptions = f.subscriptions
         if not subscriptions:
             future = asyncio.Future(loop=self.machine.clock.loop)   # type: asyncio.Future
         elif len(subscriptions) == 1:
             future = subscriptions[0]
         else:
-            future = Util.any(subscriptions, loop=self.machine.clock.loop)
+            # cancel the other subscriptions once one variable changed
+            future = Util.first(subscriptions, loop=self.machine.clock.loop)
         future = Util.ensure_future(future, loop=self.machine.clock.loop)
         return value, future
 
@@ -667,7 +717,8 @@ class BasePlaceholderManager(MpfController):
         elif len(subscriptions) == 1:
             future = subscriptions[0]
         else:
-            future = Util.any(subscriptions, loop=self.machine.clock.loop)
+            # cancel the other subscriptions once one variable changed
+            future = Util.first(subscriptions, loop=self.machine.clock.loop)
         future = Util.ensure_future(future, loop=self.machine.clock.loop)
         return value, future
 
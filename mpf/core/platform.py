@@ -78,18 +78,45 @@ class BasePlatform(metaclass=abc.ABCMeta):
         """Start receiving switch changes from this platform."""
         pass
 
-    def tick(self):
+    def tick(self) -> Optional[bool]:
         """Run task.
 
-        Called periodically.
+        Called periodically unless the platform is tickless. See get_service_settings.
 
         Subclass this method in a platform module to perform periodic updates
         to the platform hardware, e.g. reading switches, sending driver or
-        light updates, etc.
+        light updates, etc. Return true if there was work to do (e.g. switch
+        changes). Otherwise, tick will be called less often down to the
+        max_interval of the service settings.
 
         """
         pass
 
+    def get_service_settings(self) -> "ServiceSettings":
+        """Return how often tick and tickle_watchdog should be called.
+
+        By default tick is called at default_platform_hz and there is no
+        watchdog, no separate flush and no readiness fd.
+        """
+        interval = 1 / self.machine.config['mpf']['default_platform_hz']
+        return ServiceSettings(min_interval=interval, max_interval=interval, watchdog_interval=None,
+                               flush_interval=None, readiness_fd=None)
+
+    def tickle_watchdog(self):
+        """Tickle the hardware watchdog.
+
+        Called every watchdog_interval of the service settings.
+        """
+        pass
+
+    def flush(self):
+        """Send queued commands to the hardware.
+
+        Called every flush_interval of the service settings. Platforms which
+        back off their tick use this to send commands without delay.
+        """
+        pass
+
     def stop(self):
         """Stop the platform.
 
@@ -402,6 +429,8 @@ class SwitchPlatform(BasePlatform, metaclass=abc.ABCMeta):
         raise NotImplementedError
 
 
+ServiceSettings = namedtuple("ServiceSettings", ["min_interval", "max_interval", "watchdog_interval", "flush_interval",
+                                                 "readiness_fd"])
 SwitchSettings = namedtuple("SwitchSettings", ["hw_switch", "invert", "debounce"])
 DriverSettings = namedtuple("DriverSettings", ["hw_driver", "pulse_settings", "hold_settings", "recycle"])
 DriverConfig = namedtuple("DriverConfig", ["default_pulse_ms", "default_pulse_power", "default_hold_power",
@@ -0,0 +1,85 @@
+"""Calls the tick and watchdog of platforms which are not tickless."""
+import asyncio
+
+MYPY = False
+if MYPY:   # pragma: no cover
+    from mpf.core.platform import BasePlatform
+
+
+class PlatformService:
+
+    """Services one platform based on its ServiceSettings.
+
+    ``tick`` is called every ``min_interval`` as long as it returns true (i.e.
+    the platform had work to do). When it returns false the interval doubles
+    up to ``max_interval``. If the platform has a readiness fd ``tick`` is
+    called as soon as the fd becomes readable. The watchdog is tickled every
+    ``watchdog_interval`` and ``flush`` is called every ``flush_interval``
+    independent of the load.
+    """
+
+    __slots__ = ["platform", "settings", "loop", "ticks", "busy_ticks", "watchdog_tickles", "flushes", "_interval",
+                 "_tick_handle", "_watchdog_handle", "_flush_handle"]
+
+    def __init__(self, platform: "BasePlatform", loop: asyncio.AbstractEventLoop) -> None:
+        """Initialise service for platform."""
+        self.platform = platform
+        self.settings = platform.get_service_settings()
+        self.loop = loop
+        self.ticks = 0
+        self.busy_ticks = 0
+        self.watchdog_tickles = 0
+        self.flushes = 0
+        self._interval = self.settings.min_interval
+        self._tick_handle = None        # type: asyncio.TimerHandle
+        self._watchdog_handle = None    # type: asyncio.TimerHandle
+        self._flush_handle = None       # type: asyncio.TimerHandle
+
+    def start(self):
+        """Start calling tick and watchdog."""
+        self._tick_handle = self.loop.call_later(self._interval, self._tick)
+        if self.settings.watchdog_interval:
+            self._watchdog_handle = self.loop.call_later(self.settings.watchdog_interval, self._watchdog)
+        if self.settings.flush_interval:
+            self._flush_handle = self.loop.call_later(self.settings.flush_interval, self._flush)
+        if self.settings.readiness_fd is not None:
+            self.loop.add_reader(self.settings.readiness_fd, self._ready)
+
+    def stop(self):
+        """Stop calling tick and watchdog."""
+        if self._tick_handle:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+        if self._watchdog_handle:
+            self._watchdog_handle.cancel()
+            self._watchdog_handle = None
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self.settings.readiness_fd is not None:
+            self.loop.remove_reader(self.settings.readiness_fd)
+
+    def _ready(self):
+        """Service the platform right away because its fd is readable."""
+        self._tick_handle.cancel()
+        self._interval = self.settings.min_interval
+        self._tick()
+
+    def _tick(self):
+        self.ticks += 1
+        if self.platform.tick():
+            self.busy_ticks += 1
+            self._interval = self.settings.min_interval
+        else:
+            self._interval = min(self._interval * 2, self.settings.max_interval)
+        self._tick_handle = self.loop.call_later(self._interval, self._tick)
+
+    def _watchdog(self):
+        self.watchdog_tickles += 1
+        self.platform.tickle_watchdog()
+        self._watchdog_handle = self.loop.call_later(self.settings.watchdog_interval, self._watchdog)
+
+    def _flush(self):
+        self.flushes += 1
+        self.platform.flush()
+        self._flush_handle = self.loop.call_later(self.settings.flush_interval, self._flush)
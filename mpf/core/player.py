@@ -1,9 +1,93 @@
 """Contains the Player class which represents a player in a pinball game."""
 import copy
 import logging
+from collections.abc import MutableMapping
 
 from mpf.core.utility_functions import Util
 
+_UNSET = object()
+
+
+class PlayerVarSlots(MutableMapping):
+
+    """Compact storage for player variables.
+
+    Variables declared in the ``player_vars`` config (plus ``index``,
+    ``number`` and ``score``) are stored in a fixed list of slots. The name to
+    slot mapping is shared between all players. All other variables are
+    stored in a dict.
+
+    This only saves memory. Every access runs Python code and is slower than
+    the default dict storage. Use it (``player_var_storage: slots``) only if
+    the memory of player variables matters.
+    """
+
+    __slots__ = ["_slots", "_values", "_others"]
+
+    def __init__(self, slots):
+        """Initialise storage with a shared name to slot mapping."""
+        self._slots = slots
+        self._values = [_UNSET] * len(slots)
+        self._others = {}
+
+    def __getitem__(self, name):
+        """Return value of variable."""
+        index = self._slots.get(name)
+        if index is None:
+            return self._others[name]
+
+        value = self._values[index]
+        if value is _UNSET:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        """Set value of variable."""
+        index = self._slots.get(name)
+        if index is None:
+            self._others[name] = value
+        else:
+            self._values[index] = value
+
+    def __delitem__(self, name):
+        """Remove variable."""
+        index = self._slots.get(name)
+        if index is None:
+            del self._others[name]
+        elif self._values[index] is _UNSET:
+            raise KeyError(name)
+        else:
+            self._values[index] = _UNSET
+
+    def __contains__(self, name):
+        """Return true if variable exists."""
+        index = self._slots.get(name)
+        if index is None:
+            return name in self._others
+        return self._values[index] is not _UNSET
+
+    def __iter__(self):
+        """Iterate names of all variables."""
+        for name, index in self._slots.items():
+            if self._values[index] is not _UNSET:
+                yield name
+
+        yield from self._others
+
+    def __len__(self):
+        """Return number of variables."""
+        return len(self._values) - self._values.count(_UNSET) + len(self._others)
+
+    def __repr__(self):
+        """Return string representation."""
+        return repr(dict(self.items()))
+
+    @staticmethod
+    def create_layout(machine):
+        """Return a name to slot mapping for the variables declared in the config of machine."""
+        names = ("index", "number", "score") + tuple(machine.config.get('player_vars', {}))
+        return {name: slot for slot, name in enumerate(dict.fromkeys(names))}
+
 
 class Player(object):
 
@@ -74,6 +158,17 @@ class Player(object):
     ``player_score`` with Args: ``value=500, change=500, prev_value=0``
     ``player_score`` with Args: ``value=1200, change=700, prev_value=500``
 
+    If ``player_var_events`` is set to ``coalesce`` in the ``game:`` section
+    of the machine config, all changes to a variable within one turn of the
+    event loop result in a single event with the net change. In the example
+    above, only one event would be posted:
+
+    ``player_score`` with Args: ``value=1200, change=1200, prev_value=0``
+
+    If ``player_var_storage`` is set to ``slots``, variables declared in
+    ``player_vars`` are stored in compact slots (see :class:`PlayerVarSlots`).
+    This trades speed for memory. The default is a dict.
+
     """
 
     monitor_enabled = False
@@ -81,13 +176,21 @@ class Player(object):
     to track player variable changes.
     """
 
-    def __init__(self, machine, index):
-        """Initialise player."""
+    def __init__(self, machine, index, slot_layout=None):
+        """Initialise player.
+
+        Player vars are stored in a dict unless a name to slot mapping of
+        PlayerVarSlots is passed in slot_layout.
+        """
         # use self.__dict__ below since __setattr__ would make these player vars
         self.__dict__['log'] = logging.getLogger("Player")
         self.__dict__['machine'] = machine
-        self.__dict__['vars'] = dict()
+        self.__dict__['vars'] = dict() if slot_layout is None else PlayerVarSlots(slot_layout)
         self.__dict__['_events_enabled'] = False
+        self.__dict__['_coalesce_events'] = machine.config['game']['player_var_events'] == "coalesce"
+        self.__dict__['_pending_events'] = dict()
+        self.__dict__['_flush_scheduled'] = False
+        self.__dict__['_event_handles'] = dict()
 
         number = index + 1
 
@@ -166,11 +269,15 @@ class Player(object):
         :param change: The change in value or True/False
         :param player_num: The player number this variable belongs to
         """
-        self.machine.events.post('player_' + name,
-                                 value=value,
-                                 prev_value=prev_value,
-                                 change=change,
-                                 player_num=player_num)
+        handle = self._event_handles.get(name)
+        if handle is None:
+            handle = self.machine.events.get_event_handle('player_' + name)
+            self._event_handles[name] = handle
+
+        handle.post(value=value,
+                    prev_value=prev_value,
+                    change=change,
+                    player_num=player_num)
         '''event: player_(var_name)
 
         desc: Posted when simpler types of player variables are added or
@@ -263,7 +370,38 @@ class Player(object):
                            name, self.vars[name], prev_value, change)
 
             if self._events_enabled:
-                self._send_variable_event(name, self.vars[name], prev_value, change, self.vars['number'])
+                if self._coalesce_events:
+                    self._queue_variable_event(name, prev_value, new_entry)
+                else:
+                    self._send_variable_event(name, self.vars[name], prev_value, change, self.vars['number'])
+
+    def _queue_variable_event(self, name, prev_value, new_entry):
+        """Remember the value before the first change in this loop turn and schedule the event."""
+        if name not in self._pending_events:
+            self._pending_events[name] = (prev_value, new_entry)
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.machine.clock.loop.call_soon(self._send_pending_variable_events)
+
+    def _send_pending_variable_events(self):
+        """Send one event per changed player variable with the net change."""
+        pending = self._pending_events
+        self._pending_events = dict()
+        self._flush_scheduled = False
+
+        for name, (prev_value, new_entry) in pending.items():
+            value = self.vars.get(name)
+            if not isinstance(value, (int, str, float)):
+                continue
+
+            try:
+                change = value - prev_value
+            except TypeError:
+                change = prev_value != value
+
+            if change or new_entry:
+                self._send_variable_event(name, value, prev_value, change, self.vars['number'])
 
     def __getitem__(self, name):
         """Allow array get access."""
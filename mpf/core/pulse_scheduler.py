@@ -0,0 +1,160 @@
+"""Schedules coil pulses on a power supply within a current budget."""
+import heapq
+
+MYPY = False
+if MYPY:   # pragma: no cover
+    from typing import Any, Callable, List, Optional, Tuple
+    import asyncio
+
+_EPSILON = 0.000001
+
+
+class PulseScheduler(object):
+
+    """Schedules pulses so that the current of overlapping pulses stays within max_amps.
+
+    Every pulse reserves its current from its start until pulse_ms plus
+    release_wait_ms later. A pulse which does not fit is moved to the earliest
+    time at which it fits if that is within max_wait_ms. Otherwise, or when no
+    max_wait_ms is given, it fires immediately and exceeds the budget. Pending
+    pulses are kept in a heap and fired by a single timer on the loop.
+
+    Without max_amps, or for pulses without amps, a pulse uses the whole budget
+    which means that pulses are serialised.
+    """
+
+    __slots__ = ["_loop", "max_amps", "_release_wait", "_reservations", "_pending", "_timer", "_timer_time",
+                 "_sequence", "pulses", "delayed_pulses", "forced_pulses", "max_wait_ms"]
+
+    def __init__(self, loop: "asyncio.AbstractEventLoop", max_amps: "Optional[float]", release_wait_ms: int) -> None:
+        """Initialise scheduler without pulses."""
+        self._loop = loop
+        self.max_amps = max_amps if max_amps else None
+        self._release_wait = release_wait_ms / 1000.0
+        self._reservations = []     # type: List[Tuple[float, float, float]]   # heap of (end, start, amps)
+        self._pending = []          # type: List[Tuple[float, int, Callable, Tuple[Any, ...]]]
+        self._timer = None          # type: Optional[asyncio.TimerHandle]
+        self._timer_time = None     # type: Optional[float]
+        self._sequence = 0
+
+        self.pulses = 0
+        self.delayed_pulses = 0
+        self.forced_pulses = 0
+        self.max_wait_ms = 0.0
+
+    def _get_amps(self, amps: "Optional[float]") -> float:
+        """Return the current a pulse reserves."""
+        if not self.max_amps:
+            return 1.0
+        if amps is None or amps > self.max_amps:
+            return self.max_amps
+        return amps
+
+    def _get_budget(self) -> float:
+        return self.max_amps if self.max_amps else 1.0
+
+    def _remove_expired(self, now: float):
+        """Remove reservations which ended."""
+        while self._reservations and self._reservations[0][0] <= now:
+            heapq.heappop(self._reservations)
+
+    def _get_max_usage(self, start: float, end: float) -> float:
+        """Return the highest current reserved between start and end."""
+        points = [start] + [reservation[1] for reservation in self._reservations if start < reservation[1] < end]
+        max_usage = 0.0
+        for point in points:
+            usage = sum(amps for reservation_end, reservation_start, amps in self._reservations
+                        if reservation_start <= point < reservation_end)
+            if usage > max_usage:
+                max_usage = usage
+        return max_usage
+
+    def get_start_time(self, duration: float, amps: float) -> float:
+        """Return the earliest time at which a pulse fits into the budget."""
+        now = self._loop.time()
+        self._remove_expired(now)
+        budget = self._get_budget() - amps + _EPSILON
+        candidates = [now] + sorted(reservation[0] for reservation in self._reservations)
+        for candidate in candidates:
+            if self._get_max_usage(candidate, candidate + duration) <= budget:
+                return candidate
+
+        return candidates[-1]   # pragma: no cover
+
+    def reserve(self, pulse_ms: int, amps: "Optional[float]", max_wait_ms: "Optional[int]") -> float:
+        """Reserve current for a pulse and return the time in ms the pulse has to wait.
+
+        The caller has to fire the pulse after the returned wait time.
+        """
+        now = self._loop.time()
+        duration = pulse_ms / 1000.0 + self._release_wait
+        amps = self._get_amps(amps)
+        self.pulses += 1
+
+        start = now
+        if max_wait_ms:
+            start = self.get_start_time(duration, amps)
+            if start - now > max_wait_ms / 1000.0:
+                # cannot wait that long. pulse now
+                start = now
+                self.forced_pulses += 1
+        else:
+            self._remove_expired(now)
+
+        heapq.heappush(self._reservations, (start + duration, start, amps))
+
+        wait_ms = (start - now) * 1000
+        if wait_ms > 0:
+            self.delayed_pulses += 1
+            if wait_ms > self.max_wait_ms:
+                self.max_wait_ms = wait_ms
+
+        return wait_ms
+
+    def request_pulse(self, pulse_ms: int, amps: "Optional[float]", max_wait_ms: "Optional[int]",
+                      callback: "Callable", *args) -> float:
+        """Reserve current for a pulse and call callback with args when it should fire.
+
+        If the pulse does not have to wait callback is called before this
+        returns. Returns the time in ms the pulse has to wait.
+        """
+        wait_ms = self.reserve(pulse_ms, amps, max_wait_ms)
+        if wait_ms <= 0:
+            callback(*args)
+            return 0
+
+        fire_time = self._loop.time() + wait_ms / 1000.0
+        self._sequence += 1
+        heapq.heappush(self._pending, (fire_time, self._sequence, callback, args))
+        if self._timer_time is None or fire_time < self._timer_time:
+            self._schedule_timer()
+        return wait_ms
+
+    def _schedule_timer(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+            self._timer_time = None
+
+        if self._pending:
+            self._timer_time = self._pending[0][0]
+            self._timer = self._loop.call_at(self._timer_time, self._fire_due_pulses)
+
+    def _fire_due_pulses(self):
+        self._timer = None
+        self._timer_time = None
+        now = self._loop.time() + _EPSILON
+        while self._pending and self._pending[0][0] <= now:
+            _, _, callback, args = heapq.heappop(self._pending)
+            callback(*args)
+
+        self._schedule_timer()
+
+    def get_pending_count(self) -> int:
+        """Return the number of pulses which wait for current."""
+        return len(self._pending)
+
+    def stop(self):
+        """Drop all pending pulses."""
+        self._pending = []
+        self._schedule_timer()
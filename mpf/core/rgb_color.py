@@ -480,6 +480,10 @@ class RGBColorCorrectionProfile(object):
         for dummy_channel in range(3):
             self._lookup_table.append([i for i in range(256)])
 
+        # brightness factor and the tables for it. see get_brightness_tables
+        self._brightness_factor = None      # type: float
+        self._brightness_tables = None      # type: List[List[float]]
+
     def generate_from_parameters(self, gamma=2.5, whitepoint=(1.0, 1.0, 1.0),
                                  linear_slope=1.0, linear_cutoff=0.0):
         """Generate an RGB color correction profile lookup table based on the parameters supplied.
@@ -517,6 +521,8 @@ class RGBColorCorrectionProfile(object):
                 # Clamp the lookup table value between 0 and 255
                 self._lookup_table[channel][index] = max(0, min(value, 255))
 
+        self._brightness_tables = None
+
     def assign_channel_lookup_table_values(self, channel: int, table_values: List[int]):
         """Assign the specified lookup table values to the profile channel.
 
@@ -540,6 +546,8 @@ class RGBColorCorrectionProfile(object):
 
             self._lookup_table[channel][index] = value
 
+        self._brightness_tables = None
+
     @property
     def name(self) -> str:
         """Return the color correction profile name.
@@ -561,6 +569,19 @@ class RGBColorCorrectionProfile(object):
                          self._lookup_table[1][color.green],
                          self._lookup_table[2][color.blue]))
 
+    def get_brightness_tables(self, brightness: float) -> List[List[float]]:
+        """Return one table per channel which maps 0-255 to the corrected brightness between 0.0 and 1.0.
+
+        The channel value is scaled by brightness first and then passed through
+        the lookup table of this profile. The tables are only rebuilt when
+        brightness changes.
+        """
+        if self._brightness_tables is None or brightness != self._brightness_factor:
+            self._brightness_factor = brightness
+            self._brightness_tables = [[table[min(int(index * brightness), 255)] / 255.0 for index in range(256)]
+                                       for table in self._lookup_table]
+        return self._brightness_tables
+
     @staticmethod
     def default() -> "RGBColorCorrectionProfile":
         """Create a default profile (gamma-corrected).
@@ -5,11 +5,13 @@ states and posting events to the framework.
 """
 
 import logging
-from collections import defaultdict, namedtuple
+from collections import OrderedDict, defaultdict, namedtuple
 import asyncio
 from functools import partial
-from typing import Any, Callable, Dict, List
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
 
+from mpf.core.flight_recorder import KIND_SWITCH
 from mpf.core.machine import MachineController
 from mpf.core.mpf_controller import MpfController
 from mpf.devices.switch import Switch
@@ -28,7 +30,7 @@ class SwitchController(MpfController):
     config_name = "switch_controller"
 
     __slots__ = ["registered_switches", "_timed_switch_handler_delay", "active_timed_switches", "switches",
-                 "monitors", "_initialised"]
+                 "monitors", "_initialised", "_switches_by_number", "bounces_dropped"]
 
     def __init__(self, machine: MachineController) -> None:
         """Initialise switch controller."""
@@ -59,6 +61,12 @@ class SwitchController(MpfController):
         # to detect early switch changes before init
         self._initialised = False
 
+        self._switches_by_number = dict()                       # type: Dict[Tuple[Any, Any], Switch]
+        # Index of switches by (platform, number) for platforms which report
+        # switch changes by number.
+
+        self.bounces_dropped = 0
+
     def register_switch(self, name):
         """Add the name of a switch to the switch controller for tracking.
 
@@ -78,6 +86,7 @@ class SwitchController(MpfController):
         for switch in self.machine.switches:
             # Populate self.switches
             self.set_state(switch.name, switch.state, reset_time=True)
+            self._switches_by_number[(switch.platform, switch.hw_switch.number)] = switch
 
         self._initialised = True
 
@@ -258,11 +267,69 @@ class SwitchController(MpfController):
         if not self._initialised:
             raise AssertionError("Got early switch change for switch {} to state {}. platform: {}".format(
                 num, state, platform))
+        switch = self._get_switch_by_num(num, platform)
+        if switch:
+            self.process_switch_obj(obj=switch, state=state, logical=logical)
+            return
+
+        self._process_unknown_switch(num, state, platform)
+
+    def process_switch_changes(self, changes: List[Tuple[Any, int, bool]], platform):
+        """Process a batch of hardware switch changes from one platform.
+
+        Changes of debounced switches have been filtered by the hardware and
+        every edge is processed. For nondebounced changes only the final state
+        of every switch in the batch is processed. A nondebounced switch which
+        bounced and ended in the state it had before the batch is dropped
+        entirely.
+
+        Args:
+            changes: List of (number, state, debounced) tuples in the order
+                they happened. States are physical states (i.e. logical=False).
+            platform: The platform these switches are on.
+        """
+        if not self._initialised:
+            raise AssertionError("Got early switch changes {}. platform: {}".format(changes, platform))
+
+        # key -> [number, final state, number of changes]. ordered by last change. nondebounced changes of one
+        # switch share a key. debounced changes get one key each
+        final_states = OrderedDict()    # type: Dict[Tuple, List[Any]]
+        for index, (num, state, debounced) in enumerate(changes):
+            if debounced:
+                final_states[(num, index)] = [num, state, 1]
+                continue
+            key = (num,)
+            entry = final_states.get(key)
+            if entry is None:
+                final_states[key] = [num, state, 1]
+            else:
+                entry[1] = state
+                entry[2] += 1
+                final_states.move_to_end(key)
+
+        for num, state, count in final_states.values():
+            switch = self._get_switch_by_num(num, platform)
+            if not switch:
+                self._process_unknown_switch(num, state, platform)
+            elif count > 1 and bool(state) == bool(switch.hw_state):
+                self.bounces_dropped += count
+            else:
+                self.process_switch_obj(switch, state, False)
+
+    def _get_switch_by_num(self, num, platform):
+        """Return switch with number on platform or None."""
+        switch = self._switches_by_number.get((platform, num))
+        if switch:
+            return switch
+
         for switch in self.machine.switches:
             if switch.hw_switch.number == num and switch.platform == platform:
-                self.process_switch_obj(obj=switch, state=state, logical=logical)
-                return
+                self._switches_by_number[(platform, num)] = switch
+                return switch
 
+        return None
+
+    def _process_unknown_switch(self, num, state, platform):
         self.debug_log("Unknown switch %s change to state %s on platform %s", num, state, platform)
         # if the switch is not configured still trigger the monitor
         for monitor in self.monitors:
@@ -376,10 +443,13 @@ class SwitchController(MpfController):
                     "or interference on the line. Switch: %s", obj.name)
             return
 
+        if self.machine.events.flight_recorder:
+            self.machine.events.flight_recorder.record(KIND_SWITCH, obj.name, state)
+
         if state:
-            self.info_log("<<<<<<< '{}' active >>>>>>>".format(obj.name))
+            self.info_log("<<<<<<< '%s' active >>>>>>>", obj.name)
         else:
-            self.info_log("<<<<<<< '{}' inactive >>>>>>>".format(obj.name))
+            self.info_log("<<<<<<< '%s' inactive >>>>>>>", obj.name)
 
         # Update the switch controller's logical state for this switch
         self.set_state(obj.name, state)
@@ -505,7 +575,13 @@ class SwitchController(MpfController):
                 else:
                     # This entry doesn't have a timed delay, so do the action
                     # now
-                    entry.callback()
+                    profiler = self.machine.events.profiler
+                    if profiler:
+                        start = perf_counter()
+                        entry.callback()
+                        profiler.record("switch:" + switch_key, entry.callback, perf_counter() - start)
+                    else:
+                        entry.callback()
 
     def add_monitor(self, monitor: Callable[[MonitoredSwitchChange], None]):
         """Add a monitor callback which is called on switch changes."""
@@ -660,7 +736,14 @@ class SwitchController(MpfController):
                         "Processing timed switch handler. Switch: %s "
                         " State: %s, ms: %s", entry.switch_name,
                         entry.state, entry.ms)
-                    entry.callback()
+                    profiler = self.machine.events.profiler
+                    if profiler:
+                        start = perf_counter()
+                        entry.callback()
+                        profiler.record("switch:{}-{}-{}ms".format(entry.switch_name, entry.state, entry.ms),
+                                        entry.callback, perf_counter() - start)
+                    else:
+                        entry.callback()
                 del self.active_timed_switches[k]
             else:
                 if not next_event_time or next_event_time > k:
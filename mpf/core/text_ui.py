@@ -170,6 +170,12 @@ class TextUi(MpfController):
 
         self.screen.print_at(stats_str, 0, height - 1, colour=6)
 
+        # Loop lag
+        if self.machine.loop_monitor.config['enabled']:
+            lag = self.machine.loop_monitor.lag_histogram
+            lag_str = 'LOOP LAG p99/max: {:.1f}/{:.1f}ms'.format(lag.get_percentile(99) * 1000, lag.max * 1000)
+            self.screen.print_at(lag_str, int((width - len(lag_str)) / 2), height - 2, colour=6)
+
         # MC process stats
         if self._bcp_status != (0, 0, 0):
             bcp_string = 'MC (CPU RSS/VMS) {}% {}/{} MB '.format(
@@ -1,15 +1,21 @@
 """Contains the Driver parent class."""
 import asyncio
-from typing import Optional
+from collections import namedtuple
+from typing import Dict, Optional, Tuple
 
 from mpf.core.delays import DelayManager
 from mpf.core.events import event_handler
+from mpf.core.flight_recorder import KIND_PULSE
 from mpf.core.machine import MachineController
 from mpf.core.platform import DriverPlatform, DriverConfig
 from mpf.core.system_wide_device import SystemWideDevice
 from mpf.exceptions.DriverLimitsError import DriverLimitsError
 from mpf.platforms.interfaces.driver_platform_interface import DriverPlatformInterface, PulseSettings, HoldSettings
 
+# verified settings for one pulse_ms and pulse_power. hold_settings is set if the pulse is longer than the
+# platform can pulse and the driver is enabled and disabled after pulse_ms instead
+PulseProfile = namedtuple("PulseProfile", ["pulse_ms", "pulse_power", "pulse_settings", "hold_settings"])
+
 
 class Driver(SystemWideDevice):
 
@@ -30,7 +36,10 @@ class Driver(SystemWideDevice):
     collection = 'coils'
     class_label = 'coil'
 
-    __slots__ = ["hw_driver", "delay", "platform", "__dict__"]
+    __slots__ = ["hw_driver", "delay", "platform", "_pulse_profiles", "_default_pulse_ms_from_machine",
+                 "__dict__"]
+
+    MAX_PULSE_PROFILES = 32
 
     def __init__(self, machine: MachineController, name: str) -> None:
         """Initialise driver."""
@@ -38,6 +47,8 @@ class Driver(SystemWideDevice):
         super().__init__(machine, name)
         self.delay = DelayManager(self.machine.delayRegistry)
         self.platform = None                # type: DriverPlatform
+        self._pulse_profiles = {}           # type: Dict[Tuple[Optional[int], Optional[float]], PulseProfile]
+        self._default_pulse_ms_from_machine = False
 
     @classmethod
     def device_class_init(cls, machine: MachineController):
@@ -93,6 +104,38 @@ class Driver(SystemWideDevice):
         except AssertionError as e:
             raise AssertionError("Failed to configure driver {} in platform. See error above".format(self.name)) from e
 
+        self._default_pulse_ms_from_machine = self.config['default_pulse_ms'] is None
+        # resolve the default pulse once
+        self._get_pulse_profile(None, None)
+
+    def _get_pulse_profile(self, pulse_ms: Optional[int], pulse_power: Optional[float]) -> PulseProfile:
+        """Return the verified pulse profile for pulse_ms and pulse_power.
+
+        Profiles are created and verified on first use and cached afterwards.
+        """
+        if pulse_ms is None and self._default_pulse_ms_from_machine:
+            # the machine wide default is not part of the driver config
+            pulse_ms = self.machine.config['mpf']['default_pulse_ms']
+
+        profile = self._pulse_profiles.get((pulse_ms, pulse_power))
+        if profile:
+            return profile
+
+        verified_pulse_ms = self.get_and_verify_pulse_ms(pulse_ms)
+        verified_pulse_power = self.get_and_verify_pulse_power(pulse_power)
+        if 0 < verified_pulse_ms <= self.platform.features['max_pulse']:
+            profile = PulseProfile(verified_pulse_ms, verified_pulse_power,
+                                   PulseSettings(power=verified_pulse_power, duration=verified_pulse_ms), None)
+        else:
+            profile = PulseProfile(verified_pulse_ms, verified_pulse_power,
+                                   PulseSettings(power=verified_pulse_power, duration=0),
+                                   HoldSettings(power=verified_pulse_power))
+
+        if len(self._pulse_profiles) >= self.MAX_PULSE_PROFILES:
+            self._pulse_profiles.clear()
+        self._pulse_profiles[(pulse_ms, pulse_power)] = profile
+        return profile
+
     def get_and_verify_pulse_power(self, pulse_power: Optional[float]) -> float:
         """Return the pulse power to use.
 
@@ -207,8 +250,10 @@ class Driver(SystemWideDevice):
         self.hw_driver.enable(PulseSettings(power=pulse_power, duration=pulse_ms),
                               HoldSettings(power=hold_power))
         # inform bcp clients
-        self.machine.bcp.interface.send_driver_event(action="enable", name=self.name, number=self.config['number'],
-                                                     pulse_ms=pulse_ms, pulse_power=pulse_power, hold_power=hold_power)
+        if self.machine.bcp.interface.has_driver_monitors():
+            self.machine.bcp.interface.send_driver_event(action="enable", name=self.name,
+                                                         number=self.config['number'], pulse_ms=pulse_ms,
+                                                         pulse_power=pulse_power, hold_power=hold_power)
 
     @event_handler(1)
     def disable(self, **kwargs):
@@ -218,31 +263,28 @@ class Driver(SystemWideDevice):
         self.machine.delay.remove(name='{}_timed_enable'.format(self.name))
         self.hw_driver.disable()
         # inform bcp clients
-        self.machine.bcp.interface.send_driver_event(action="disable", name=self.name, number=self.config['number'])
-
-    def _get_wait_ms(self, pulse_ms: int, max_wait_ms: Optional[int]) -> int:
-        """Determine if this pulse should be delayed."""
-        if max_wait_ms is None:
-            self.config['psu'].notify_about_instant_pulse(pulse_ms=pulse_ms)
-            return 0
-        else:
-            return self.config['psu'].get_wait_time_for_pulse(pulse_ms=pulse_ms, max_wait_ms=max_wait_ms)
+        if self.machine.bcp.interface.has_driver_monitors():
+            self.machine.bcp.interface.send_driver_event(action="disable", name=self.name,
+                                                         number=self.config['number'])
 
-    def _pulse_now(self, pulse_ms: int, pulse_power: float) -> None:
+    def _pulse_now(self, profile: PulseProfile) -> None:
         """Pulse this driver now."""
-        if 0 < pulse_ms <= self.platform.features['max_pulse']:
-            self.info_log("Pulsing Driver for %sms (%s pulse_power)", pulse_ms, pulse_power)
-            self.hw_driver.pulse(PulseSettings(power=pulse_power, duration=pulse_ms))
+        if self.machine.events.flight_recorder:
+            self.machine.events.flight_recorder.record(KIND_PULSE, self.name, profile.pulse_ms)
+        if not profile.hold_settings:
+            self.info_log("Pulsing Driver for %sms (%s pulse_power)", profile.pulse_ms, profile.pulse_power)
+            self.hw_driver.pulse(profile.pulse_settings)
         else:
-            self.info_log("Enabling Driver for %sms (%s pulse_power)", pulse_ms, pulse_power)
+            self.info_log("Enabling Driver for %sms (%s pulse_power)", profile.pulse_ms, profile.pulse_power)
             self.delay.reset(name='timed_disable',
-                             ms=pulse_ms,
+                             ms=profile.pulse_ms,
                              callback=self.disable)
-            self.hw_driver.enable(PulseSettings(power=pulse_power, duration=0),
-                                  HoldSettings(power=pulse_power))
+            self.hw_driver.enable(profile.pulse_settings, profile.hold_settings)
         # inform bcp clients
-        self.machine.bcp.interface.send_driver_event(action="pulse", name=self.name, number=self.config['number'],
-                                                     pulse_ms=pulse_ms, pulse_power=pulse_power)
+        if self.machine.bcp.interface.has_driver_monitors():
+            self.machine.bcp.interface.send_driver_event(action="pulse", name=self.name,
+                                                         number=self.config['number'], pulse_ms=profile.pulse_ms,
+                                                         pulse_power=profile.pulse_power)
 
     @event_handler(3)
     def pulse(self, pulse_ms: int = None, pulse_power: float = None, max_wait_ms: int = None, **kwargs) -> int:
@@ -253,17 +295,20 @@ class Driver(SystemWideDevice):
                 enabled for. If no value is provided, the driver will be
                 enabled for the value specified in the config dictionary.
             pulse_power: The pulse power. A float between 0.0 and 1.0.
+            max_wait_ms: The pulse may be delayed by up to this many
+                milliseconds if the PSU has no current left. If it is not set
+                the pulse fires immediately.
+
+        Returns the time in ms the pulse is delayed.
         """
         del kwargs
 
-        pulse_ms = self.get_and_verify_pulse_ms(pulse_ms)
-        pulse_power = self.get_and_verify_pulse_power(pulse_power)
-        wait_ms = self._get_wait_ms(pulse_ms, max_wait_ms)
+        profile = self._get_pulse_profile(pulse_ms, pulse_power)
+        wait_ms = self.config['psu'].request_pulse(profile.pulse_ms, self.config['psu_amps'], max_wait_ms,
+                                                   self._pulse_now, profile)
 
         if wait_ms > 0:
-            self.debug_log("Delaying pulse by %sms pulse_ms: %sms (%s pulse_power)", wait_ms, pulse_ms, pulse_power)
-            self.delay.add(wait_ms, self._pulse_now, pulse_ms=pulse_ms, pulse_power=pulse_power)
-        else:
-            self._pulse_now(pulse_ms, pulse_power)
+            self.debug_log("Delaying pulse by %sms pulse_ms: %sms (%s pulse_power)", wait_ms, profile.pulse_ms,
+                           profile.pulse_power)
 
         return wait_ms
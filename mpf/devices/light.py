@@ -11,11 +11,14 @@ from mpf.core.platform import LightsPlatform
 
 from mpf.core.device_monitor import DeviceMonitor
 from mpf.core.machine import MachineController
-from mpf.core.rgb_color import RGBColor, ColorException
+from mpf.core.rgb_color import RGBColor, ColorException, RGBColorCorrectionProfile, rgb_min
 from mpf.core.system_wide_device import SystemWideDevice
 from mpf.platforms.interfaces.light_platform_interface import LightPlatformSoftwareFade
 from mpf.devices.device_mixins import DevicePositionMixin
 
+# used for lights without color correction profile
+LINEAR_COLOR_CORRECTION_PROFILE = RGBColorCorrectionProfile("linear")
+
 
 class DriverLight(LightPlatformSoftwareFade):
 
@@ -302,6 +305,12 @@ class Light(SystemWideDevice, DevicePositionMixin):
                        "priority: %s, key: %s", color, fade_ms, priority,
                        key)
 
+        if self._add_color(color, fade_ms, priority, key, self.machine.clock.get_time()):
+            self._schedule_update()
+
+    # pylint: disable-msg=too-many-arguments
+    def _add_color(self, color, fade_ms, priority, key, start_time) -> bool:
+        """Add color to stack without updating the hardware. Return true if the color changes."""
         if isinstance(color, str) and color == "on":
             color = self.config['default_on_color']
         elif not isinstance(color, RGBColor):
@@ -310,14 +319,11 @@ class Light(SystemWideDevice, DevicePositionMixin):
         if fade_ms is None:
             fade_ms = self.default_fade_ms
 
-        start_time = self.machine.clock.get_time()
-
         color_changes = not self.stack or self.stack[0]['priority'] <= priority or self.stack[0]['dest_color'] is None
 
         self._add_to_stack(color, fade_ms, priority, key, start_time)
 
-        if color_changes:
-            self._schedule_update()
+        return color_changes
 
     def on(self, brightness=None, fade_ms=None, priority=0, key=None, **kwargs):
         """Turn light on.
@@ -401,9 +407,14 @@ class Light(SystemWideDevice, DevicePositionMixin):
         were removed, the light will be updated with whatever's below it. If no
         settings remain after these are removed, the light will turn off.
         """
+        if self._remove_key(key, fade_ms):
+            self._schedule_update()
+
+    def _remove_key(self, key, fade_ms) -> bool:
+        """Remove key from stack without updating the hardware. Return true if the color changes."""
         if not self.stack:
             # no stack
-            return
+            return False
 
         if fade_ms is None:
             fade_ms = self.default_fade_ms
@@ -424,7 +435,7 @@ class Light(SystemWideDevice, DevicePositionMixin):
 
         # key not in stack
         if not stack:
-            return
+            return False
 
         # this is already a fadeout. do not fade out the fade out.
         if stack[0]["dest_color"] is None:
@@ -445,8 +456,7 @@ class Light(SystemWideDevice, DevicePositionMixin):
             self.delay.reset(ms=fade_ms, callback=partial(self._remove_fade_out, key=key), name="remove_fade")
             self.stack.sort(key=itemgetter('priority', 'key'), reverse=True)
 
-        if color_changes:
-            self._schedule_update()
+        return color_changes
 
     def _remove_fade_out(self, key):
         """Remove a timed out fade out."""
@@ -479,13 +489,14 @@ class Light(SystemWideDevice, DevicePositionMixin):
         self.stack[:] = [x for x in self.stack if x['key'] != key]
 
     def _schedule_update(self):
+        self.machine.light_controller.schedule_update(self)
+
+    def update_hw_drivers(self):
+        """Pass the current color to the hw drivers. The platforms still need a light_sync."""
         for color, hw_drivers in self.hw_drivers.items():
             for hw_driver in hw_drivers:
                 hw_driver.set_fade(partial(self._get_brightness_and_fade, color=color))
 
-        for platform in self.platforms:
-            platform.light_sync()
-
     def clear_stack(self):
         """Remove all entries from the stack and resets this light to 'off'."""
         self.stack[:] = []
@@ -530,22 +541,29 @@ class Light(SystemWideDevice, DevicePositionMixin):
         """
         if self._color_correction_profile is None:
             return color
-        else:
 
-            self.debug_log("Applying color correction: %s (applied "
-                           "'%s' color correction profile)",
-                           self._color_correction_profile.apply(color),
-                           self._color_correction_profile.name)
+        corrected_color = self._color_correction_profile.apply(color)
+        self.debug_log("Applying color correction: %s (applied "
+                       "'%s' color correction profile)",
+                       corrected_color, self._color_correction_profile.name)
 
-            return self._color_correction_profile.apply(color)
+        return corrected_color
 
-    # pylint: disable-msg=too-many-return-statements
     def _get_color_and_fade(self, stack, max_fade_ms: int) -> Tuple[RGBColor, int]:
+        rgb, fade_ms = self._get_rgb_and_fade(stack, max_fade_ms)
+        return RGBColor(rgb), fade_ms
+
+    # pylint: disable-msg=too-many-return-statements
+    def _get_rgb_and_fade(self, stack, max_fade_ms: int) -> Tuple[Tuple[int, int, int], int]:
+        """Return the current color as (r, g, b) tuple and the fade time.
+
+        This is called by the hw drivers for every update so it does not create RGBColor objects.
+        """
         try:
             color_settings = stack[0]
         except IndexError:
             # no stack
-            return RGBColor('off'), -1
+            return rgb_min, -1
 
         dest_color = color_settings['dest_color']
 
@@ -553,8 +571,8 @@ class Light(SystemWideDevice, DevicePositionMixin):
         if not color_settings['dest_time']:
             # if we are transparent just return the lower layer
             if dest_color is None:
-                return self._get_color_and_fade(stack[1:], max_fade_ms)
-            return dest_color, -1
+                return self._get_rgb_and_fade(stack[1:], max_fade_ms)
+            return dest_color.rgb, -1
 
         current_time = self.machine.clock.get_time()
 
@@ -562,18 +580,20 @@ class Light(SystemWideDevice, DevicePositionMixin):
         if current_time >= color_settings['dest_time']:
             # if we are transparent just return the lower layer
             if dest_color is None:
-                return self._get_color_and_fade(stack[1:], max_fade_ms)
-            return color_settings['dest_color'], -1
+                return self._get_rgb_and_fade(stack[1:], max_fade_ms)
+            return dest_color.rgb, -1
 
         if dest_color is None:
-            dest_color, lower_fade_ms = self._get_color_and_fade(stack[1:], max_fade_ms)
+            dest_rgb, lower_fade_ms = self._get_rgb_and_fade(stack[1:], max_fade_ms)
             if lower_fade_ms > 0:
                 max_fade_ms = lower_fade_ms
+        else:
+            dest_rgb = dest_color.rgb
 
         target_time = current_time + (max_fade_ms / 1000.0)
         # check if fade will be done before max_fade_ms
         if target_time > color_settings['dest_time']:
-            return dest_color, int((color_settings['dest_time'] - current_time) * 1000)
+            return dest_rgb, int((color_settings['dest_time'] - current_time) * 1000)
 
         # figure out the ratio of how far along we are
         try:
@@ -582,17 +602,27 @@ class Light(SystemWideDevice, DevicePositionMixin):
         except ZeroDivisionError:
             ratio = 1.0
 
-        return RGBColor.blend(color_settings['start_color'], dest_color, ratio), max_fade_ms
+        # same as RGBColor.blend
+        start_rgb = color_settings['start_color'].rgb
+        return (start_rgb[0] + int((dest_rgb[0] - start_rgb[0]) * ratio),
+                start_rgb[1] + int((dest_rgb[1] - start_rgb[1]) * ratio),
+                start_rgb[2] + int((dest_rgb[2] - start_rgb[2]) * ratio)), max_fade_ms
 
     def _get_brightness_and_fade(self, max_fade_ms: int, color: str) -> Tuple[float, int]:
-        uncorrected_color, fade_ms = self._get_color_and_fade(self.stack, max_fade_ms)
-        corrected_color = self.gamma_correct(uncorrected_color)
-        corrected_color = self.color_correct(corrected_color)
-
-        if color in ["red", "blue", "green"]:
-            brightness = getattr(corrected_color, color) / 255.0
+        rgb, fade_ms = self._get_rgb_and_fade(self.stack, max_fade_ms)
+        # brightness and color correction in one lookup per channel
+        profile = self._color_correction_profile or LINEAR_COLOR_CORRECTION_PROFILE
+        factor = self.machine.get_machine_var("brightness")
+        tables = profile.get_brightness_tables(factor if factor else 1.0)
+
+        if color == "red":
+            brightness = tables[0][rgb[0]]
+        elif color == "green":
+            brightness = tables[1][rgb[1]]
+        elif color == "blue":
+            brightness = tables[2][rgb[2]]
         elif color == "white":
-            brightness = min(corrected_color.red, corrected_color.green, corrected_color.blue) / 255.0
+            brightness = min(tables[0][rgb[0]], tables[1][rgb[1]], tables[2][rgb[2]])
         else:
             raise ColorException("Invalid color {}".format(color))
         return brightness, fade_ms
@@ -8,6 +8,7 @@ import math
 from typing import List
 
 from mpf.core.machine import MachineController
+from mpf.core.rgb_color import RGBColor
 
 from mpf.core.system_wide_device import SystemWideDevice
 from mpf.devices.light import Light
@@ -56,17 +57,19 @@ class LightGroup(SystemWideDevice):
 
     def _create_light_at_index(self, index, x, y, relative_index):
         light = Light(self.machine, self.name + "_light_" + str(relative_index))
-        tags = [self.name]
-        tags.extend(self.config['tags'])
-        light_config = copy.deepcopy(self.config['light_template'])
+        # light_template has already been validated as part of our config. copy it instead of validating it again
+        template = self.config['light_template']
+        light_config = dict(template)
         if self.config['number_template']:
             light_config['number'] = self.config['number_template'].format(index)
         else:
-            light_config['number'] = index
-        light_config['tags'].append(self.name)
+            light_config['number'] = str(index)
+        if template['channels']:
+            light_config['channels'] = copy.deepcopy(template['channels'])
+        light_config['tags'] = template['tags'] + [self.name]
         light_config['x'] = x
         light_config['y'] = y
-        light_config = light.validate_and_parse_config(light_config, False)
+        light._configure_device_logging(light_config)    # pylint: disable-msg=protected-access
         light.load_config(light_config)
         self.lights.append(light)
         self.machine.lights[light.name] = light
@@ -75,10 +78,65 @@ class LightGroup(SystemWideDevice):
     def _create_lights(self):
         raise NotImplementedError("Implement")
 
+    def _update_lights(self, lights: List[Light]):
+        """Schedule an update for lights. The light controller syncs every platform once."""
+        for light in lights:
+            self.machine.light_controller.schedule_update(light)
+
     def color(self, color, fade_ms=None, priority=0, key=None):
-        """Call color on all lights in this group."""
-        for light in self.lights:
-            light.color(color, fade_ms, priority, key)
+        """Set color on all lights in this group."""
+        if not isinstance(color, RGBColor) and color != "on":
+            color = RGBColor(color)
+
+        start_time = self.machine.clock.get_time()
+        # pylint: disable-msg=protected-access
+        self._update_lights([light for light in self.lights
+                             if light._add_color(color, fade_ms, priority, key, start_time)])
+
+    def color_list(self, colors: list, fade_ms=None, priority=0, key=None):
+        """Set one color per light. colors is repeated if there are more lights than colors."""
+        if not colors:
+            raise AssertionError("Light group {} needs at least one color.".format(self.name))
+        colors = [color if isinstance(color, RGBColor) or color == "on" else RGBColor(color) for color in colors]
+        count = len(colors)
+        start_time = self.machine.clock.get_time()
+        # pylint: disable-msg=protected-access
+        self._update_lights([light for index, light in enumerate(self.lights)
+                             if light._add_color(colors[index % count], fade_ms, priority, key, start_time)])
+
+    def remove_from_stack_by_key(self, key, fade_ms=None):
+        """Remove key from the stack of all lights in this group."""
+        # pylint: disable-msg=protected-access
+        self._update_lights([light for light in self.lights if light._remove_key(key, fade_ms)])
+
+    @staticmethod
+    def get_gradient(start_color, end_color, count: int) -> List[RGBColor]:
+        """Return count colors which blend from start_color to end_color."""
+        start_color = RGBColor(start_color)
+        end_color = RGBColor(end_color)
+        if count < 2:
+            return [start_color] * count
+        return [RGBColor.blend(start_color, end_color, index / (count - 1)) for index in range(count)]
+
+    @staticmethod
+    def get_chase(colors: list, offset: int, count: int) -> list:
+        """Return colors repeated to count entries and moved forward by offset."""
+        if not colors:
+            raise AssertionError("Chase needs at least one color.")
+        length = len(colors)
+        return [colors[(index - offset) % length] for index in range(count)]
+
+    def gradient(self, start_color, end_color, fade_ms=None, priority=0, key=None):
+        """Blend the lights in this group from start_color to end_color."""
+        self.color_list(self.get_gradient(start_color, end_color, len(self.lights)), fade_ms, priority, key)
+
+    # pylint: disable-msg=too-many-arguments
+    def chase(self, colors: list, offset: int, fade_ms=None, priority=0, key=None):
+        """Repeat colors along the group moved forward by offset lights.
+
+        Call this with an increasing offset to let the pattern run along the group.
+        """
+        self.color_list(self.get_chase(colors, offset, len(self.lights)), fade_ms, priority, key)
 
 
 class LightStrip(LightGroup):
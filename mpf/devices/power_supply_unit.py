@@ -1,10 +1,17 @@
 """A Power Supply Unit (PSU) in a pinball machine."""
+import asyncio
+
+from mpf.core.pulse_scheduler import PulseScheduler
 from mpf.core.system_wide_device import SystemWideDevice
 
 
 class PowerSupplyUnit(SystemWideDevice):
 
-    """Represents a power supply in a pinball machine."""
+    """Represents a power supply in a pinball machine.
+
+    Pulses on this PSU are scheduled by a PulseScheduler which keeps the
+    current of overlapping pulses within max_amps.
+    """
 
     config_section = 'psus'
     collection = 'psus'
@@ -13,37 +20,38 @@ class PowerSupplyUnit(SystemWideDevice):
     def __init__(self, machine, name):
         """Initialise PSU."""
         super().__init__(machine, name)
-        self._busy_until = None
-
-    def get_wait_time_for_pulse(self, pulse_ms, max_wait_ms) -> int:
-        """Return a wait time for a pulse or 0."""
-        current_time = self.machine.clock.get_time()
-
-        if self._busy_until and self._busy_until < current_time:
-            # prevent negative times
-            self._busy_until = None
-
-        if not self._busy_until or not max_wait_ms:
-            # if we are not busy. do pulse now
-            self.notify_about_instant_pulse(pulse_ms)
-            return 0
-
-        if self._busy_until > current_time + (max_wait_ms / 1000.0) or max_wait_ms is None:
-            # if we are busy for longer than possible. do pulse now
-            self.notify_about_instant_pulse(pulse_ms)
-            return 0
-        else:
-
-            # calculate wait time and return it
-            wait_ms = (self._busy_until - current_time) * 1000
-            self._busy_until += (pulse_ms + self.config['release_wait_ms']) / 1000.0
-            return wait_ms
+        self.scheduler = None   # type: PulseScheduler
+
+    @asyncio.coroutine
+    def _initialize(self):
+        yield from super()._initialize()
+        self.scheduler = PulseScheduler(self.machine.clock.loop, self.config['max_amps'],
+                                        self.config['release_wait_ms'])
+        self.machine.events.add_handler("debug_dump_stats", self._debug_dump_stats)
+        self.machine.events.add_handler("shutdown", self._stop)
+
+    def _debug_dump_stats(self, **kwargs):
+        del kwargs
+        self.info_log("Pulses: %s. Delayed: %s. Forced: %s. Max wait: %sms. Pending: %s", self.scheduler.pulses,
+                      self.scheduler.delayed_pulses, self.scheduler.forced_pulses,
+                      round(self.scheduler.max_wait_ms, 3), self.scheduler.get_pending_count())
+
+    def _stop(self, **kwargs):
+        del kwargs
+        self.scheduler.stop()
+
+    def request_pulse(self, pulse_ms, amps, max_wait_ms, callback, *args) -> float:
+        """Schedule a pulse and return its wait time in ms.
+
+        callback is called with args when the pulse should fire. That happens
+        before this returns if the pulse does not have to wait.
+        """
+        return self.scheduler.request_pulse(pulse_ms, amps, max_wait_ms, callback, *args)
+
+    def get_wait_time_for_pulse(self, pulse_ms, max_wait_ms) -> float:
+        """Return a wait time for a pulse or 0. The caller has to fire the pulse."""
+        return self.scheduler.reserve(pulse_ms, None, max_wait_ms)
 
     def notify_about_instant_pulse(self, pulse_ms):
         """Notify PSU about pulse."""
-        if self._busy_until:
-            self._busy_until = max(
-                self._busy_until,
-                self.machine.clock.get_time() + (pulse_ms + self.config['release_wait_ms']) / 1000.0)
-        else:
-            self._busy_until = self.machine.clock.get_time() + ((pulse_ms + self.config['release_wait_ms']) / 1000.0)
+        self.scheduler.reserve(pulse_ms, None, None)
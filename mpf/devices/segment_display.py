@@ -1,7 +1,7 @@
 """Physical segment displays."""
 import asyncio
-from collections import namedtuple
-from operator import attrgetter
+from bisect import bisect_right
+from collections import namedtuple, OrderedDict
 from typing import List
 
 from mpf.core.device_monitor import DeviceMonitor
@@ -14,6 +14,8 @@ if MYPY:   # pragma: no cover
 
 TextStack = namedtuple("TextStack", ["text", "priority", "key"])
 
+MAX_CACHED_TEMPLATES = 32
+
 
 @DeviceMonitor("text")
 class SegmentDisplay(SystemWideDevice):
@@ -30,7 +32,10 @@ class SegmentDisplay(SystemWideDevice):
         self.hw_display = None              # type: SegmentDisplayPlatformInterface
         self.platform = None
         self._text_stack = []               # type: List[TextStack]
+        self._stack_priorities = []         # type: List[int]   # negated priorities of _text_stack for bisect
+        self._templates = OrderedDict()     # type: OrderedDict[str, TextTemplate]
         self._current_placeholder = None    # type: TextTemplate
+        self._current_future = None         # type: asyncio.Future
         self.text = ""                      # type: str
         self.flashing = False               # type: bool
 
@@ -49,50 +54,84 @@ class SegmentDisplay(SystemWideDevice):
         This will replace texts with the same key.
         """
         # remove old text in case it has the same key
-        self._text_stack[:] = [x for x in self._text_stack if x.key != key]
-        # add new text
-        self._text_stack.append(TextStack(text, priority, key))
+        self._remove_from_stack(key)
+        # add new text behind all texts with the same priority
+        index = bisect_right(self._stack_priorities, -priority)
+        self._text_stack.insert(index, TextStack(text, priority, key))
+        self._stack_priorities.insert(index, -priority)
         self._update_stack()
 
     def set_flashing(self, flashing: bool):
         """Enable/Disable flashing."""
         self.flashing = flashing
-        # invalidate text to force an update
-        self.text = None
-        self._update_display()
+        self.hw_display.set_text(self.text, flashing=self.flashing)
 
     def remove_text_by_key(self, key: str):
         """Remove entry from text stack."""
-        self._text_stack[:] = [x for x in self._text_stack if x.key != key]
+        self._remove_from_stack(key)
         self._update_stack()
 
+    def _remove_from_stack(self, key: str) -> None:
+        """Remove all entries with key from the stack."""
+        for index in range(len(self._text_stack) - 1, -1, -1):
+            if self._text_stack[index].key == key:
+                del self._text_stack[index]
+                del self._stack_priorities[index]
+
+    def _get_template(self, text: str) -> TextTemplate:
+        """Return a cached template for text."""
+        template = self._templates.get(text)
+        if template is None:
+            template = TextTemplate(self.machine, text)
+            if len(self._templates) >= MAX_CACHED_TEMPLATES:
+                self._templates.popitem(last=False)
+            self._templates[text] = template
+        else:
+            self._templates.move_to_end(text)
+        return template
+
+    def _unsubscribe(self) -> None:
+        """Stop watching the variables of the current text."""
+        if self._current_future:
+            self._current_future.cancel()
+            self._current_future = None
+
     def _update_stack(self) -> None:
-        """Sort stack and show top entry on display."""
+        """Show top entry of the stack on display."""
         # do nothing if stack is emtpy. set display empty
         if not self._text_stack:
             self.hw_display.set_text("", flashing=False)
+            self._unsubscribe()
             if self._current_placeholder:
                 self.text = ""
                 self._current_placeholder = None
             return
 
-        # sort stack by priority
-        self._text_stack.sort(key=attrgetter("priority"), reverse=True)
         # get top entry
         top_entry = self._text_stack[0]
+        if self._current_placeholder and self._current_placeholder.text == top_entry.text:
+            # already shown and subscribed to its variables
+            return
+
+        self._unsubscribe()
+        self._current_placeholder = self._get_template(top_entry.text)
+        self._update_display()
 
-        self._current_placeholder = TextTemplate(self.machine, top_entry.text)
+    def _placeholder_changed(self, future: asyncio.Future) -> None:
+        """Re-evaluate the current text when one of its variables changed."""
+        if future is not self._current_future:
+            # outdated or cancelled subscription
+            return
+        self._current_future = None
         self._update_display()
 
-    def _update_display(self, *args, **kwargs) -> None:
+    def _update_display(self) -> None:
         """Update display to current text."""
-        del args
-        del kwargs
         if not self._current_placeholder:
             new_text = ""
         else:
-            new_text, future = self._current_placeholder.evaluate_and_subscribe({})
-            future.add_done_callback(self._update_display)
+            new_text, self._current_future = self._current_placeholder.evaluate_and_subscribe({})
+            self._current_future.add_done_callback(self._placeholder_changed)
 
         # set text to display if it changed
         if new_text != self.text:
@@ -31,6 +31,8 @@ class SequenceShot(SystemWideDevice, ModeDevice):
 
         self._sequence_events = []      # type: List[str]
         self._delay_events = {}         # type: Dict[str, int]
+        self._hit_event = self.machine.events.get_event_handle(self.name + "_hit")
+        self._timeout_event = self.machine.events.get_event_handle(self.name + "_timeout")
 
     @property
     def can_exist_outside_of_game(self):
@@ -170,7 +172,7 @@ class SequenceShot(SystemWideDevice, ModeDevice):
 
     def _completed(self):
         """Post sequence complete event."""
-        self.machine.events.post("{}_hit".format(self.name))
+        self._hit_event.post()
         '''event: (sequence_shot)__hit
         desc: The sequence_shot called (sequence_shot) was just completed.
         '''
@@ -207,4 +209,4 @@ class SequenceShot(SystemWideDevice, ModeDevice):
         self.active_sequences = [x for x in self.active_sequences
                                  if x[0] != seq_id]
 
-        self.machine.events.post("{}_timeout".format(self.name))
+        self._timeout_event.post()
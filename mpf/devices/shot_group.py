@@ -32,6 +32,18 @@ class ShotGroup(ModeDevice):
         self.profile = None
         self.rotation_pattern = None
 
+        self._complete_event = self.machine.events.get_event_handle(self.name + "_complete")
+        self._hit_event = self.machine.events.get_event_handle(self.name + "_hit")
+        self._state_events = {}
+
+    def _get_state_event(self, state, suffix):
+        """Return the event handle for (shot_group)_(state)_(suffix)."""
+        handle = self._state_events.get((state, suffix))
+        if handle is None:
+            handle = self.machine.events.get_event_handle("{}_{}_{}".format(self.name, state, suffix))
+            self._state_events[(state, suffix)] = handle
+        return handle
+
     def add_control_events_in_mode(self, mode) -> None:
         """Remove enable here."""
         pass
@@ -64,7 +76,7 @@ class ShotGroup(ModeDevice):
         self.debug_log(
             "Shot group is complete with state: %s", state)
 
-        self.machine.events.post('{}_complete'.format(self.name), state=state)
+        self._complete_event.post(state=state)
         '''event: (shot_group)_complete
         desc: All the member shots in the shot group called (shot_group)
         are in the same state.
@@ -73,7 +85,7 @@ class ShotGroup(ModeDevice):
           state: name of the common state of all shots.
         '''
 
-        self.machine.events.post('{}_{}_complete'.format(self.name, state))
+        self._get_state_event(state, "complete").post()
         '''event: (shot_group)_(state)_complete
         desc: All the member shots in the shot group called (shot_group)
         are in the same state named (state).
@@ -119,12 +131,12 @@ class ShotGroup(ModeDevice):
         if advancing:
             self._check_for_complete()
 
-        self.machine.events.post(self.name + '_hit')
+        self._hit_event.post()
         '''event: (shot_group)_hit
         desc: A member shots in the shot group called (shot_group)
         has been hit.
         '''
-        self.machine.events.post("{}_{}_hit".format(self.name, kwargs['state']))
+        self._get_state_event(kwargs['state'], "hit").post()
         '''event: (shot_group)_(state)_hit
         desc: A member shot with state (state) in the shot group (shot_group)
         has been hit.
@@ -9,7 +9,7 @@ import asyncio
 
 from mpf.core.events import QueuedEvent
 from mpf.core.async_mode import AsyncMode
-from mpf.core.player import Player
+from mpf.core.player import Player, PlayerVarSlots
 
 
 # pylint: disable-msg=too-many-instance-attributes
@@ -23,7 +23,7 @@ class Game(AsyncMode):
 
     __slots__ = ["_balls_in_play", "player_list", "slam_tilted", "tilted", "ending", "player", "num_players",
                  "_stopping_modes", "_stopping_queue", "_end_ball_event", "_at_least_one_player_event",
-                 "balls_per_game", "max_players"]
+                 "balls_per_game", "max_players", "_player_var_slot_layout"]
 
     def __init__(self, machine, config, name, path):
         """Initialise game."""
@@ -42,6 +42,7 @@ class Game(AsyncMode):
         self._at_least_one_player_event = None  # type: asyncio.Event
         self.balls_per_game = None
         self.max_players = None
+        self._player_var_slot_layout = None
 
         self.machine.events.add_handler('mode_{}_stopping'.format(self.name), self._stop_game_modes)
 
@@ -541,8 +542,10 @@ class Game(AsyncMode):
         number: The new player number that will be added
         '''
 
-        # Actually create the new player object
-        player = Player(self.machine, len(self.player_list))
+        # Actually create the new player object. all players of this machine share the slot layout
+        if self._player_var_slot_layout is None and self.machine.config['game']['player_var_storage'] == "slots":
+            self._player_var_slot_layout = PlayerVarSlots.create_layout(self.machine)
+        player = Player(self.machine, len(self.player_list), self._player_var_slot_layout)
 
         self.player_list.append(player)
         self.num_players = len(self.player_list)
@@ -134,6 +134,77 @@ class LisySound(HardwareSoundPlatformInterface):
         self.platform.send_byte(LisyDefines.SoundStopAllSounds)
 
 
+class LisySwitchPoller:
+
+    """Polls changed switches from LISY with multiple requests in flight.
+
+    LISY answers every SwitchesGetChangedSwitches request with one byte which
+    is either 127 (no change) or a switch number with the state in bit 7.
+    While switches change ``depth`` requests are kept in flight and all
+    replies which are in the buffer are parsed at once. When LISY is idle
+    only a single request is sent and the pause between polls doubles up to
+    ``max_backoff`` seconds.
+    """
+
+    # pylint: disable-msg=too-many-arguments
+    def __init__(self, reader: asyncio.StreamReader, send, callback, loop,
+                 depth: int, max_backoff: float, min_backoff: float = None) -> None:
+        """Initialise poller.
+
+        send is called with the bytes of the requests. callback is called with switch number and state.
+        """
+        self._reader = reader
+        self._send = send
+        self._callback = callback
+        self._loop = loop
+        self._depth = depth
+        self._max_backoff = max_backoff
+        self._min_backoff = max_backoff / 16 if min_backoff is None else min_backoff
+        self.polls = 0
+        self.changes = 0
+
+    def _send_polls(self, count):
+        self.polls += count
+        self._send(bytes([LisyDefines.SwitchesGetChangedSwitches]) * count)
+
+    @asyncio.coroutine
+    def run(self):
+        """Poll until cancelled."""
+        in_flight = 0
+        backoff = 0.0
+        while True:
+            if not in_flight:
+                if backoff:
+                    yield from asyncio.sleep(backoff, loop=self._loop)
+                    # probe with a single request while idle
+                    in_flight = 1
+                else:
+                    in_flight = self._depth
+                self._send_polls(in_flight)
+
+            data = yield from self._reader.read(in_flight)
+            if not data:
+                raise AssertionError("LISY closed the connection.")
+            in_flight -= len(data)
+
+            changed = False
+            for status in data:
+                if status == 127:
+                    continue
+                changed = True
+                self.changes += 1
+                # bit 7 is state. bits 0-6 are the switch number
+                self._callback(status & 0b01111111, 1 if status & 0b10000000 else 0)
+
+            if changed:
+                # more changes are likely. fill up the pipeline
+                backoff = 0.0
+                self._send_polls(self._depth - in_flight)
+                in_flight = self._depth
+            elif not in_flight:
+                backoff = min(backoff * 2, self._max_backoff) if backoff else self._min_backoff
+
+
 class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform,
                            SegmentDisplaySoftwareFlashPlatform,
                            HardwareSoundPlatform, LogMixin):
@@ -147,12 +218,15 @@ class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform,
         self._writer = None                 # type: asyncio.StreamWriter
         self._reader = None                 # type: asyncio.StreamReader
         self._poll_task = None
+        self._poller = None                 # type: LisySwitchPoller
         self._watchdog_task = None
         self._number_of_lamps = None
         self._number_of_solenoids = None
         self._number_of_displays = None
         self._inputs = dict()               # type: Dict[str, bool]
         self._system_type = None
+        self._send_buffer = bytearray()
+        self.writes = 0
         self.features['max_pulse'] = 255
 
     @asyncio.coroutine
@@ -266,6 +340,7 @@ class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform,
             self._watchdog_task = None
 
         if self._reader:
+            self._flush()
             self._writer.close()
             self._reader = None
             self._writer = None
@@ -279,23 +354,16 @@ class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform,
 
     @asyncio.coroutine
     def _poll(self):
-        while True:
-            self.send_byte(LisyDefines.SwitchesGetChangedSwitches)
-            status = yield from self.read_byte()
-            if status == 127:
-                # no changes. sleep 1ms
-                yield from asyncio.sleep(.001, loop=self.machine.clock.loop)
-            else:
-                # bit 7 is state
-                switch_state = 1 if status & 0b10000000 else 0
-                # bits 0-6 are the switch number
-                switch_num = status & 0b01111111
-
-                # tell the switch controller about the new state
-                self.machine.switch_controller.process_switch_by_num(str(switch_num), switch_state, self)
-
-                # store in dict as well
-                self._inputs[str(switch_num)] = bool(switch_state)
+        self._poller = LisySwitchPoller(self._reader, self._send, self._switch_changed, self.machine.clock.loop,
+                                        self.config['poll_pipeline_depth'], 1 / self.config['poll_hz'])
+        yield from self._poller.run()
+
+    def _switch_changed(self, switch_num: int, switch_state: int):
+        # tell the switch controller about the new state
+        self.machine.switch_controller.process_switch_by_num(str(switch_num), switch_state, self)
+
+        # store in dict as well
+        self._inputs[str(switch_num)] = bool(switch_state)
 
     @asyncio.coroutine
     def _watchdog(self):
@@ -395,29 +463,39 @@ class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform,
     def send_byte(self, cmd: int, byte: bytes = None):
         """Send a command with optional payload."""
         if byte is not None:
-            cmd_str = bytes([cmd])
-            cmd_str += byte
             self.log.debug("Sending %s %s", cmd, byte)
-            self._writer.write(cmd_str)
+            self._send(bytes([cmd]) + byte)
         else:
             self.log.debug("Sending %s", cmd)
-            self._writer.write(bytes([cmd]))
+            self._send(bytes([cmd]))
 
     def send_string(self, cmd: int, string: str):
         """Send a command with null terminated string."""
         self.log.debug("Sending %s %s", cmd, string)
-        self._writer.write(bytes([cmd]) + string.encode() + bytes([0]))
+        self._send(bytes([cmd]) + string.encode() + bytes([0]))
+
+    def _send(self, data: bytes):
+        """Queue data. All commands sent in one loop iteration are written at once."""
+        if not self._send_buffer:
+            self.machine.clock.loop.call_soon(self._flush)
+        self._send_buffer.extend(data)
+
+    def _flush(self):
+        """Write all queued commands."""
+        if not self._send_buffer or not self._writer:
+            return
+        self._writer.write(bytes(self._send_buffer))
+        self._send_buffer.clear()
+        self.writes += 1
 
     @asyncio.coroutine
     def read_byte(self) -> Generator[int, None, int]:
         """Read one byte."""
-        self.log.debug("Reading one byte")
         data = yield from self._reader.readexactly(1)
-        self.log.debug("Received %s", ord(data))
-        return ord(data)
+        self.log.debug("Received %s", data[0])
+        return data[0]
 
     @asyncio.coroutine
-    # pylint: disable-msg=inconsistent-return-statements
     def readuntil(self, separator, min_chars: int = 0):
         """Read until separator.
 
@@ -425,13 +503,24 @@ class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform,
             separator: Read until this separator byte.
             min_chars: Minimum message length before separator
         """
-        # asyncio StreamReader only supports this from python 3.5.2 on
-        buffer = b''
+        if not hasattr(self._reader, "readuntil"):
+            # asyncio StreamReader only supports readuntil from python 3.5.2 on
+            return (yield from self._readuntil_bytewise(separator, min_chars))
+
+        buffer = yield from self._reader.readuntil(separator)
+        while len(buffer) <= min_chars:
+            buffer += yield from self._reader.readuntil(separator)
+        return buffer
+
+    @asyncio.coroutine
+    # pylint: disable-msg=inconsistent-return-statements
+    def _readuntil_bytewise(self, separator, min_chars: int):
+        buffer = bytearray()
         while True:
             char = yield from self._reader.readexactly(1)
             buffer += char
             if char == separator and len(buffer) > min_chars:
-                return buffer
+                return bytes(buffer)
 
     @asyncio.coroutine
     def read_string(self) -> Generator[int, None, bytes]:
@@ -54,6 +54,14 @@ class P3RocHardwarePlatform(PROCBasePlatform, I2cPlatform, AccelerometerPlatform
         if self.machine_type != self.pinproc.MachineTypePDB:
             raise AssertionError("P3-Roc can only handle PDB driver boards")
 
+        self._event_handlers.update({
+            self.pinproc.EventTypeAccelerometerX: self._handle_accelerometer_x,
+            self.pinproc.EventTypeAccelerometerY: self._handle_accelerometer_y,
+            self.pinproc.EventTypeAccelerometerZ: self._handle_accelerometer_z,
+            self.pinproc.EventTypeBurstSwitchOpen: self._handle_burst_open,
+            self.pinproc.EventTypeBurstSwitchClosed: self._handle_burst_closed,
+        })
+
         self.connect()
 
         # Because PDBs can be configured in many different ways, we need to
@@ -371,71 +379,55 @@ class P3RocHardwarePlatform(PROCBasePlatform, I2cPlatform, AccelerometerPlatform
     def tick(self):
         """Check the P3-ROC for any events (switch state changes).
 
-        Also tickles the watchdog and flushes any queued commands to the P3-ROC.
+        Also flushes commands queued by switch handlers. Other commands are
+        flushed by flush(). Returns true if there were events.
         """
         # Get P3-ROC events
-        for event in self.proc.get_events():
-            event_type = event['type']
-            event_value = event['value']
-            if event_type == self.pinproc.EventTypeSwitchClosedDebounced:
-                self.machine.switch_controller.process_switch_by_num(state=1,
-                                                                     num=event_value,
-                                                                     platform=self)
-            elif event_type == self.pinproc.EventTypeSwitchOpenDebounced:
-                self.machine.switch_controller.process_switch_by_num(state=0,
-                                                                     num=event_value,
-                                                                     platform=self)
-            elif event_type == self.pinproc.EventTypeSwitchClosedNondebounced:
-                self.machine.switch_controller.process_switch_by_num(state=1,
-                                                                     num=event_value,
-                                                                     platform=self)
-            elif event_type == self.pinproc.EventTypeSwitchOpenNondebounced:
-                self.machine.switch_controller.process_switch_by_num(state=0,
-                                                                     num=event_value,
-                                                                     platform=self)
-
-            # The P3-ROC will always send all three values sequentially.
-            # Therefore, we will trigger after the Z value
-            elif event_type == self.pinproc.EventTypeAccelerometerX:
-                self.acceleration[0] = event_value
-                self.debug_log("Got Accelerometer value X. Value: %s", event_value)
-            elif event_type == self.pinproc.EventTypeAccelerometerY:
-                self.acceleration[1] = event_value
-                self.debug_log("Got Accelerometer value Y. Value: %s", event_value)
-            elif event_type == self.pinproc.EventTypeAccelerometerZ:
-                self.acceleration[2] = event_value
-
-                # trigger here
-                if self.accelerometer_device:
-                    self.accelerometer_device.update_acceleration(
-                        self.scale_accelerometer_to_g(self.acceleration[0]),
-                        self.scale_accelerometer_to_g(self.acceleration[1]),
-                        self.scale_accelerometer_to_g(self.acceleration[2]))
-                    self.debug_log("Got Accelerometer value Z. Value: %s", event_value)
-            elif event_type == self.pinproc.EventTypeBurstSwitchOpen:
-                self.debug_log("Got burst open event value %s", event_value)
-                self._handle_burst(event_value, 0)
-            elif event_type == self.pinproc.EventTypeBurstSwitchClosed:
-                self.debug_log("Got burst closed event value %s", event_value)
-                self._handle_burst(event_value, 1)
-            else:   # pragma: no cover
-                self.log.warning("Received unrecognized event from the P3-ROC. "
-                                 "Type: %s, Value: %s", event_type, event_value)
-
-        self.proc.watchdog_tickle()
-        self.proc.flush()
+        events = self.proc.get_events()
+        if not events:
+            return False
 
-    def _handle_burst(self, event_value, state):
+        self._process_events(events)
+        self.proc.flush()
+        return True
+
+    def _handle_accelerometer_x(self, event_value, switch_changes):
+        del switch_changes
+        self.acceleration[0] = event_value
+        self.debug_log("Got Accelerometer value X. Value: %s", event_value)
+
+    def _handle_accelerometer_y(self, event_value, switch_changes):
+        del switch_changes
+        self.acceleration[1] = event_value
+        self.debug_log("Got Accelerometer value Y. Value: %s", event_value)
+
+    def _handle_accelerometer_z(self, event_value, switch_changes):
+        del switch_changes
+        # The P3-ROC will always send all three values sequentially.
+        # Therefore, we will trigger after the Z value
+        self.acceleration[2] = event_value
+
+        if self.accelerometer_device:
+            self.accelerometer_device.update_acceleration(
+                self.scale_accelerometer_to_g(self.acceleration[0]),
+                self.scale_accelerometer_to_g(self.acceleration[1]),
+                self.scale_accelerometer_to_g(self.acceleration[2]))
+            self.debug_log("Got Accelerometer value Z. Value: %s", event_value)
+
+    def _handle_burst_open(self, event_value, switch_changes):
+        self.debug_log("Got burst open event value %s", event_value)
+        self._handle_burst(event_value, 0, switch_changes)
+
+    def _handle_burst_closed(self, event_value, switch_changes):
+        self.debug_log("Got burst closed event value %s", event_value)
+        self._handle_burst(event_value, 1, switch_changes)
+
+    @staticmethod
+    def _handle_burst(event_value, state, switch_changes):
         input_num = event_value & 0x3F
         output_num = (event_value >> 6) & 0x1F
-        burst_number1 = "burst-{}-{}".format(input_num, output_num)
-        self.machine.switch_controller.process_switch_by_num(state=state,
-                                                             num=burst_number1,
-                                                             platform=self)
-        burst_number2 = "burst-{}-{}".format(input_num, output_num + 32)
-        self.machine.switch_controller.process_switch_by_num(state=state,
-                                                             num=burst_number2,
-                                                             platform=self)
+        switch_changes.append(("burst-{}-{}".format(input_num, output_num), state, False))
+        switch_changes.append(("burst-{}-{}".format(input_num, output_num + 32), state, False))
 
 
 class P3RocI2c(I2cPlatformInterface):
@@ -46,6 +46,7 @@ class PRocHardwarePlatform(PROCBasePlatform, DmdPlatform, SegmentDisplayPlatform
 
         self.dmd = None
         self.alpha_display = None
+        self._event_handlers[self.pinproc.EventTypeDMDFrameDisplayed] = self._dmd_frame_displayed
 
         self.connect()
 
@@ -182,35 +183,26 @@ class PRocHardwarePlatform(PROCBasePlatform, DmdPlatform, SegmentDisplayPlatform
 
         return PRocAlphanumericDisplay(self.alpha_display, number_int)
 
+    @staticmethod
+    def _dmd_frame_displayed(event_value, switch_changes):
+        """Ignore DMD frame displayed events."""
+        del event_value
+        del switch_changes
+
     def tick(self):
         """Check the P-ROC for any events (switch state changes or notification that a DMD frame was updated).
 
-        Also tickles the watchdog and flushes any queued commands to the P-ROC.
+        Also flushes commands queued by switch handlers. Other commands are
+        flushed by flush(). Returns true if there were events.
         """
         # Get P-ROC events (switches & DMD frames displayed)
-        for event in self.proc.get_events():
-            event_type = event['type']
-            event_value = event['value']
-            if event_type == self.pinproc.EventTypeDMDFrameDisplayed:
-                pass
-            elif event_type == self.pinproc.EventTypeSwitchClosedDebounced:
-                self.machine.switch_controller.process_switch_by_num(
-                    state=1, num=event_value, platform=self)
-            elif event_type == self.pinproc.EventTypeSwitchOpenDebounced:
-                self.machine.switch_controller.process_switch_by_num(
-                    state=0, num=event_value, platform=self)
-            elif event_type == self.pinproc.EventTypeSwitchClosedNondebounced:
-                self.machine.switch_controller.process_switch_by_num(
-                    state=1, num=event_value, platform=self)
-            elif event_type == self.pinproc.EventTypeSwitchOpenNondebounced:
-                self.machine.switch_controller.process_switch_by_num(
-                    state=0, num=event_value, platform=self)
-            else:
-                self.log.warning("Received unrecognized event from the P-ROC. "
-                                 "Type: %s, Value: %s", event_type, event_value)
+        events = self.proc.get_events()
+        if not events:
+            return False
 
-        self.proc.watchdog_tickle()
+        self._process_events(events)
         self.proc.flush()
+        return True
 
 
 class PROCDMD(DmdPlatformInterface):
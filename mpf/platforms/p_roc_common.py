@@ -5,12 +5,12 @@ import logging
 import platform
 import sys
 import time
-from typing import Any, List, Union, Callable, Tuple
+from typing import Any, Dict, List, Union, Callable, Tuple
 
 from mpf.platforms.p_roc_devices import PROCSwitch, PROCMatrixLight
 from mpf.platforms.interfaces.light_platform_interface import LightPlatformInterface
 from mpf.core.platform import SwitchPlatform, DriverPlatform, LightsPlatform, SwitchSettings, DriverSettings, \
-    SwitchConfig
+    SwitchConfig, ServiceSettings
 
 # pylint: disable-msg=ungrouped-imports
 try:    # pragma: no cover
@@ -88,6 +88,17 @@ class PROCBasePlatform(LightsPlatform, SwitchPlatform, DriverPlatform, metaclass
         self.machine_type = pinproc.normalize_machine_type(
             self.machine.config['hardware']['driverboards'])
 
+        # dispatch tables for get_events(). switch events map to their state
+        # and whether they are debounced. all other events map to a handler
+        # which gets the value and the list of switch changes in this batch.
+        self._switch_event_states = {
+            pinproc.EventTypeSwitchClosedDebounced: (1, True),
+            pinproc.EventTypeSwitchOpenDebounced: (0, True),
+            pinproc.EventTypeSwitchClosedNondebounced: (1, False),
+            pinproc.EventTypeSwitchOpenNondebounced: (0, False),
+        }   # type: Dict[int, Tuple[int, bool]]
+        self._event_handlers = {}   # type: Dict[int, Callable[[int, List[Tuple[Any, int]]], None]]
+
     @asyncio.coroutine
     def initialize(self):
         """Set machine vars."""
@@ -109,6 +120,48 @@ class PROCBasePlatform(LightsPlatform, SwitchPlatform, DriverPlatform, metaclass
         """Stop proc."""
         self.proc.reset(1)
 
+    def get_service_settings(self) -> ServiceSettings:
+        """Get events at default_platform_hz while busy and tickle the watchdog four times per timeout.
+
+        Commands are flushed at default_platform_hz also while get_events backs off.
+        """
+        interval = 1 / self.machine.config['mpf']['default_platform_hz']
+        return ServiceSettings(min_interval=interval,
+                               max_interval=max(interval, self.config['idle_service_interval'] / 1000),
+                               watchdog_interval=self.config['watchdog_time'] / 4000,
+                               flush_interval=interval,
+                               readiness_fd=None)
+
+    def flush(self):
+        """Send queued commands to the P-ROC/P3-ROC."""
+        self.proc.flush()
+
+    def _process_events(self, events):
+        """Dispatch events from get_events() and process all switch changes in one batch."""
+        switch_event_states = self._switch_event_states
+        switch_changes = []     # type: List[Tuple[Any, int, bool]]
+        for event in events:
+            event_type = event['type']
+            state = switch_event_states.get(event_type)
+            if state is not None:
+                switch_changes.append((event['value'], state[0], state[1]))
+                continue
+
+            handler = self._event_handlers.get(event_type)
+            if handler:
+                handler(event['value'], switch_changes)
+            else:
+                self.log.warning("Received unrecognized event from the P-ROC/P3-ROC. "
+                                 "Type: %s, Value: %s", event_type, event['value'])
+
+        if switch_changes:
+            self.machine.switch_controller.process_switch_changes(switch_changes, self)
+
+    def tickle_watchdog(self):
+        """Tickle the watchdog of the P-ROC/P3-ROC."""
+        self.proc.watchdog_tickle()
+        self.proc.flush()
+
     def connect(self):
         """Connect to the P-ROC.
 
@@ -1,13 +1,19 @@
 """MPF plugin which automatically plays back switch events from the config file."""
 
 import logging
+import random
+
 from mpf.core.delays import DelayManager
 from mpf.core.utility_functions import Util
 
 
 class SwitchPlayer(object):
 
-    """Plays back switch sequences from a config file, used for testing."""
+    """Plays back switch sequences from a config file, used for testing.
+
+    Besides a scripted list of steps the switch player can also hit random
+    switches which is used to soak test machines (see ``mpf simulate``).
+    """
 
     def __init__(self, machine):
         """Initialise switch player."""
@@ -22,6 +28,7 @@ class SwitchPlayer(object):
         self.machine = machine
         self.delay = DelayManager(self.machine.delayRegistry)
         self.current_step = 0
+        self.random_hits = 0
 
         self.config = self.machine.config['switch_player']
         self.machine.config_validator.validate_config("switch_player", self.config)
@@ -29,7 +36,9 @@ class SwitchPlayer(object):
         self.machine.events.add_handler(self.config['start_event'],
                                         self._start_event_callback)
 
-        self.step_list = self.config['steps']
+        self.step_list = self.config.get('steps') or []
+        self.random = random.Random(self.config['random_seed'])
+        self.random_switches = []
 
     def __repr__(self):
         """Return string representation."""
@@ -37,9 +46,19 @@ class SwitchPlayer(object):
 
     def _start_event_callback(self, **kwargs):
         del kwargs
-        self.delay.add(name='switch_player_next_step',
-                       ms=Util.string_to_ms(self.step_list[self.current_step]['time']),
-                       callback=self._do_step)
+        if self.step_list:
+            self.delay.add(name='switch_player_next_step',
+                           ms=Util.string_to_ms(self.step_list[self.current_step]['time']),
+                           callback=self._do_step)
+
+        self.random_switches = list(self.config['random_switches'])
+        for tag in self.config['random_switch_tags']:
+            for switch in self.machine.switches.items_tagged(tag):
+                if switch not in self.random_switches:
+                    self.random_switches.append(switch)
+
+        if self.random_switches:
+            self._schedule_random_hit()
 
     def _do_step(self):
 
@@ -65,11 +84,32 @@ class SwitchPlayer(object):
         # inc counter
         if self.current_step < len(self.step_list) - 1:
             self.current_step += 1
+        elif self.config['repeat']:
+            self.current_step = 0
+        else:
+            return
 
-            # schedule next step
-            self.delay.add(name='switch_player_next_step',
-                           ms=Util.string_to_ms(self.step_list[self.current_step]['time']),
-                           callback=self._do_step)
+        # schedule next step
+        self.delay.add(name='switch_player_next_step',
+                       ms=Util.string_to_ms(self.step_list[self.current_step]['time']),
+                       callback=self._do_step)
+
+    def _schedule_random_hit(self):
+        self.delay.add(name='switch_player_random_hit',
+                       ms=self.random.randint(self.config['random_min_interval'],
+                                              self.config['random_max_interval']),
+                       callback=self._do_random_hit)
+
+    def _do_random_hit(self):
+        # hitting playfield switches without a ball would only confuse ball
+        # tracking
+        if not self.config['random_only_with_ball'] or self.machine.playfield.balls > 0:
+            switch = self.random.choice(self.random_switches)
+            self.log.debug("Random hit of switch: %s", switch.name)
+            self.random_hits += 1
+            self._hit(switch.name)
+
+        self._schedule_random_hit()
 
     def _hit(self, switch):
         self.machine.switch_controller.process_switch(
@@ -19,6 +19,8 @@ from mpf.core.rgb_color import RGBColor
 
 from mpf.tests.TestDataManager import TestDataManager
 from mpf.tests.loop import TimeTravelLoop, TestClock
+from mpf.tests.snapshot import MachineSnapshot, add_outcome_to_result, snapshots_supported, \
+    snapshots_enabled_by_environment
 
 import mpf.core
 import mpf.core.config_validator
@@ -84,6 +86,12 @@ class MpfTestCase(unittest.TestCase):
 
     """Primary TestCase class used for all MPF unit tests."""
 
+    # Boot the machine once and fork a copy of it for every test method. None
+    # means enabled when MPF_TEST_SNAPSHOTS=1 is set. Set this to False in
+    # test classes which change the machine in setUp based on the test method.
+    use_machine_snapshot = None     # type: Any
+    _snapshot_key_counts = {}       # type: Any
+
     def __init__(self, methodName='runTest'):
         self._get_event_loop = None
         self._get_event_loop2 = None
@@ -103,6 +111,16 @@ class MpfTestCase(unittest.TestCase):
         self.machine_config_defaults['playfields']['playfield'] = dict()
         self.machine_config_defaults['playfields']['playfield']['tags'] = "default"
         self.machine_config_defaults['playfields']['playfield']['default_source_device'] = None
+        # lag is always zero on the time travel loop and sampling slows down tests
+        self.machine_config_defaults['loop_monitor'] = dict()
+        self.machine_config_defaults['loop_monitor']['enabled'] = False
+        # never write flight recorder dumps into test machine folders
+        self.machine_config_defaults['flight_recorder'] = dict()
+        self.machine_config_defaults['flight_recorder']['dump_on_crash'] = False
+        self.machine_config_defaults['flight_recorder']['dump_on_stop'] = False
+        # threads do not finish deterministically on the time travel loop
+        self.machine_config_defaults['asset_manager'] = dict()
+        self.machine_config_defaults['asset_manager']['load_in_threads'] = False
 
         self._last_event_kwargs = {}
         self._events = {}
@@ -287,6 +305,73 @@ class MpfTestCase(unittest.TestCase):
         """
         return False
 
+    def get_snapshot_key(self):
+        """Return a key which identifies the machine booted for this test.
+
+        Tests with the same key share one machine snapshot.
+        """
+        return (self.__class__, self.getAbsoluteMachinePath(), repr(self.getConfigFile()), self.get_platform(),
+                self.get_use_bcp(), self.get_enable_plugins(), repr(self._get_mock_data()),
+                repr(self.machine_config_patches), repr(self.machine_config_defaults))
+
+    def _use_machine_snapshot(self):
+        if self.use_machine_snapshot is False or not snapshots_supported():
+            return False
+
+        method = getattr(self, self._testMethodName)
+        if getattr(self.__class__, "__unittest_skip__", False) or getattr(method, "__unittest_skip__", False):
+            return False
+
+        return self.use_machine_snapshot or snapshots_enabled_by_environment()
+
+    def _count_tests_with_snapshot_key(self, key):
+        """Return how many tests in this class can share the snapshot with key."""
+        counts = MpfTestCase._snapshot_key_counts
+        if self.__class__ not in counts:
+            counts[self.__class__] = {}
+            for method_name in unittest.defaultTestLoader.getTestCaseNames(self.__class__):
+                try:
+                    other_key = self.__class__(method_name).get_snapshot_key()
+                except AttributeError:
+                    continue
+                counts[self.__class__][other_key] = counts[self.__class__].get(other_key, 0) + 1
+
+        return counts[self.__class__].get(key, 0)
+
+    def run(self, result=None):
+        """Run test in a fork of a booted machine if snapshots are enabled."""
+        if not self._use_machine_snapshot():
+            MachineSnapshot.stop_current()
+            return super().run(result)
+
+        try:
+            key = self.get_snapshot_key()
+        except AttributeError:
+            # the machine settings depend on state created in setUp
+            key = None
+
+        if key is None or self._count_tests_with_snapshot_key(key) < 2:
+            # booting a snapshot for a single test only adds overhead
+            MachineSnapshot.stop_current()
+            return super().run(result)
+
+        snapshot = MachineSnapshot.get(key, self)
+        if not snapshot:
+            # report boot errors the usual way
+            return super().run(result)
+
+        if result is None:
+            result = self.defaultTestResult()
+
+        result.startTest(self)
+        try:
+            outcome, details = snapshot.run_test(self._testMethodName)
+            add_outcome_to_result(self, result, outcome, details)
+        finally:
+            result.stopTest(self)
+
+        return result
+
     def getOptions(self):
 
         mpfconfig = os.path.abspath(os.path.join(
@@ -408,12 +493,33 @@ class MpfTestCase(unittest.TestCase):
 
         self._exception = context
 
-    def setUp(self):
+    def _patch_global_state(self):
+        """Prevent use of the global loop and make tests independent of sys.path."""
         self._get_event_loop = asyncio.get_event_loop
         asyncio.get_event_loop = None
         self._get_event_loop2 = asyncio.events.get_event_loop
         events.get_event_loop = None
 
+        self.save_and_prepare_sys_path()
+
+    def _restore_global_state(self):
+        """Undo _patch_global_state."""
+        self.restore_sys_path()
+        asyncio.get_event_loop = self._get_event_loop
+        self._get_event_loop = None
+        events.get_event_loop = self._get_event_loop2
+        self._get_event_loop2 = None
+
+    def _stop_machine(self):
+        """Stop machine and restore global state."""
+        self.machine._do_stop()
+        self.machine = None
+
+        self._restore_global_state()
+
+    def setUp(self):
+        self._patch_global_state()
+
         # we want to reuse config_specs to speed tests up
         mpf.core.config_validator.ConfigValidator.unload_config_spec = (
             MagicMock())
@@ -433,8 +539,6 @@ class MpfTestCase(unittest.TestCase):
             # no logging by default
             logging.basicConfig(level=99)
 
-        self.save_and_prepare_sys_path()
-
         # init machine
         machine_path = self.getAbsoluteMachinePath()
 
@@ -875,14 +979,8 @@ class MpfTestCase(unittest.TestCase):
         else:
             # fire all delays
             self.advance_time_and_run(300)
-        self.machine._do_stop()
-        self.machine = None
 
-        self.restore_sys_path()
-        asyncio.get_event_loop = self._get_event_loop
-        self._get_event_loop = None
-        events.get_event_loop = self._get_event_loop2
-        self._get_event_loop2 = None
+        self._stop_machine()
 
     def add_to_config_validator(self, key, new_dict):
         if mpf.core.config_validator.ConfigValidator.config_spec:
@@ -3,6 +3,7 @@ import socket
 from asyncio import base_events, coroutine, events      # type: ignore
 import collections
 import heapq
+import time
 
 # A class to manage set of next events:
 from asyncio.selector_events import _SelectorSocketTransport
@@ -234,6 +235,7 @@ class TimeTravelLoop(base_events.BaseEventLoop):
         self._timers = NextTimers()
         self._selector = TestSelector()
         self._transports = {}   # needed for newer asyncio on windows
+        self._executor_jobs = 0
         self.reset_counters()
 
     def time(self):
@@ -349,13 +351,38 @@ class TimeTravelLoop(base_events.BaseEventLoop):
         self.remove_reader_count = collections.defaultdict(int)
         self.remove_writer_count = collections.defaultdict(int)
 
+    def run_in_executor(self, executor, func, *args):
+        """Run func in executor and keep track of running jobs."""
+        future = super().run_in_executor(executor, func, *args)
+        self._executor_jobs += 1
+        future.add_done_callback(self._executor_job_done)
+        return future
+
+    def _executor_job_done(self, future):
+        del future
+        self._executor_jobs -= 1
+
+    def _wait_for_executor_jobs(self):
+        """Wait (in real time) until a job in an executor finished.
+
+        Time does not pass while jobs run in threads, which keeps tests deterministic.
+        """
+        start = time.time()
+        while len(self._ready) == 0:
+            if time.time() > start + 10:
+                raise AssertionError("Job in executor did not finish within 10s.")
+            time.sleep(.0001)
+
     def _run_once(self):
         # Advance time only when we finished everything at the present:
         if len(self._ready) == 0:
             if not self._timers.is_empty():
                 self._time = self._timers.pop_closest()
             elif not self._closed and not self._selector.select(0):
-                raise AssertionError("Ran into an infinite loop. No socket ready and nothing scheduled.")
+                if not self._executor_jobs:
+                    raise AssertionError("Ran into an infinite loop. No socket ready and nothing scheduled.")
+                # nothing else to do. wait for jobs in threads
+                self._wait_for_executor_jobs()
 
         super()._run_once()
 
@@ -0,0 +1,181 @@
+"""Boot a test machine once and fork a copy of it for every test method."""
+import asyncio
+import atexit
+import os
+import sys
+import time
+import traceback
+import unittest
+from multiprocessing import Pipe
+
+
+def snapshots_supported():
+    """Return true if the platform can fork processes."""
+    return hasattr(os, "fork")
+
+
+def snapshots_enabled_by_environment():
+    """Return true if snapshots are enabled via MPF_TEST_SNAPSHOTS."""
+    return os.environ.get("MPF_TEST_SNAPSHOTS", "").lower() in ("1", "true", "yes")
+
+
+def discard_machine(test):
+    """Cancel all tasks and close the loop of a machine which could not be stopped cleanly."""
+    # pylint: disable-msg=protected-access
+    loop = test.loop
+    if not loop.is_closed():
+        for task in asyncio.Task.all_tasks(loop=loop):
+            task.cancel()
+        loop.stop()
+        try:
+            # let cancelled tasks finish before the loop is closed
+            loop.run_forever()
+        except Exception:   # pylint: disable-msg=broad-except
+            pass
+        loop.close()
+
+    for serial in test.clock._mock_serials.values():
+        serial.is_open = False
+    test.machine = None
+
+
+class RemoteTestError(Exception):
+
+    """Error which happened in a forked test process."""
+
+
+class MachineSnapshot(object):
+
+    """A booted machine which is forked for every test method.
+
+    The machine is booted once in the test runner by running ``setUp`` of the
+    first test with a certain key. Every test method then runs together with
+    ``tearDown`` in a forked child on a copy-on-write copy of the booted
+    machine and sends its outcome back. Caches (config specs, yaml files)
+    stay warm in the runner.
+    """
+
+    _current = None
+
+    def __init__(self, key, test):
+        """Boot machine."""
+        self.key = key
+        self.test = test
+        test.setUp()
+        # pylint: disable-msg=protected-access
+        test._restore_global_state()
+
+    @classmethod
+    def get(cls, key, test):
+        """Return a snapshot for key or None if the machine does not boot."""
+        if cls._current and cls._current.key == key:
+            return cls._current
+
+        cls.stop_current()
+        try:
+            cls._current = cls(key, test)
+        except Exception:   # pylint: disable-msg=broad-except
+            # the test will report the error when it boots itself
+            return None
+
+        return cls._current
+
+    @classmethod
+    def stop_current(cls):
+        """Stop the current snapshot machine."""
+        if cls._current:
+            cls._current.stop()
+            cls._current = None
+
+    def stop(self):
+        """Stop snapshot machine."""
+        # pylint: disable-msg=protected-access
+        self.test._patch_global_state()
+        try:
+            self.test._stop_machine()
+        except Exception:   # pylint: disable-msg=broad-except
+            # mocked hardware may not expect a shutdown without a test. the
+            # machine is discarded anyway
+            discard_machine(self.test)
+            self.test._restore_global_state()
+
+    def run_test(self, method_name):
+        """Run a test method in a fork of the machine and return its outcome."""
+        reader, writer = Pipe(duplex=False)
+        pid = os.fork()
+        if pid == 0:    # pragma: no cover
+            reader.close()
+            try:
+                writer.send(self._run_test_method(self.test, method_name))
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(0)
+
+        writer.close()
+        try:
+            outcome = reader.recv()
+        except EOFError:
+            outcome = None
+        reader.close()
+        _, status = os.waitpid(pid, 0)
+
+        if outcome is None:
+            return "error", "Test process exited with status {} without a result".format(status)
+
+        return outcome
+
+    @staticmethod
+    def _run_test_method(test, method_name):     # pragma: no cover
+        """Run test method and tearDown like unittest and return the outcome."""
+        # pylint: disable-msg=protected-access
+        test._patch_global_state()
+        test._testMethodName = method_name
+        test.test_start_time = time.time()
+        method = getattr(test, method_name)
+        expecting_failure = getattr(method, "__unittest_expecting_failure__", False)
+        try:
+            method()
+        except unittest.SkipTest as e:
+            outcome = ("skip", str(e))
+        except test.failureException:
+            outcome = ("expected_failure" if expecting_failure else "failure", traceback.format_exc())
+        except Exception:   # pylint: disable-msg=broad-except
+            outcome = ("expected_failure" if expecting_failure else "error", traceback.format_exc())
+        else:
+            outcome = ("unexpected_success" if expecting_failure else "success", None)
+
+        try:
+            test.tearDown()
+        except Exception:   # pylint: disable-msg=broad-except
+            if outcome[0] in ("success", "unexpected_success"):
+                outcome = ("error", traceback.format_exc())
+            discard_machine(test)
+
+        return outcome
+
+
+def add_outcome_to_result(test, result, outcome, details):
+    """Report the outcome of a forked test to a unittest result."""
+    if outcome == "success":
+        result.addSuccess(test)
+    elif outcome == "skip":
+        result.addSkip(test, details)
+    elif outcome == "unexpected_success":
+        result.addUnexpectedSuccess(test)
+    else:
+        exception_class = test.failureException if outcome == "failure" else RemoteTestError
+        try:
+            raise exception_class("Test failed in forked process:\n" + details)
+        except exception_class:
+            exc_info = sys.exc_info()
+
+        if outcome == "failure":
+            result.addFailure(test, exc_info)
+        elif outcome == "expected_failure":
+            result.addExpectedFailure(test, exc_info)
+        else:
+            result.addError(test, exc_info)
+
+
+atexit.register(MachineSnapshot.stop_current)
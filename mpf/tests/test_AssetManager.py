@@ -1,5 +1,13 @@
 """Test assets."""
+import asyncio
+import threading
 import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from mpf.assets.show import Show
+from mpf.core.assets import AssetLoader
 from mpf.tests.MpfTestCase import MpfTestCase
 
 
@@ -23,6 +31,30 @@ class TestAssets(MpfTestCase):
         self._test_conditional_random_asset_group()
         self._test_conditional_sequence_asset_group()
 
+    def test_load_key_index(self):
+        asset_manager = self.machine.asset_manager
+        self.assertIn(self.machine.shows['show9'], asset_manager.get_assets_by_load_key('mode1_start'))
+        self.assertNotIn(self.machine.shows['show9'], asset_manager.get_assets_by_load_key('preload'))
+        self.assertEqual([], asset_manager.get_assets_by_load_key('unknown_key'))
+
+        # every asset is indexed under its load key exactly once
+        indexed = [asset for key in ('preload', 'on_demand', 'mode1_start')
+                   for asset in asset_manager.get_assets_by_load_key(key)]
+        self.assertEqual(len(indexed), len(set(indexed)))
+        for asset in indexed:
+            self.assertIs(asset, self.machine.shows[asset.name])
+
+        # removed assets are no longer loaded on mode start
+        show9 = self.machine.shows['show9']
+        asset_manager.remove_asset('shows', 'show9')
+        self.assertNotIn('show9', self.machine.shows)
+        self.assertNotIn(show9, asset_manager.get_assets_by_load_key('mode1_start'))
+        self.assertNotIn(show9, asset_manager.load_assets_by_load_key('mode1_start'))
+
+        # adding it again puts it back into the index
+        asset_manager.add_asset('shows', 'show9', show9)
+        self.assertIn(show9, asset_manager.load_assets_by_load_key('mode1_start'))
+
     def _test_machine_wide_asset_loading(self):
 
         # test that the shows asset class gets built correctly
@@ -392,3 +424,177 @@ class TestAssets(MpfTestCase):
         self.assertIs(self.machine.shows['group8'].show, self.machine.shows['show2'])
         self.assertIs(self.machine.shows['group8'].show, self.machine.shows['show3'])
                         
+
+
+class TestThreadedAssetManager(MpfTestCase):
+
+    def __init__(self, methodName):
+        super().__init__(methodName)
+        self.machine_config_defaults['asset_manager']['load_in_threads'] = True
+
+    def getMachinePath(self):
+        return 'tests/machine_files/asset_manager'
+
+    def getConfigFile(self):
+        return 'test_asset_loading.yaml'
+
+    def test_load_and_cancel_in_thread(self):
+        asset_manager = self.machine.asset_manager
+        self.assertIsNotNone(asset_manager.loader._executor)
+        # preloaded in threads during boot
+        self.assertTrue(self.machine.shows['show1'].loaded)
+        show9 = self.machine.shows['show9']
+
+        # block the load of show9 in the worker thread and count its unloads
+        release = threading.Event()
+        unloads = []
+        do_load = Show.do_load
+        do_unload = Show._do_unload
+
+        def _do_load(show):
+            if show is show9:
+                release.wait(5)
+            do_load(show)
+
+        def _do_unload(show):
+            if show is show9:
+                unloads.append(show)
+            do_unload(show)
+
+        with patch.object(Show, "do_load", _do_load), patch.object(Show, "_do_unload", _do_unload):
+            self._test_load_and_cancel_in_thread(show9, release, unloads)
+
+    def _run_ready(self):
+        """Run callbacks which are ready without waiting for threads or advancing time."""
+        while self.loop._ready:
+            self.loop._run_once()
+
+    def _wait_for_loads(self):
+        """Wait (in real time) until all loads in threads finished and run their callbacks."""
+        loader = self.machine.asset_manager.loader
+        start = time.time()
+        while loader.get_running_count() or loader.get_queued_count():
+            self.assertLess(time.time(), start + 10)
+            time.sleep(.0001)
+            self._run_ready()
+
+    def _test_load_and_cancel_in_thread(self, show9, release, unloads):
+        asset_manager = self.machine.asset_manager
+        self.machine.modes['mode1'].start()
+        self._run_ready()
+        self.assertTrue(self.machine.modes['mode1'].active)
+        self.assertTrue(asset_manager.loader.is_running(show9))
+        self.assertTrue(show9.loading)
+
+        # mode stops while show9 is still loading. it is unloaded once the thread is done
+        self.machine.modes['mode1'].stop()
+        self._run_ready()
+        self.assertFalse(show9.loading)
+        self.assertEqual(0, len(unloads))
+
+        release.set()
+        self._wait_for_loads()
+        self.advance_time_and_run(.1)
+        self.assertFalse(asset_manager.loader.is_running(show9))
+        self.assertEqual(1, len(unloads))
+        self.assertFalse(show9.loaded)
+        self.assertEqual(asset_manager.num_assets_to_load, asset_manager.num_assets_loaded)
+
+        # starting the mode again loads it in a thread
+        self.machine.modes['mode1'].start()
+        self._wait_for_loads()
+        self.advance_time_and_run(.1)
+        self.assertTrue(show9.loaded)
+        self.assertFalse(show9.loading)
+        self.assertEqual(1, len(unloads))
+
+        self.machine.modes['mode1'].stop()
+        self.advance_time_and_run(.1)
+        self.assertFalse(show9.loaded)
+        self.assertEqual(2, len(unloads))
+
+
+class SlowAsset(object):
+
+    def __init__(self, name, priority, duration, loader_test):
+        self.name = name
+        self.priority = priority
+        self.duration = duration
+        self.test = loader_test
+
+    def do_load(self):
+        with self.test.lock:
+            self.test.concurrent += 1
+            self.test.max_concurrent = max(self.test.max_concurrent, self.test.concurrent)
+        time.sleep(self.duration)
+        with self.test.lock:
+            self.test.concurrent -= 1
+            self.test.load_order.append(self.name)
+
+
+class TestAssetLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.lock = threading.Lock()
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self.load_order = []
+        self.done = []
+        self.executor = None
+
+    def tearDown(self):
+        if self.executor:
+            self.executor.shutdown()
+        self.loop.close()
+
+    def _callback(self, asset, cancelled):
+        self.done.append((asset.name, cancelled))
+
+    def _run_until_done(self, count):
+        """Run loop until count assets are done and return the max loop lag."""
+        max_lag = 0
+        while len(self.done) < count:
+            expected = self.loop.time() + .005
+            self.loop.run_until_complete(asyncio.sleep(.005, loop=self.loop))
+            max_lag = max(max_lag, self.loop.time() - expected)
+        return max_lag
+
+    def test_threads_do_not_block_loop(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        loader = AssetLoader(self.loop, 2, self._callback, self.executor)
+        for i in range(6):
+            loader.add(SlowAsset("asset{}".format(i), 0, .05, self))
+
+        self.assertEqual(2, loader.get_running_count())
+        self.assertEqual(4, loader.get_queued_count())
+        max_lag = self._run_until_done(6)
+
+        self.assertEqual(2, self.max_concurrent)
+        self.assertEqual(6, len(self.load_order))
+        self.assertLess(max_lag, .04)
+
+        # loading on the loop blocks it for the duration of a load
+        loader = AssetLoader(self.loop, 2, self._callback)
+        loader.add(SlowAsset("inline", 0, .05, self))
+        self.assertGreaterEqual(self._run_until_done(7), .04)
+
+    def test_priority_and_cancel(self):
+        loader = AssetLoader(self.loop, 1, self._callback)
+        assets = {name: SlowAsset(name, priority, 0, self) for name, priority in
+                  (("a", 0), ("b", 0), ("c", 0), ("d", 10), ("e", 0))}
+        for name in "abcde":
+            self.assertTrue(loader.add(assets[name]))
+        self.assertFalse(loader.add(assets["b"]))
+
+        # c is raised above d
+        assets["c"].priority = 20
+        loader.update_priority(assets["c"])
+
+        # e is cancelled while queued. a while it is loading
+        self.assertTrue(loader.cancel(assets["e"]))
+        self.assertFalse(loader.cancel(assets["a"]))
+
+        self._run_until_done(4)
+        self.assertEqual(["a", "c", "d", "b"], self.load_order)
+        self.assertEqual([("a", True), ("c", False), ("d", False), ("b", False)], self.done)
@@ -0,0 +1,111 @@
+"""Test asset folder scanning with a manifest."""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from mpf.core.asset_manifest import AssetDirectoryScanner
+
+
+class TestAssetManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.manifest_file = os.path.join(self.root, "manifest")
+        self.images = os.path.join(self.root, "images")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _create_tree(self, folders, files_per_folder):
+        for folder in folders:
+            path = os.path.join(self.images, folder)
+            os.makedirs(path, exist_ok=True)
+            for i in range(files_per_folder):
+                open(os.path.join(path, "image{}.png".format(i)), 'w').close()
+
+        # make every directory older than the racy window
+        past = time.time() - 100
+        for path, _, _ in os.walk(self.images):
+            os.utime(path, (past, past))
+
+    def _scan(self, load=True):
+        scanner = AssetDirectoryScanner(self.manifest_file)
+        if load:
+            scanner.load()
+        listing = scanner.scan(self.images)
+        scanner.save()
+        return scanner, listing
+
+    @staticmethod
+    def _normalise(listing):
+        return sorted((path, first_level, sorted(files)) for path, first_level, files in listing)
+
+    def test_scan_like_os_walk(self):
+        self._create_tree(["", "foo", "foo/bar", "foo/bar/baz", "other"], 2)
+        _, listing = self._scan()
+
+        expected = []
+        for path, _, files in os.walk(self.images, followlinks=True):
+            relative = os.path.relpath(path, self.images)
+            expected.append((path, None if relative == "." else relative.split(os.sep)[0], files))
+        self.assertEqual(self._normalise(expected), self._normalise(listing))
+        self.assertEqual(self.images, listing[0][0])
+
+        # folders which do not exist are empty
+        scanner = AssetDirectoryScanner()
+        self.assertEqual([], scanner.scan(os.path.join(self.root, "sounds")))
+        self.assertEqual({os.path.join(self.root, "sounds"): []},
+                         scanner.scan_all([os.path.join(self.root, "sounds")]))
+
+    def test_detect_changes(self):
+        self._create_tree(["", "foo", "foo/bar"], 2)
+        scanner, first = self._scan()
+        self.assertEqual(3, scanner.dirs_listed)
+
+        # unchanged directories are reused
+        scanner, second = self._scan()
+        self.assertEqual(0, scanner.dirs_listed)
+        self.assertEqual(3, scanner.dirs_reused)
+        self.assertEqual(self._normalise(first), self._normalise(second))
+
+        # a new file is found. only its folder is listed again
+        open(os.path.join(self.images, "foo", "bar", "new.png"), 'w').close()
+        scanner, third = self._scan()
+        self.assertEqual(1, scanner.dirs_listed)
+        self.assertIn("new.png", dict((path, files) for path, _, files in third)[
+            os.path.join(self.images, "foo", "bar")])
+
+        # a replaced folder has a new inode
+        shutil.rmtree(os.path.join(self.images, "foo", "bar"))
+        self._create_tree(["foo/bar"], 1)
+        scanner, fourth = self._scan()
+        self.assertEqual(["image0.png"], dict((path, files) for path, _, files in fourth)[
+            os.path.join(self.images, "foo", "bar")])
+
+        # without a manifest everything is listed
+        scanner, _ = self._scan(load=False)
+        self.assertEqual(3, scanner.dirs_listed)
+
+    def test_cold_and_warm_boot(self):
+        # 40 files in 35 folders in five asset classes
+        classes = ["images", "sounds", "videos", "shows", "fonts"]
+        for asset_class in classes:
+            self.images = os.path.join(self.root, asset_class)
+            self._create_tree(["group{}/sub{}".format(i // 2, i % 2) for i in range(4)], 2)
+        roots = [os.path.join(self.root, asset_class) for asset_class in classes]
+
+        scanner = AssetDirectoryScanner(self.manifest_file)
+        cold = scanner.scan_all(roots)
+        scanner.save()
+        self.assertEqual(5 * 7, scanner.dirs_listed)
+
+        scanner = AssetDirectoryScanner(self.manifest_file)
+        self.assertTrue(scanner.load())
+        warm = scanner.scan_all(roots)
+
+        self.assertEqual(40, sum(len(files) for listing in warm.values() for _, _, files in listing))
+        self.assertEqual(cold, warm)
+        self.assertEqual(0, scanner.dirs_listed)
+        self.assertEqual(5 * 7, scanner.dirs_reused)
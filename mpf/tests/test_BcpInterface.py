@@ -1,5 +1,7 @@
 """Test the bcp interface."""
 import asyncio
+import os
+import tempfile
 from unittest import mock
 
 from mpf.core.events import RegisteredHandler
@@ -75,6 +77,66 @@ class TestBcpInterface(MpfBcpTestCase):
         queue = self._bcp_external_client.reset_and_return_queue()
         self.assertFalse(queue)
 
+    def test_monitor_events_without_handlers(self):
+        handler = CallHandler()
+        self.machine.events.add_handler("test2", handler)
+        self._bcp_external_client.reset_and_return_queue()
+        self._bcp_external_client.send('monitor_start', {'category': 'events', 'registered_handlers': False})
+        self.advance_time_and_run()
+
+        # handlers are not converted when no client asked for them
+        with mock.patch("mpf.core.bcp.bcp_interface.Util.convert_to_simply_type",
+                        wraps=lambda value: value) as convert:
+            self.machine.events.post("test2")
+            queue = self._bcp_external_client.reset_and_return_queue()
+        convert.assert_called_once_with({})
+        self.assertIn(
+            ('monitored_event', dict(event_name='test2', event_type=None,
+                                     event_callback=None, event_kwargs={})),
+            queue)
+
+    def test_monitor_loop(self):
+        self._bcp_external_client.send('monitor_start', {'category': 'loop'})
+        self.advance_time_and_run(1.5)
+
+        queue = self._bcp_external_client.reset_and_return_queue()
+        messages = [kwargs for cmd, kwargs in queue if cmd == "loop_monitor"]
+        self.assertTrue(messages)
+        self.assertEqual(["callbacks", "lag", "slowest_callbacks"], sorted(messages[0].keys()))
+
+        self._bcp_external_client.send('monitor_stop', {'category': 'loop'})
+        self.advance_time_and_run(1.5)
+        self._bcp_external_client.reset_and_return_queue()
+        self.advance_time_and_run(1.5)
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertNotIn("loop_monitor", [cmd for cmd, _ in queue])
+
+    def test_flight_recorder(self):
+        with tempfile.TemporaryDirectory() as folder:
+            self.machine.flight_recorder.config['folder'] = folder
+            self._bcp_external_client.reset_and_return_queue()
+            self._bcp_external_client.send('flight_recorder', {})
+            self.advance_time_and_run()
+
+            queue = self._bcp_external_client.reset_and_return_queue()
+            responses = [kwargs for cmd, kwargs in queue if cmd == "flight_recorder"]
+            self.assertEqual(1, len(responses))
+            self.assertFalse(responses[0]["error"])
+            self.assertTrue(os.path.isfile(responses[0]["file"]))
+
+    def test_device_monitor_without_state(self):
+        self._bcp_external_client.send('monitor_start', {'category': 'devices', 'state': False})
+        self.advance_time_and_run()
+        self._bcp_external_client.reset_and_return_queue()
+
+        self.hit_switch_and_run("s_test", .1)
+        queue = self._bcp_external_client.reset_and_return_queue()
+        self.assertIn(
+            ("device", {"type": "switch",
+                        "name": "s_test",
+                        "changes": ('state', 0, 1)}),
+            queue)
+
     def test_device_monitor(self):
         self.hit_switch_and_run("s_test", .1)
         self.release_switch_and_run("s_test2", .1)
@@ -1,7 +1,11 @@
+import asyncio
+import socket
 import unittest
 from unittest.mock import MagicMock
 
-from mpf.core.bcp.bcp_socket_client import decode_command_string, encode_command_string
+from mpf.core.bcp.bcp_socket_client import decode_command_string, encode_command_string, encode_command_frame, \
+    decode_command_frame, BINARY_FRAME_HEADER, CODEC_JSON, CODEC_MSGPACK, msgpack, AsyncioBcpClientSocket, \
+    read_command_frame
 from mpf.tests.MpfTestCase import MpfTestCase
 from mpf.tests.loop import MockQueueSocket
 
@@ -103,6 +107,39 @@ class TestBcpSocketClientEncoding(unittest.TestCase):
                          dict(key3='value5', key4='value6'))
 
 
+    def _decode_frame(self, frame):
+        codec, payload_length, rawbytes_length = BINARY_FRAME_HEADER.unpack(frame[:BINARY_FRAME_HEADER.size])
+        payload = frame[BINARY_FRAME_HEADER.size:BINARY_FRAME_HEADER.size + payload_length]
+        rawbytes = frame[BINARY_FRAME_HEADER.size + payload_length:]
+        self.assertEqual(rawbytes_length, len(rawbytes))
+        return decode_command_frame(codec, payload, rawbytes)
+
+    def test_frame_encoding_decoding_json(self):
+        frame = encode_command_frame("Play", CODEC_JSON, some_int=7, some_float=2.0, some_none=None,
+                                     some_list=[1, "a"], some_dict={"key": "value"})
+        decoded_command, decoded_kwargs = self._decode_frame(frame)
+
+        self.assertEqual("play", decoded_command)
+        self.assertEqual(dict(some_int=7, some_float=2.0, some_none=None, some_list=[1, "a"],
+                              some_dict={"key": "value"}), decoded_kwargs)
+
+        # rawbytes are appended without encoding
+        data = b'\x00\x01' * 2048
+        frame = encode_command_frame("dmd_frame", CODEC_JSON, name="dmd1", rawbytes=data)
+        self.assertTrue(frame.endswith(data))
+        decoded_command, decoded_kwargs = self._decode_frame(frame)
+        self.assertEqual("dmd_frame", decoded_command)
+        self.assertEqual(dict(name="dmd1", rawbytes=data), decoded_kwargs)
+
+    @unittest.skipIf(not msgpack, "msgpack is not installed")
+    def test_frame_encoding_decoding_msgpack(self):
+        data = b'\x00\x01' * 2048
+        frame = encode_command_frame("dmd_frame", CODEC_MSGPACK, name="dmd1", value=7, rawbytes=data)
+        decoded_command, decoded_kwargs = self._decode_frame(frame)
+        self.assertEqual("dmd_frame", decoded_command)
+        self.assertEqual(dict(name="dmd1", value=7, rawbytes=data), decoded_kwargs)
+
+
 class MockBcpQueueSocket(MockQueueSocket):
 
     """Mock Queue Socket for BCP which emulates reset."""
@@ -211,3 +248,285 @@ class TestBcpSocketMultipleClients(MpfTestCase):
         self.client_socket_2.recv_queue.append(b'receive_msg?param1=1&param2=2\n')
         self.advance_time_and_run()
         receiver.assert_called_once_with(param1="1", param2="2", client=self._bcp_client_2)
+
+    def testSendToClientsEncodesOnce(self):
+        while not self.client_socket_1.send_queue.empty():
+            self.client_socket_1.send_queue.get_nowait()
+        while not self.client_socket_2.send_queue.empty():
+            self.client_socket_2.send_queue.get_nowait()
+
+        encode = MagicMock(wraps=self._bcp_client_1.encode)
+        self._bcp_client_1.encode = encode
+        self._bcp_client_2.encode = encode
+
+        self.machine.bcp.transport.send_to_clients([self._bcp_client_1, self._bcp_client_2], "trigger", name="test")
+        self.advance_time_and_run()
+
+        self.assertEqual(1, encode.call_count)
+        self.assertEqual(b'trigger?name=test\n', self.client_socket_1.send_queue.get_nowait())
+        self.assertEqual(b'trigger?name=test\n', self.client_socket_2.send_queue.get_nowait())
+
+
+class TestBcpSocketClientBinaryFraming(MpfTestCase):
+
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+
+        self.machine_config_patches['bcp'] = {}
+        self.machine_config_patches['bcp']['servers'] = []
+        self.machine_config_patches['bcp']['connections'] = {
+            "local_display": {
+                "host": "localhost",
+                "port": 5050,
+                "type": "mpf.core.bcp.bcp_socket_client.BCPClientSocket",
+                "framing": "binary"
+            }
+        }
+
+    def get_use_bcp(self):
+        return True
+
+    def setUp(self):
+        super().setUp()
+        self._bcp_client = self.machine.bcp.transport.get_named_client("local_display")
+
+    def _mock_loop(self):
+        self.client_socket = MockBcpQueueSocket(self.loop)
+        self.clock.mock_socket("localhost", 5050, self.client_socket)
+
+    def _get_frame(self):
+        frame = self.client_socket.send_queue.get_nowait()
+        codec, payload_length, _ = BINARY_FRAME_HEADER.unpack(frame[:BINARY_FRAME_HEADER.size])
+        self.assertEqual(CODEC_JSON, codec)
+        return decode_command_frame(codec, frame[BINARY_FRAME_HEADER.size:BINARY_FRAME_HEADER.size + payload_length])
+
+    def testNegotiateBinaryFraming(self):
+        # hello offers binary framing
+        cmd, kwargs = decode_command_string(self.client_socket.send_queue.get_nowait()[0:-1].decode())
+        self.assertEqual("hello", cmd)
+        self.assertEqual("binary", kwargs["framing"])
+        self.assertIn("json", kwargs["codecs"].split(","))
+
+        # remote accepts with json only. its hello is the last text message
+        receiver = MagicMock()
+        self.machine.bcp.interface.register_command_callback("receive_msg", receiver)
+        self.client_socket.recv_queue.append(b'hello?version=1.1&framing=binary&codecs=json\n')
+        self.client_socket.recv_queue.append(encode_command_frame("receive_msg", CODEC_JSON, param1=1, param2=[1, 2]))
+        self.advance_time_and_run()
+        receiver.assert_called_once_with(param1=1, param2=[1, 2], client=self._bcp_client)
+
+        # mpf tells the remote that frames will follow
+        self.assertEqual(b'framing?mode=binary&codec=json\n', self.client_socket.send_queue.get_nowait())
+
+        self.machine.bcp.transport.send_to_all_clients("trigger", name="test", value=7)
+        self.advance_time_and_run()
+        self.assertEqual(("trigger", {"name": "test", "value": 7}), self._get_frame())
+
+        # frames with raw bytes
+        data = b'0' * 4096
+        receiver.reset_mock()
+        frame = encode_command_frame("receive_msg", CODEC_JSON, name="default", rawbytes=data)
+        self.client_socket.recv_queue.append(frame[:1000])
+        self.client_socket.recv_queue.append(frame[1000:])
+        self.advance_time_and_run()
+        receiver.assert_called_once_with(name="default", client=self._bcp_client, rawbytes=data)
+
+
+class TestAsyncioBcpClientSocketHandshake(unittest.TestCase):
+
+    """Test the client side of the hello handshake which is used by mpf service and mpf profile."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        host_socket, client_socket = socket.socketpair()
+        self.host_reader, self.host_writer = self.loop.run_until_complete(
+            asyncio.open_connection(sock=host_socket, loop=self.loop))
+        reader, self.client_writer = self.loop.run_until_complete(
+            asyncio.open_connection(sock=client_socket, loop=self.loop))
+        self.client = AsyncioBcpClientSocket(self.client_writer, reader)
+
+    def tearDown(self):
+        self.host_writer.close()
+        self.client_writer.close()
+        # let the transports close
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.loop.close()
+
+    def _run(self, coro):
+        return self.loop.run_until_complete(asyncio.wait_for(coro, 1, loop=self.loop))
+
+    def _read_host_line(self):
+        return decode_command_string(self._run(self.host_reader.readline())[0:-1].decode())
+
+    def test_binary_framing(self):
+        # host offers binary framing
+        self.host_writer.write(b'hello?version=1.1&framing=binary&codecs=msgpack,json\n')
+        self.assertTrue(self._run(self.client.handshake()))
+
+        # client accepts in its text hello
+        cmd, kwargs = self._read_host_line()
+        self.assertEqual("hello", cmd)
+        self.assertEqual("binary", kwargs["framing"])
+
+        # host switches and sends frames
+        codec = CODEC_MSGPACK if msgpack else CODEC_JSON
+        self.host_writer.write(b'framing?mode=binary&codec=json\n')
+        self.host_writer.write(encode_command_frame("service_stop", codec, result=[1, 2]))
+        self.assertEqual(("service_stop", {"result": [1, 2]}), self._run(self.client.read_message()))
+
+        # client sends frames
+        self.client.send("service", {"subcommand": "stop"})
+        self.assertEqual(("service", {"subcommand": "stop"}), self._run(read_command_frame(self.host_reader)))
+
+    def test_text_framing(self):
+        # host does not offer binary framing. client does not answer and keeps sending text
+        self.host_writer.write(b'hello?version=1.1\n')
+        self.assertFalse(self._run(self.client.handshake()))
+        self.client.send("service", {"subcommand": "stop"})
+        self.assertEqual(("service", {"subcommand": "stop"}), self._read_host_line())
+
+
+class StalledBcpQueueSocket(MockBcpQueueSocket):
+
+    """Mock Queue Socket which stops reading when stalled."""
+
+    def __init__(self, loop):
+        super().__init__(loop)
+        self.stalled = False
+
+    def write_ready(self):
+        return not self.stalled
+
+    def send(self, data):
+        if self.stalled:
+            raise BlockingIOError()
+        # the transport reuses its buffer
+        return super().send(bytes(data))
+
+
+class TestBcpSocketClientSendQueues(MpfTestCase):
+
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+
+        self.machine_config_patches['bcp'] = {}
+        self.machine_config_patches['bcp']['servers'] = []
+        self.machine_config_patches['bcp']['connections'] = {
+            "local_display": {
+                "host": "localhost",
+                "port": 5050,
+                "type": "mpf.core.bcp.bcp_socket_client.BCPClientSocket",
+                "max_queued_control": 3,
+                "max_queued_monitor": 2,
+                "exit_on_close": False,
+            }
+        }
+        if self._testMethodName == "testStalledClientDisconnected":
+            # disconnecting a stalled client does not stop the machine
+            self.machine_config_patches['bcp']['connections']['local_display']['disconnect_on_stall'] = True
+            self.machine_config_patches['bcp']['connections']['local_display']['exit_on_close'] = True
+
+    def get_use_bcp(self):
+        return True
+
+    def setUp(self):
+        super().setUp()
+        self._bcp_client = self.machine.bcp.transport.get_named_client("local_display")
+
+    def _mock_loop(self):
+        self.client_socket = StalledBcpQueueSocket(self.loop)
+        self.clock.mock_socket("localhost", 5050, self.client_socket)
+
+    def _get_sent_data(self):
+        data = b''
+        while not self.client_socket.send_queue.empty():
+            data += self.client_socket.send_queue.get_nowait()
+        return data
+
+    def testStalledClient(self):
+        self._get_sent_data()
+        self._bcp_client._sender.transport.set_write_buffer_limits(high=10)
+
+        # remote stops reading. first message is buffered by the transport
+        self.client_socket.stalled = True
+        self.machine.bcp.transport.send_to_all_clients("trigger", name="buffered")
+        self.advance_time_and_run()
+
+        # monitor messages replace the oldest queued one
+        for i in range(5):
+            self.machine.bcp.transport.send_to_all_clients("switch", name="s{}".format(i), state=1)
+        # control messages are never replaced
+        for i in range(3):
+            self.machine.bcp.transport.send_to_all_clients("trigger", name="t{}".format(i))
+        self.advance_time_and_run()
+
+        self.assertEqual({"control": {"depth": 3, "dropped": 0},
+                          "monitor": {"depth": 2, "dropped": 3},
+                          "frames": {"depth": 0, "dropped": 0}}, self._bcp_client.get_send_queue_stats())
+        self.assertEqual(b'', self._get_sent_data())
+
+        # remote reads again. control messages go first. all messages fit below the high-water mark and are
+        # written after the pending drain without another one
+        drains = []
+        drain = self._bcp_client._sender.drain
+
+        def _drain():
+            drains.append(True)
+            return drain()
+
+        self._bcp_client._sender.drain = _drain
+        self._bcp_client._sender.transport.set_write_buffer_limits(high=1000)
+        self.client_socket.stalled = False
+        self.advance_time_and_run()
+        self.assertEqual(b'trigger?name=buffered\ntrigger?name=t0\ntrigger?name=t1\ntrigger?name=t2\n'
+                         b'switch?name=s3&state=int:1\nswitch?name=s4&state=int:1\n', self._get_sent_data())
+        self.assertEqual([], drains)
+        self.assertEqual({"control": {"depth": 0, "dropped": 0},
+                          "monitor": {"depth": 0, "dropped": 3},
+                          "frames": {"depth": 0, "dropped": 0}}, self._bcp_client.get_send_queue_stats())
+
+        # messages are written directly again
+        self.machine.bcp.transport.send_to_all_clients("trigger", name="direct")
+        self.assertEqual(b'trigger?name=direct\n', self._get_sent_data())
+
+    def testStalledClientDropsControlMessages(self):
+        self._get_sent_data()
+        self._bcp_client._sender.transport.set_write_buffer_limits(high=10)
+        self.client_socket.stalled = True
+        for i in range(4):
+            self.machine.bcp.transport.send_to_all_clients("trigger", name="t{}".format(i))
+
+        # control queue is full. new control messages are dropped and the client stays connected
+        self.machine.bcp.transport.send_to_all_clients("trigger", name="t4")
+        self.machine.bcp.transport.send_to_all_clients("trigger", name="t5")
+        self.advance_time_and_run()
+        self.assertIn(self._bcp_client, self.machine.bcp.transport.get_all_clients())
+        self.assertEqual({"control": {"depth": 3, "dropped": 2},
+                          "monitor": {"depth": 0, "dropped": 0},
+                          "frames": {"depth": 0, "dropped": 0}}, self._bcp_client.get_send_queue_stats())
+
+        self._bcp_client._sender.transport.set_write_buffer_limits(high=1000)
+        self.client_socket.stalled = False
+        self.advance_time_and_run()
+        self.assertEqual(b'trigger?name=t0\ntrigger?name=t1\ntrigger?name=t2\ntrigger?name=t3\n',
+                         self._get_sent_data())
+        self.assertFalse(self._bcp_client._stalled)
+
+    def testStalledClientDisconnected(self):
+        self._get_sent_data()
+        self._bcp_client._sender.transport.set_write_buffer_limits(high=10)
+        self.client_socket.stalled = True
+        for i in range(4):
+            self.machine.bcp.transport.send_to_all_clients("trigger", name="t{}".format(i))
+        self.assertIn(self._bcp_client, self.machine.bcp.transport.get_all_clients())
+
+        # control queue is full. the client is disconnected without goodbye. queued messages are dropped
+        self.machine.bcp.transport.send_to_all_clients("trigger", name="t4")
+        self.advance_time_and_run()
+        self.assertNotIn(self._bcp_client, self.machine.bcp.transport.get_all_clients())
+        self.assertTrue(self._bcp_client._sender.transport.is_closing())
+        self.assertEqual({"control": {"depth": 0, "dropped": 4},
+                          "monitor": {"depth": 0, "dropped": 0},
+                          "frames": {"depth": 0, "dropped": 0}}, self._bcp_client.get_send_queue_stats())
+        self.assertFalse(self.machine.stop_future.done())
+        self.assertEqual(b'', self._get_sent_data())
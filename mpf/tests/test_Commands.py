@@ -1,8 +1,13 @@
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
 from unittest import TestCase
 from unittest.mock import patch
 
 
-from mpf.commands import game, migrate, both
+from mpf.commands import game, migrate, both, test
 
 
 class TestCommands(TestCase):
@@ -25,3 +30,47 @@ class TestCommands(TestCase):
                 with patch("mpf.commands.migrate.Migrator") as cmd:
                     migrate.Command("test", "machine", "")
                     cmd.assert_called_with("test", "machine")
+
+    def test_test_parallel(self):
+        tests_path = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            durations_file = os.path.join(tmp_dir, "durations.json")
+            output = io.StringIO()
+            with redirect_stdout(output), self.assertRaises(SystemExit) as exit_code:
+                test.Command(["mpf", os.path.join(tests_path, "test_DeviceCollection.py"),
+                              os.path.join(tests_path, "test_Randomizer.py"),
+                              "--jobs", "2", "--durations", durations_file], "machine")
+
+            self.assertFalse(exit_code.exception.code)
+            self.assertIn("on 2 worker(s)", output.getvalue())
+            self.assertIn("OK (skipped=0)", output.getvalue())
+
+            with open(durations_file) as f:
+                durations = json.load(f)
+            self.assertIn("test_DeviceCollection.TestDeviceCollection", durations)
+            self.assertIn("test_Randomizer.TestRandomizer", durations)
+
+    def test_durations_filename(self):
+        tests_path = os.path.dirname(os.path.abspath(__file__))
+        filename = test.get_durations_filename([tests_path, "mpf/tests/regression_tests"])
+        self.assertEqual(tempfile.gettempdir(), os.path.dirname(filename))
+        self.assertEqual(filename, test.get_durations_filename(["mpf/tests/regression_tests", tests_path]))
+        self.assertNotEqual(filename, test.get_durations_filename([tests_path]))
+
+    def test_collect_doc_tests_recursively(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.makedirs(os.path.join(tmp_dir, "sub", "deeper"))
+            for name in ("a.yaml", os.path.join("sub", "b.yaml"), os.path.join("sub", "deeper", "c.yaml"),
+                         os.path.join("sub", "notes.txt")):
+                open(os.path.join(tmp_dir, name), "w").close()
+
+            self.assertEqual([("doc", os.path.join(tmp_dir, "a.yaml")),
+                              ("doc", os.path.join(tmp_dir, "sub", "b.yaml")),
+                              ("doc", os.path.join(tmp_dir, "sub", "deeper", "c.yaml"))],
+                             test.collect_tasks([tmp_dir]))
+            self.assertEqual(4, len(test.collect_tasks([tmp_dir], doc_pattern="*")))
+
+    def test_order_by_duration(self):
+        tasks = [("doc", "a"), ("doc", "b"), ("doc", "c")]
+        self.assertEqual([("doc", "c"), ("doc", "b"), ("doc", "a")],
+                         test.order_by_duration(tasks, {"a": 1, "b": 3}))
@@ -49,3 +49,32 @@ class TestDeviceCollection(MpfTestCase):
         self.assertEqual(led2, self.machine.lights.number('2'))
         self.assertEqual(led3, self.machine.lights.number('3'))
         self.assertEqual(led4, self.machine.lights.number('4'))
+
+    def test_tag_index_updates(self):
+        led3 = self.machine.lights['led3']
+        led4 = self.machine.lights['led4']
+
+        self.assertEqual([], self.machine.lights.items_tagged('tag3'))
+
+        # changing tags updates the index
+        led4.tags = ["tag3"]
+        self.assertEqual([led4], self.machine.lights.items_tagged('tag3'))
+
+        # returned lists are copies
+        self.machine.lights.items_tagged('tag3').append(led3)
+        self.assertEqual([led4], self.machine.lights.items_tagged('tag3'))
+
+        # removing a device updates the index
+        del self.machine.lights['led4']
+        self.assertEqual([], self.machine.lights.items_tagged('tag3'))
+        with self.assertRaises(AssertionError):
+            self.machine.lights.number('4')
+
+        # adding a device updates the index
+        self.machine.lights['led4'] = led4
+        self.assertEqual([led4], self.machine.lights.items_tagged('tag3'))
+        self.assertEqual(led4, self.machine.lights.number('4'))
+
+    def test_unknown_number(self):
+        with self.assertRaises(AssertionError):
+            self.machine.lights.number('23')
@@ -66,3 +66,39 @@ class TestDeviceDriver(MpfTestCase):
         self.advance_time_and_run(.5)
 
         self.machine.coils.coil_03.hw_driver.disable.assert_called_with()
+
+    def test_pulse_profiles(self):
+        coil = self.machine.coils.coil_02
+        coil.hw_driver.pulse = MagicMock()
+        self.machine.bcp.interface.send_driver_event = MagicMock()
+
+        # default profile is resolved at init and reused
+        profile = coil._get_pulse_profile(None, None)
+        self.assertEqual(60, profile.pulse_ms)
+        coil.pulse()
+        coil.pulse()
+        coil.hw_driver.pulse.assert_called_with(PulseSettings(power=1.0, duration=60))
+        self.assertIs(profile.pulse_settings, coil.hw_driver.pulse.call_args[0][0])
+
+        # other settings get their own profile
+        coil.pulse(20, 0.5)
+        coil.hw_driver.pulse.assert_called_with(PulseSettings(power=0.5, duration=20))
+        self.assertIs(coil._get_pulse_profile(20, 0.5), coil._get_pulse_profile(20, 0.5))
+
+        # invalid settings are never cached
+        with self.assertRaises(AssertionError):
+            coil.pulse(10.5)
+        with self.assertRaises(AssertionError):
+            coil.pulse(10.5)
+
+        # no bcp client monitors drivers
+        self.machine.bcp.interface.send_driver_event.assert_not_called()
+        self.assertFalse(self.machine.bcp.interface.has_driver_monitors())
+
+        client = MagicMock()
+        self.machine.bcp.transport.add_handler_to_transport("_monitor_drivers", client)
+        self.assertTrue(self.machine.bcp.interface.has_driver_monitors())
+        coil.pulse()
+        self.machine.bcp.interface.send_driver_event.assert_called_once_with(
+            action="pulse", name="coil_02", number="2", pulse_ms=60, pulse_power=1.0)
+        self.machine.bcp.transport.remove_transport_from_handle("_monitor_drivers", client)
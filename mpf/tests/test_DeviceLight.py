@@ -62,6 +62,24 @@ class TestDeviceLight(MpfTestCase):
         self.assertEqual(0 / 255.0, led.hw_drivers["green"][0].current_brightness)
         self.assertEqual(0 / 255.0, led.hw_drivers["blue"][0].current_brightness)
 
+    def test_brightness(self):
+        led = self.machine.lights.led1
+        self.machine.set_machine_var("brightness", 0.5)
+        led.color(RGBColor("white"))
+        self.advance_time_and_run()
+        self.assertLightColor("led1", RGBColor("white"))
+        # same result as applying brightness and color correction one by one
+        corrected_color = led.color_correct(led.gamma_correct(led.get_color()))
+        self.assertEqual(RGBColor([127, 127, 127]), corrected_color)
+        self.assertEqual(127 / 255.0, led.hw_drivers["red"][0].current_brightness)
+        self.assertEqual(127 / 255.0, led.hw_drivers["green"][0].current_brightness)
+        self.assertEqual(127 / 255.0, led.hw_drivers["blue"][0].current_brightness)
+
+        self.machine.set_machine_var("brightness", 1.0)
+        led.color(RGBColor("white"), key="test")
+        self.advance_time_and_run()
+        self.assertEqual(1.0, led.hw_drivers["red"][0].current_brightness)
+
     def test_consecutive_fades(self):
         self.assertLightColor("led1", [0, 0, 0])
         led = self.machine.lights["led1"]
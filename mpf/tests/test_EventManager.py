@@ -899,3 +899,77 @@ class TestEventManager(MpfFakeGameTestCase, MpfTestCase):
 
         self.assertEventNotCalled("out3")
         self.assertEventCalled("out4")
+
+    def test_handler_profiling(self):
+        self.assertIsNone(self.machine.events.profiler)
+        self.machine.events.enable_profiling()
+        profiler = self.machine.events.profiler
+
+        self.machine.events.add_handler('test_event', self.event_handler1)
+        self.machine.events.post('test_event')
+        self.machine.events.post('test_event')
+        self.advance_time_and_run()
+
+        stats = profiler.stats[("test_event", "TestEventManager.event_handler1")]
+        self.assertEqual(2, stats[0])
+        self.assertGreaterEqual(stats[2], 0)
+
+        self.machine.events.add_handler('test_queue_event', self.event_handler_add_quick_queue)
+        self.machine.events.post_queue('test_queue_event', callback=self.queue_callback)
+        self.advance_time_and_run()
+        self.assertEqual(1, self._queue_callback_called)
+        self.assertIn(("test_queue_event", "TestEventManager.event_handler_add_quick_queue"), profiler.stats)
+
+        delay = DelayManager(self.machine.delayRegistry)
+        delay.add(100, self.callback)
+        self.advance_time_and_run(1)
+        self.assertEqual(1, profiler.stats[("delay", "TestEventManager.callback")][0])
+
+        top = profiler.get_top(100, "count")
+        self.assertEqual({"source": "test_event", "handler": "TestEventManager.event_handler1", "count": 2},
+                         {k: v for k, v in top[0].items() if k in ("source", "handler", "count")})
+        self.assertIn("test_event -> TestEventManager.event_handler1", profiler.format_top())
+
+        profiler.reset()
+        self.assertEqual([], profiler.get_top())
+
+        self.machine.events.disable_profiling()
+        self.assertIsNone(self.machine.events.profiler)
+        self.machine.events.post('test_event')
+        self.advance_time_and_run()
+
+    def test_event_handle(self):
+        handle = self.machine.events.get_event_handle('Test_Handle_Event')
+        self.assertEqual("test_handle_event", handle.name)
+        self.assertIs(handle, self.machine.events.get_event_handle('test_handle_event'))
+        self.assertFalse(handle.has_handlers())
+
+        # handler list is kept in sync with the event manager
+        key = self.machine.events.add_handler('test_handle_event', self.event_handler1)
+        self.assertTrue(handle.has_handlers())
+        self.assertIs(self.machine.events.registered_handlers['test_handle_event'], handle.handlers)
+
+        handle.post(test=1)
+        self.advance_time_and_run()
+        self.assertEqual(1, self._handler1_called)
+        self.assertEqual({"test": 1}, self._handler1_kwargs)
+
+        self.machine.events.remove_handler_by_key(key)
+        self.assertFalse(handle.has_handlers())
+        self.assertIsNone(handle.handlers)
+        handle.post()
+        self.advance_time_and_run()
+        self.assertEqual(1, self._handler1_called)
+
+        # handlers added after the handle was removed are found again
+        self.machine.events.add_handler('test_handle_event', self.event_handler_add_quick_queue)
+        handle.post_queue(callback=self.queue_callback)
+        self.advance_time_and_run()
+        self.assertEqual(1, self._queue_callback_called)
+
+        self.machine.events.add_handler('test_relay_handle', self.event_handler_relay1)
+        self.machine.events.get_event_handle('test_relay_handle').post_relay(callback=self.relay_callback,
+                                                                             relay_test=1)
+        self.advance_time_and_run()
+        self.assertEqual(1, self._relay1_called)
+        self.assertEqual(1, self._relay_callback_kwargs['relay_test'])
@@ -0,0 +1,79 @@
+import os
+import tempfile
+
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class TestFlightRecorder(MpfTestCase):
+
+    def getConfigFile(self):
+        return 'config.yaml'
+
+    def getMachinePath(self):
+        return 'tests/machine_files/flight_recorder/'
+
+    def test_ring_buffer(self):
+        recorder = self.machine.flight_recorder
+        self.assertIs(recorder, self.machine.events.flight_recorder)
+
+        for i in range(10):
+            self.post_event_with_params("test_event", index=i)
+
+        entries = recorder.get_entries()
+        self.assertEqual(5, len(entries))
+        self.assertEqual([("EVENT", "test_event", (("index", i),)) for i in range(5, 10)],
+                         [entry[1:] for entry in entries])
+
+        self.hit_switch_and_run("s_test", 1)
+        self.machine.coils["c_test"].pulse(20)
+        self.advance_time_and_run()
+
+        entries = recorder.get_entries()
+        self.assertIn(("SWITCH", "s_test", 1), [entry[1:] for entry in entries])
+        self.assertEqual(("PULSE", "c_test", 20), entries[-1][1:])
+        # entries are ordered by time
+        self.assertEqual(sorted(entry[0] for entry in entries), [entry[0] for entry in entries])
+
+    def test_snapshot_kwargs(self):
+        recorder = self.machine.flight_recorder
+        values = [1, 2]
+        self.post_event_with_params("test_event", values=values, device=self.machine.coils["c_test"],
+                                    text="x" * 1000, number=1.5, flag=True, nothing=None, big=list(range(100000)))
+        self.machine.events.post("no_kwargs")
+        values.append(3)
+
+        entries = recorder.get_entries()
+        # entries keep neither the kwargs nor the objects and do not change later
+        self.assertEqual(("EVENT", "test_event", (
+            ("values", "[1, 2]"), ("device", repr(self.machine.coils["c_test"])),
+            ("text", "x" * 1000), ("number", 1.5), ("flag", True), ("nothing", None),
+            ("big", "[0, 1, 2, 3, 4, 5, ...]"))),
+            entries[-2][1:])
+        self.assertEqual(("EVENT", "no_kwargs", ()), entries[-1][1:])
+
+        lines = recorder.format_entries()
+        self.assertIn("EVENT  test_event {'values': [1, 2], 'device': <coil.c_test>, 'text': 'xxx", lines[-2])
+        self.assertTrue(lines[-2].endswith("..."))
+        self.assertTrue(lines[-1].endswith("EVENT  no_kwargs {}"))
+
+    def test_dump(self):
+        recorder = self.machine.flight_recorder
+        self.post_event_with_params("test_event", text="x" * 1000)
+
+        with tempfile.TemporaryDirectory() as folder:
+            recorder.config['folder'] = folder
+            file_name = recorder.dump("test")
+            self.assertEqual(folder, os.path.dirname(file_name))
+            with open(file_name) as f:
+                lines = f.read().splitlines()
+
+            # dump on stop
+            recorder.config['dump_on_stop'] = True
+            recorder._shutdown()
+            self.assertEqual(2, len(os.listdir(folder)))
+
+        self.assertTrue(lines[0].startswith("# Flight recorder dump (test). 5 of "))
+        self.assertEqual(6, len(lines))
+        self.assertIn("EVENT  test_event {'text': '" + "x" * 100, lines[-1])
+        self.assertTrue(lines[-1].endswith("..."))
+        self.assertLess(len(lines[-1]), 300)
@@ -1,5 +1,8 @@
 """Test led groups."""
+from unittest.mock import patch
+
 from mpf.core.rgb_color import RGBColor
+from mpf.devices.light_group import LightGroup
 from mpf.tests.MpfTestCase import MpfTestCase
 
 
@@ -56,3 +59,78 @@ class TestLightGroups(MpfTestCase):
         # 360/0 degree
         self.assertEqual(100, self.machine.lights["ring1_light_9"].config['x'])
         self.assertEqual(53, self.machine.lights["ring1_light_9"].config['y'])
+
+    def test_bulk_color_and_remove(self):
+        stripe = self.machine.light_stripes['stripe1']
+        platform = list(self.machine.lights["stripe1_light_0"].platforms)[0]
+        controller = self.machine.light_controller
+        with patch.object(platform, "light_sync") as light_sync:
+            stripe.color("red", key="test", priority=2)
+            self.machine.light_stripes['stripe2'].color("red", key="test", priority=2)
+            stripe.color("blue", key="lower", priority=1)
+            self.assertEqual(0, light_sync.call_count)
+            self.advance_time_and_run(1)
+            # one sync for all ten lights
+            self.assertEqual(1, light_sync.call_count)
+            self.assertLightColor("stripe1_light_0", "red")
+            self.assertLightColor("stripe1_light_4", "red")
+
+            requested = controller.updates_requested
+            coalesced = controller.updates_coalesced
+            for _ in range(3):
+                stripe.remove_from_stack_by_key("test")
+                stripe.color("red", key="test", priority=2)
+            self.advance_time_and_run(1)
+            self.assertEqual(2, light_sync.call_count)
+            self.assertEqual(requested + 30, controller.updates_requested)
+            self.assertEqual(coalesced + 25, controller.updates_coalesced)
+
+            stripe.remove_from_stack_by_key("test")
+            self.advance_time_and_run(1)
+            self.assertEqual(3, light_sync.call_count)
+            self.assertLightColor("stripe1_light_0", "blue")
+            self.assertLightColor("stripe1_light_4", "blue")
+
+            stripe.remove_from_stack_by_key("unknown")
+            self.advance_time_and_run(1)
+            self.assertEqual(3, light_sync.call_count)
+
+        stripe.remove_from_stack_by_key("lower", fade_ms=1000)
+        self.advance_time_and_run(.5)
+        self.assertLightColor("stripe1_light_2", [0, 0, 128])
+        self.advance_time_and_run(1)
+        self.assertLightColor("stripe1_light_2", "off")
+        self.assertFalse(self.machine.lights["stripe1_light_2"].stack)
+
+    def test_gradient(self):
+        self.assertEqual([], LightGroup.get_gradient("red", "blue", 0))
+        self.assertEqual([RGBColor("red")], LightGroup.get_gradient("red", "blue", 1))
+
+        self.machine.light_stripes['stripe1'].gradient("red", "blue")
+        self.advance_time_and_run(1)
+        self.assertLightColor("stripe1_light_0", "red")
+        self.assertLightColor("stripe1_light_1", [192, 0, 63])
+        self.assertLightColor("stripe1_light_2", [128, 0, 127])
+        self.assertLightColor("stripe1_light_4", "blue")
+
+    def test_chase(self):
+        self.assertEqual(["a", "b", "a", "b", "a"], LightGroup.get_chase(["a", "b"], 0, 5))
+        self.assertEqual(["c", "a", "b", "c"], LightGroup.get_chase(["a", "b", "c"], 1, 4))
+        with self.assertRaises(AssertionError):
+            LightGroup.get_chase([], 0, 4)
+        with self.assertRaises(AssertionError):
+            self.machine.light_stripes['stripe1'].color_list([])
+
+        stripe = self.machine.light_stripes['stripe1']
+        stripe.chase(["red", "off", "off"], 0, key="chase")
+        self.advance_time_and_run(1)
+        self.assertLightColor("stripe1_light_0", "red")
+        self.assertLightColor("stripe1_light_3", "red")
+        self.assertLightColor("stripe1_light_1", "off")
+
+        stripe.chase(["red", "off", "off"], 1, key="chase")
+        self.advance_time_and_run(1)
+        self.assertLightColor("stripe1_light_1", "red")
+        self.assertLightColor("stripe1_light_4", "red")
+        self.assertLightColor("stripe1_light_0", "off")
+        self.assertEqual(1, len(self.machine.lights["stripe1_light_1"].stack))
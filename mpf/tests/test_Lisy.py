@@ -1,5 +1,8 @@
+import asyncio
 import time
+import unittest
 
+from mpf.platforms.lisy.lisy import LisySwitchPoller
 from mpf.tests.MpfTestCase import MpfTestCase
 from mpf.tests.loop import MockSerial, MockSocket
 
@@ -20,10 +23,22 @@ class MockLisySocket(MockSerial, MockSocket):
         return True
 
     def write(self, msg):
+        # commands may be coalesced into one write. split them by the longest known command
+        self.writes.append(msg)
+        length = len(msg)
+        while msg:
+            commands = [command for command in list(self.expected_commands) + list(self.permanent_commands)
+                        if msg.startswith(command)]
+            command = max(commands, key=len) if commands else msg
+            self._process_command(command)
+            msg = msg[len(command):]
+        return length
+
+    def _process_command(self, msg):
         if msg in self.permanent_commands and msg not in self.expected_commands:
             if self.permanent_commands[msg] is not None:
                 self.queue.append(self.permanent_commands[msg])
-            return len(msg)
+            return
 
         # print("Serial received: " + "".join("\\x%02x" % b for b in msg) + " len: " + str(len(msg)))
         if msg not in self.expected_commands:
@@ -36,7 +51,6 @@ class MockLisySocket(MockSerial, MockSocket):
             self.queue.append(self.expected_commands[msg])
 
         del self.expected_commands[msg]
-        return len(msg)
 
     def send(self, data):
         return self.write(data)
@@ -51,6 +65,7 @@ class MockLisySocket(MockSerial, MockSocket):
         self.queue = []
         self.permanent_commands = {}
         self.crashed = False
+        self.writes = []
 
 
 class TestLisy(MpfTestCase):
@@ -106,6 +121,27 @@ class TestLisy(MpfTestCase):
         self._wait_for_processing()
         self.assertFalse(self.serialMock.expected_commands)
 
+    def test_coalesced_writes(self):
+        platform = self.machine.default_platform
+        commands = [bytes([11, lamp]) for lamp in range(10)]
+        commands.append(b'\x18\x00\x0a')
+        commands.append(b'\x1e' + b'1234' + b'\x00')
+        for command in commands:
+            self.serialMock.expected_commands[command] = None
+
+        self.serialMock.writes = []
+        for lamp in range(10):
+            platform.send_byte(11, bytes([lamp]))
+        platform.send_byte(24, b'\x00\x0a')
+        platform.send_string(30, "1234")
+        self.advance_time_and_run(.001)
+
+        # one write for all commands of this loop iteration. the other writes are switch polls
+        self.assertFalse(self.serialMock.expected_commands)
+        writes = [msg.replace(b'\x29', b'') for msg in self.serialMock.writes]
+        writes = [msg for msg in writes if msg]
+        self.assertEqual([b"".join(commands)], writes)
+
     def test_platform(self):
         # wait for watchdog
         self.serialMock.expected_commands = {
@@ -326,3 +362,47 @@ class TestLisy(MpfTestCase):
         self.post_event("test_stop")
         self._wait_for_processing()
         self.assertFalse(self.serialMock.expected_commands)
+
+
+class MockLisyWriter:
+
+    """Answers every poll with the next reply from a list. 127 when the list is empty."""
+
+    def __init__(self, reader, replies):
+        self.reader = reader
+        self.replies = replies
+        self.requests = 0
+
+    def write(self, msg):
+        for command in msg:
+            assert command == 0x29
+            self.requests += 1
+            self.reader.feed_data(bytes([self.replies.pop(0) if self.replies else 127]))
+
+
+class TestLisySwitchPoller(unittest.TestCase):
+
+    def test_pipelined_poll(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        reader = asyncio.StreamReader(loop=loop)
+        changes = []
+        # burst of three changes: 37 inactive, 37 active, 77 active
+        writer = MockLisyWriter(reader, [0x25, 0xA5, 0xCD])
+        poller = LisySwitchPoller(reader, writer.write, lambda num, state: changes.append((num, state)), loop, 4, .001)
+        task = loop.create_task(poller.run())
+        loop.run_until_complete(asyncio.sleep(.01, loop=loop))
+        self.assertEqual([(37, 0), (37, 1), (77, 1)], changes)
+        self.assertEqual(3, poller.changes)
+        # four requests in flight initially and all three changes were read in one go
+        self.assertEqual(poller.polls, writer.requests)
+        # backoff while idle. much less than one poll per 62.5us
+        self.assertLess(writer.requests, 40)
+
+        writer.replies.append(0x80)
+        loop.run_until_complete(asyncio.sleep(.01, loop=loop))
+        self.assertEqual((0, 1), changes[-1])
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            loop.run_until_complete(task)
@@ -0,0 +1,82 @@
+import time
+import unittest
+
+from mpf.core.loop_monitor import LatencyHistogram
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(0, histogram.get_percentile(99))
+
+        for i in range(1, 101):
+            histogram.record(i / 1000)
+
+        self.assertEqual(100, histogram.count)
+        self.assertAlmostEqual(.0505, histogram.get_mean())
+        self.assertAlmostEqual(.1, histogram.max)
+        # buckets have a relative error of less than 7%
+        self.assertAlmostEqual(.050, histogram.get_percentile(50), delta=.050 * .07)
+        self.assertAlmostEqual(.099, histogram.get_percentile(99), delta=.099 * .07)
+        self.assertEqual(.1, histogram.get_percentile(100))
+
+        # values above the trackable range end up in the last bucket
+        histogram.record(1000)
+        self.assertEqual(1000, histogram.max)
+        self.assertEqual(1000, histogram.get_percentile(100))
+
+        summary = histogram.get_summary()
+        self.assertEqual(101, summary["count"])
+        self.assertEqual(1000000, summary["max"])
+
+        histogram.reset()
+        self.assertEqual(0, histogram.count)
+        self.assertEqual(0, histogram.max)
+
+    def test_bucket_boundaries(self):
+        for value in (0, 1, 31, 32, 33, 63, 64, 1000, 123456, 59999999):
+            index = LatencyHistogram._index_for(value)
+            self.assertLessEqual(value, LatencyHistogram._highest_value_for(index))
+            if index:
+                self.assertGreater(value, LatencyHistogram._highest_value_for(index - 1))
+
+
+class TestLoopMonitor(MpfTestCase):
+
+    def getConfigFile(self):
+        return 'config.yaml'
+
+    def getMachinePath(self):
+        return 'tests/machine_files/loop_monitor/'
+
+    def _slow_callback(self):
+        time.sleep(.01)
+
+    def test_lag_and_slow_callbacks(self):
+        monitor = self.machine.loop_monitor
+        monitor.reset()
+        self.advance_time_and_run(1)
+        self.assertEqual(10, monitor.lag_histogram.count)
+        self.assertGreater(monitor.callback_histogram.count, 10)
+
+        self.machine.clock.schedule_once(self._slow_callback, .5)
+        self.advance_time_and_run(1)
+
+        slowest = {entry["name"]: entry for entry in monitor.get_slowest_callbacks()}
+        self.assertIn("TestLoopMonitor._slow_callback", slowest)
+        self.assertEqual(1, slowest["TestLoopMonitor._slow_callback"]["count"])
+        self.assertGreaterEqual(slowest["TestLoopMonitor._slow_callback"]["max"], 10)
+
+        status = monitor.get_status()
+        self.assertEqual(20, status["lag"]["count"])
+        self.assertEqual(monitor.get_slowest_callbacks(), status["slowest_callbacks"])
+
+    def test_stop_restores_loop(self):
+        import asyncio
+        from mpf.core import loop_monitor
+        self.assertIs(asyncio.events.Handle._run, loop_monitor._profiled_handle_run)
+        self.machine.loop_monitor.stop()
+        self.assertIsNone(loop_monitor._ORIGINAL_HANDLE_RUN)
+        self.assertIsNot(asyncio.events.Handle._run, loop_monitor._profiled_handle_run)
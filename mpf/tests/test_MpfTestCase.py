@@ -1,5 +1,8 @@
+import asyncio
+import unittest
 from unittest.mock import MagicMock
 from mpf.tests.MpfTestCase import MpfTestCase
+from mpf.tests.snapshot import MachineSnapshot, snapshots_supported
 
 
 class TestMpfTestCase(MpfTestCase):
@@ -97,3 +100,80 @@ class TestMpfTestCase(MpfTestCase):
     def _callback(self, _id):
         # print(self.id_list)
         self.id_list.append((_id, self.machine.clock.get_time()))
+
+
+class TestMachineSnapshots(unittest.TestCase):
+
+    @unittest.skipUnless(snapshots_supported(), "Platform cannot fork")
+    def test_snapshot(self):
+        class SnapshotTest(MpfTestCase):
+            use_machine_snapshot = True
+            boots = 0
+
+            def getConfigFile(self):
+                return 'test_mpftestcase.yaml'
+
+            def getMachinePath(self):
+                return 'tests/machine_files/mpftestcase/'
+
+            def setUp(self):
+                SnapshotTest.boots += 1
+                super().setUp()
+
+            def test_change_machine(self):
+                self.machine.set_machine_var("test", 1)
+                self.assertEqual(1, self.machine.get_machine_var("test"))
+
+            def test_machine_is_fresh(self):
+                self.assertIsNone(self.machine.get_machine_var("test"))
+                self.machine.set_machine_var("test", 2)
+
+            def test_fail(self):
+                self.assertEqual(1, 2)
+
+            def test_error(self):
+                raise KeyError("test")
+
+        suite = unittest.TestSuite()
+        for name in ("test_change_machine", "test_machine_is_fresh", "test_fail", "test_error",
+                     "test_machine_is_fresh"):
+            suite.addTest(SnapshotTest(name))
+
+        result = unittest.TestResult()
+        suite.run(result)
+        MachineSnapshot.stop_current()
+
+        # the machine is booted once in the runner
+        self.assertEqual(1, SnapshotTest.boots)
+        self.assertEqual(5, result.testsRun)
+        self.assertEqual(1, len(result.failures))
+        self.assertEqual("test_fail", result.failures[0][0]._testMethodName)
+        self.assertIn("AssertionError: 1 != 2", result.failures[0][1])
+        self.assertEqual(1, len(result.errors))
+        self.assertEqual("test_error", result.errors[0][0]._testMethodName)
+        self.assertIn("KeyError", result.errors[0][1])
+
+    def test_discard_snapshot_which_cannot_stop(self):
+        class SnapshotTest(MpfTestCase):
+            use_machine_snapshot = True
+
+            def getConfigFile(self):
+                return 'test_mpftestcase.yaml'
+
+            def getMachinePath(self):
+                return 'tests/machine_files/mpftestcase/'
+
+            def test_nothing(self):
+                pass
+
+        test = SnapshotTest("test_nothing")
+        snapshot = MachineSnapshot("key", test)
+        loop = test.loop
+        task = loop.create_task(asyncio.Event(loop=loop).wait())
+        # mocked hardware which does not expect the shutdown
+        test.machine._do_stop = MagicMock(side_effect=AssertionError("Unexpected shutdown"))
+
+        snapshot.stop()
+        self.assertTrue(task.cancelled())
+        self.assertTrue(loop.is_closed())
+        self.assertIsNone(test.machine)
@@ -1,5 +1,6 @@
 from mpf.tests.MpfTestCase import MpfTestCase
 from unittest.mock import MagicMock, call
+from mpf.core.platform_service import PlatformService
 from mpf.platforms import p_roc_common, p_roc
 
 
@@ -295,6 +296,34 @@ class TestPRoc(MpfTestCase):
         self.advance_time_and_run(.01)
         self.assertFalse(self.machine.switch_controller.is_active("s_test_no_debounce"))
 
+        # one batch. both edges of the debounced s_test are processed. s_test_no_debounce ends up active
+        s_test_active = MagicMock()
+        self.machine.switch_controller.add_switch_handler("s_test", s_test_active)
+        self.machine.default_platform.proc.get_events = MagicMock(return_value=[])
+        self.advance_time_and_run(.01)
+        self.machine.default_platform.proc.get_events = MagicMock(return_value=[
+            {'type': 1, 'value': 23}, {'type': 3, 'value': 24}, {'type': 4, 'value': 24}, {'type': 2, 'value': 23},
+            {'type': 3, 'value': 24}])
+        bounces_dropped = self.machine.switch_controller.bounces_dropped
+        self.assertTrue(self.machine.default_platform.tick())
+        self.machine.default_platform.proc.get_events = MagicMock(return_value=[])
+        self.advance_time_and_run(.01)
+        self.assertFalse(self.machine.switch_controller.is_active("s_test"))
+        self.assertTrue(self.machine.switch_controller.is_active("s_test_no_debounce"))
+        s_test_active.assert_called_once_with()
+        self.assertEqual(bounces_dropped, self.machine.switch_controller.bounces_dropped)
+
+        # s_test_no_debounce bounces and is dropped
+        self.machine.default_platform.proc.get_events = MagicMock(return_value=[
+            {'type': 4, 'value': 24}, {'type': 3, 'value': 24}])
+        self.advance_time_and_run(.01)
+        self.assertTrue(self.machine.switch_controller.is_active("s_test_no_debounce"))
+        self.assertEqual(bounces_dropped + 2, self.machine.switch_controller.bounces_dropped)
+
+        self.machine.default_platform.proc.get_events = MagicMock(return_value=[{'type': 4, 'value': 24}])
+        self.advance_time_and_run(.01)
+        self.assertFalse(self.machine.switch_controller.is_active("s_test_no_debounce"))
+
     def _test_dmd_update(self):
         # test configure
         self.machine.default_platform.configure_dmd()
@@ -424,6 +453,51 @@ class TestPRoc(MpfTestCase):
         device.hw_drivers["white"][0].driver.hw_driver.proc.driver_disable.assert_has_calls([
             call(num)])
 
+    def test_service_idle_and_switch_storm(self):
+        platform = self.machine.default_platform
+        # service at 1kHz like on a real machine
+        for service in self.machine.platform_services:
+            service.stop()
+        self.machine.config['mpf']['default_platform_hz'] = 1000
+        service = PlatformService(platform, self.machine.clock.loop)
+        self.machine.platform_services = [service]
+        service.start()
+
+        # idle: back off to idle_service_interval (5ms). watchdog every 250ms. flush stays at 1kHz
+        platform.proc.get_events = MagicMock(return_value=[])
+        platform.proc.watchdog_tickle = MagicMock()
+        platform.proc.flush = MagicMock()
+        self.advance_time_and_run(1)
+        platform.proc.get_events.reset_mock()
+        platform.proc.watchdog_tickle.reset_mock()
+        platform.proc.flush.reset_mock()
+        self.advance_time_and_run(1)
+        self.assertAlmostEqual(200, platform.proc.get_events.call_count, delta=5)
+        self.assertEqual(4, platform.proc.watchdog_tickle.call_count)
+        self.assertAlmostEqual(1000, platform.proc.flush.call_count, delta=10)
+
+        # a command queued while idle is flushed within 1ms
+        platform.proc.flush.reset_mock()
+        self.machine.coils.c_test.pulse()
+        self.advance_time_and_run(.001)
+        self.assertTrue(platform.proc.flush.called)
+
+        # switch storm: every call returns a switch change. service at 1kHz
+        changes = [{'type': 1, 'value': 23}, {'type': 2, 'value': 23}]
+        platform.proc.get_events = MagicMock(side_effect=lambda: [changes[platform.proc.get_events.call_count % 2]])
+        platform.proc.watchdog_tickle.reset_mock()
+        self.advance_time_and_run(1)
+        self.assertAlmostEqual(1000, platform.proc.get_events.call_count, delta=10)
+        self.assertEqual(4, platform.proc.watchdog_tickle.call_count)
+        self.assertSwitchState("s_test", not platform.proc.get_events.call_count % 2)
+
+        # back to idle
+        platform.proc.get_events = MagicMock(return_value=[])
+        self.advance_time_and_run(1)
+        platform.proc.get_events.reset_mock()
+        self.advance_time_and_run(1)
+        self.assertAlmostEqual(200, platform.proc.get_events.call_count, delta=5)
+
     def test_load_wpc(self):
         # make sure p-roc properly initialises with WPC config
         pass
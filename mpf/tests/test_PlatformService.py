@@ -0,0 +1,58 @@
+"""Test platform servicing."""
+import asyncio
+import socket
+import unittest
+
+from mpf.core.platform import ServiceSettings
+from mpf.core.platform_service import PlatformService
+
+
+class ReadinessPlatform:
+
+    """Platform which reads from a socket when serviced."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.received = []
+
+    def get_service_settings(self):
+        return ServiceSettings(min_interval=.001, max_interval=10, watchdog_interval=None,
+                               flush_interval=None, readiness_fd=self.sock.fileno())
+
+    def tick(self):
+        try:
+            data = self.sock.recv(100)
+        except BlockingIOError:
+            return False
+        self.received.append(data)
+        return True
+
+
+class TestPlatformService(unittest.TestCase):
+
+    def test_readiness_fd(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        platform_socket, hardware_socket = socket.socketpair()
+        self.addCleanup(platform_socket.close)
+        self.addCleanup(hardware_socket.close)
+        platform_socket.setblocking(False)
+        platform = ReadinessPlatform(platform_socket)
+        service = PlatformService(platform, loop)
+        service.start()
+
+        # idle platform backs off to max_interval
+        loop.run_until_complete(asyncio.sleep(.1, loop=loop))
+        ticks = service.ticks
+        self.assertLess(ticks, 10)
+
+        # serviced as soon as data arrives even though the next tick is 10s away
+        hardware_socket.send(b"switch")
+        loop.run_until_complete(asyncio.sleep(.05, loop=loop))
+        self.assertEqual([b"switch"], platform.received)
+        self.assertGreater(service.busy_ticks, 0)
+
+        service.stop()
+        hardware_socket.send(b"ignored")
+        loop.run_until_complete(asyncio.sleep(.05, loop=loop))
+        self.assertEqual([b"switch"], platform.received)
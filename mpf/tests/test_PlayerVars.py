@@ -30,6 +30,73 @@ class TestPlayerVars(MpfGameTestCase):
         self.machine.game.player.test = 7
         self.assertEqual(7, self.machine.game.player.test)
         self.assertEqual(7, self.machine.game.player.vars["test"])
+        # dict storage is the default
+        self.assertIs(dict, type(self.machine.game.player.vars))
 
         self.assertEqual(4, self.machine.get_machine_var("test1"))
         self.assertEqual('5', self.machine.get_machine_var("test2"))
+
+
+class TestPlayerVarsCoalesced(MpfGameTestCase):
+
+    def getConfigFile(self):
+        return 'player_vars.yaml'
+
+    def getMachinePath(self):
+        return 'tests/machine_files/player_vars/'
+
+    def __init__(self, methodName):
+        super().__init__(methodName)
+        self.machine_config_patches['game'] = {"player_var_events": "coalesce", "player_var_storage": "slots"}
+
+    def test_coalesced_events(self):
+        self.fill_troughs()
+        self.start_two_player_game()
+        self.advance_time_and_run()
+
+        self.mock_event("player_score")
+        self.mock_event("player_some_var")
+        self.mock_event("player_new_var")
+
+        self.machine.game.player.score += 100
+        self.machine.game.player.score += 200
+        self.machine.game.player.score += 300
+        self.machine.game.player.some_var = 5
+        self.machine.game.player.some_var = 4
+        self.machine.game.player.new_var = 0
+        self.advance_time_and_run()
+
+        # one event with the net change
+        self.assertEventCalledWith("player_score", value=600, prev_value=0, change=600, player_num=1)
+        self.assertEqual(1, self._events["player_score"])
+
+        # no net change
+        self.assertEventNotCalled("player_some_var")
+
+        # new variables are always announced
+        self.assertEventCalledWith("player_new_var", value=0, prev_value=0, change=0, player_num=1)
+
+    def test_slot_storage(self):
+        self.fill_troughs()
+        self.start_two_player_game()
+
+        player = self.machine.game.player
+        self.assertEqual(4, player.some_var)
+        self.assertEqual('hello', player.some_other_string)
+        self.assertTrue(player.is_player_var("some_float"))
+        self.assertFalse(player.is_player_var("other_var"))
+
+        player.other_var = 7
+        self.assertEqual(7, player.vars["other_var"])
+        self.assertIn(("score", 0), list(player))
+        self.assertIn(("other_var", 7), list(player))
+
+        # the slot layout is shared between players
+        # pylint: disable-msg=protected-access
+        layout = player.vars._slots
+        self.assertIs(layout, self.machine.game.player_list[1].vars._slots)
+
+        # and between games of this machine
+        self.stop_game()
+        self.start_game()
+        self.assertIs(layout, self.machine.game.player.vars._slots)
@@ -0,0 +1,103 @@
+"""Test pulse scheduling on power supplies."""
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class TestPowerSupplyUnit(MpfTestCase):
+
+    def getConfigFile(self):
+        return 'config.yaml'
+
+    def getMachinePath(self):
+        return 'tests/machine_files/psu/'
+
+    def setUp(self):
+        super().setUp()
+        self.pulses = []
+        for coil in self.machine.coils:
+            coil.hw_driver.pulse = self._record_pulse(coil)
+
+    def _record_pulse(self, coil):
+        def pulse(pulse_settings):
+            self.pulses.append((round(self.machine.clock.get_time() - self.start, 3), coil.name,
+                                pulse_settings.duration))
+        return pulse
+
+    def _start(self):
+        self.pulses = []
+        self.start = self.machine.clock.get_time()
+
+    def test_serialised_without_budget(self):
+        self._start()
+        waits = [self.machine.coils["serial_{}".format(i)].pulse(max_wait_ms=100) for i in range(1, 4)]
+        self.assertEqual([0, 30, 60], [round(wait) for wait in waits])
+        self.assertEqual([(0, "serial_1", 20)], self.pulses)
+
+        self.advance_time_and_run(.1)
+        self.assertEqual([(0, "serial_1", 20), (.03, "serial_2", 20), (.06, "serial_3", 20)], self.pulses)
+
+        # without max_wait_ms pulses fire immediately
+        self._start()
+        self.machine.coils.serial_1.pulse()
+        self.machine.coils.serial_2.pulse()
+        self.assertEqual([(0, "serial_1", 20), (0, "serial_2", 20)], self.pulses)
+
+    def test_current_budget(self):
+        psu = self.machine.psus.budget
+        self._start()
+        waits = [self.machine.coils["reset_{}".format(i)].pulse(max_wait_ms=100) for i in range(1, 6)]
+        # three coils with 3A fit into 10A. the others wait until they released
+        self.assertEqual([0, 0, 0, 40, 40], [round(wait) for wait in waits])
+        self.assertEqual(2, psu.scheduler.get_pending_count())
+
+        self.advance_time_and_run(.039)
+        self.assertEqual(3, len(self.pulses))
+        self.advance_time_and_run(.002)
+        self.assertEqual([(.04, "reset_4", 30), (.04, "reset_5", 30)], self.pulses[3:])
+        self.assertEqual(0, psu.scheduler.get_pending_count())
+
+        # the other psu is not affected
+        self.machine.coils.serial_1.pulse(max_wait_ms=100)
+        self.assertEqual((.041, "serial_1", 20), self.pulses[-1])
+
+    def test_throughput(self):
+        psu = self.machine.psus.budget
+        self._start()
+        waits = []
+        for _ in range(4):
+            for i in range(1, 6):
+                waits.append(self.machine.coils["reset_{}".format(i)].pulse(max_wait_ms=1000))
+
+        self.advance_time_and_run(1)
+        self.assertEqual(20, len(self.pulses))
+
+        # three pulses fire every 40ms
+        starts = [pulse[0] for pulse in self.pulses]
+        self.assertEqual(sorted(starts), starts)
+        self.assertEqual([0.0] * 3 + [.04] * 3 + [.08] * 3 + [.12] * 3 + [.16] * 3 + [.2] * 3 + [.24] * 2, starts)
+
+        # current never exceeds the budget
+        for start in starts:
+            active = [pulse for pulse in self.pulses if pulse[0] <= start < round(pulse[0] + .04, 3)]
+            self.assertLessEqual(len(active) * 3, 10)
+
+        self.assertEqual(240, round(max(waits)))
+        self.assertEqual(240, round(psu.scheduler.max_wait_ms))
+        self.assertEqual(17, psu.scheduler.delayed_pulses)
+        self.assertEqual(0, psu.scheduler.forced_pulses)
+
+    def test_worst_case_wait(self):
+        psu = self.machine.psus.budget
+        self._start()
+        for i in range(1, 4):
+            self.machine.coils["reset_{}".format(i)].pulse(max_wait_ms=100)
+
+        # kickback needs 8A and would wait 40ms. it never waits longer than max_wait_ms
+        self.assertEqual(0, self.machine.coils.kickback.pulse(max_wait_ms=20))
+        self.assertEqual((0, "kickback", 40), self.pulses[-1])
+        self.assertEqual(1, psu.scheduler.forced_pulses)
+
+        # a coil without psu_amps uses the whole budget and waits until the kickback released
+        self.assertEqual(50, round(self.machine.coils.sling.pulse(max_wait_ms=100)))
+        self.advance_time_and_run(.1)
+        self.assertEqual((.05, "sling", 10), self.pulses[-1])
+        self.assertLessEqual(psu.scheduler.max_wait_ms, 100)
@@ -127,6 +127,23 @@ class TestRGBColor(unittest.TestCase):
         corrected_color = default_profile.apply(RGBColor((254, 254, 254)))
         self.assertEqual((252, 252, 252), corrected_color.rgb)
 
+    def test_color_correction_brightness_tables(self):
+        profile = RGBColorCorrectionProfile.default()
+        tables = profile.get_brightness_tables(1.0)
+        self.assertIs(tables, profile.get_brightness_tables(1.0))
+        self.assertEqual(81 / 255.0, tables[0][169])
+        self.assertEqual(1.0, tables[2][255])
+
+        # tables are rebuilt when brightness changes
+        tables = profile.get_brightness_tables(0.5)
+        self.assertEqual(profile.apply(RGBColor((84, 84, 84))).red / 255.0, tables[0][169])
+
+        # and when the profile changes
+        profile.generate_from_parameters()
+        self.assertIsNot(tables, profile.get_brightness_tables(0.5))
+        self.assertEqual(profile.apply(RGBColor((84, 84, 84))).red / 255.0,
+                         profile.get_brightness_tables(0.5)[0][169])
+
     def test_init_and_equal(self):
         black = RGBColor("black")
         color = RGBColor([1, 2, 3])
@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock
+
 from mpf.tests.MpfFakeGameTestCase import MpfFakeGameTestCase
 
 
@@ -238,3 +240,70 @@ class TestSegmentDisplay(MpfFakeGameTestCase):
         self.advance_time_and_run(.01)
         self.assertEqual("42", display1.hw_display.text)
         self.assertEqual("0", display2.hw_display.text)
+
+    def test_text_stack(self):
+        display1 = self.machine.segment_displays.display1
+        display1.add_text("LOW", 5, "low")
+        display1.add_text("HIGH", 10, "high")
+        # same priority goes behind existing entries
+        display1.add_text("SAME", 10, "same")
+        self.assertEqual("HIGH", display1.hw_display.text)
+
+        display1.remove_text_by_key("high")
+        self.assertEqual("SAME", display1.hw_display.text)
+        display1.remove_text_by_key("same")
+        self.assertEqual("LOW", display1.hw_display.text)
+
+        # replacing the top entry with the same text keeps the template and its subscription
+        template = display1._current_placeholder
+        future = display1._current_future
+        display1.add_text("LOW", 5, "low")
+        display1.add_text("LOW", 3, "low2")
+        display1.remove_text_by_key("low")
+        self.assertIs(template, display1._current_placeholder)
+        self.assertIs(future, display1._current_future)
+
+        # templates are cached by text
+        display1.add_text("HIGH", 10, "high")
+        display1.remove_text_by_key("high")
+        display1.add_text("HIGH", 10, "high")
+        self.assertIs(display1._templates["HIGH"], display1._current_placeholder)
+
+        display1.remove_text_by_key("high")
+        display1.remove_text_by_key("low2")
+        self.assertEqual("", display1.hw_display.text)
+        self.assertIsNone(display1._current_future)
+
+    def test_reevaluate_on_change(self):
+        display1 = self.machine.segment_displays.display1
+        self.start_game()
+        display1.add_text("{current_player.score:d}", 50, "score")
+        self.advance_time_and_run()
+        self.assertEqual("0", display1.hw_display.text)
+
+        template = display1._current_placeholder
+        template.evaluate_and_subscribe = MagicMock(wraps=template.evaluate_and_subscribe)
+
+        # lower priority texts and unrelated variables do not cause an evaluation
+        display1.add_text("LOW", -1, "low")
+        self.machine.set_machine_var("test", 42)
+        self.advance_time_and_run()
+        self.assertEqual(0, template.evaluate_and_subscribe.call_count)
+
+        handlers = len(self.machine.events.registered_handlers["player_score"])
+        turn_handlers = len(self.machine.events.registered_handlers["player_turn_started"])
+        for _ in range(10):
+            self.machine.game.player.score += 10
+            self.advance_time_and_run(.01)
+        self.assertEqual("100", display1.hw_display.text)
+        self.assertEqual(10, template.evaluate_and_subscribe.call_count)
+        # subscriptions do not pile up
+        self.assertEqual(handlers, len(self.machine.events.registered_handlers["player_score"]))
+        self.assertEqual(turn_handlers, len(self.machine.events.registered_handlers["player_turn_started"]))
+
+        # a higher text replaces the subscription
+        display1.add_text("TOP", 100, "top")
+        self.machine.game.player.score += 10
+        self.advance_time_and_run(.01)
+        self.assertEqual("TOP", display1.hw_display.text)
+        self.assertEqual(10, template.evaluate_and_subscribe.call_count)
@@ -1,6 +1,7 @@
 import sys
 
 from mpf.tests.MpfBcpTestCase import MpfBcpTestCase
+from mpf.commands.profile import run_profiler_command
 from mpf.commands.service import ServiceCli
 from unittest.mock import create_autospec
 
@@ -142,3 +143,26 @@ class TestServiceCli(MpfBcpTestCase):
 
         self.assertLightColor("l_light1", "black")
         self.assertLightColor("l_light5", "black")
+
+    def test_profiler(self):
+        output = run_profiler_command(self._bcp_external_client, self.loop, "dump")
+        self.assertEqual("Handler profiling is disabled. Run 'mpf profile start' first.\n", output)
+
+        run_profiler_command(self._bcp_external_client, self.loop, "start")
+        self.assertIsNotNone(self.machine.events.profiler)
+
+        self.machine.events.add_handler("test_event", self._handler)
+        self.post_event("test_event")
+        output = run_profiler_command(self._bcp_external_client, self.loop, "dump", count=1, sort_by="count")
+        self.assertIn("test_event", output)
+        self.assertIn("TestServiceCli._handler", output)
+        self.assertEqual(5, len(output.splitlines()))
+
+        output = run_profiler_command(self._bcp_external_client, self.loop, "reset")
+        self.assertNotIn("test_event", output)
+
+        run_profiler_command(self._bcp_external_client, self.loop, "stop")
+        self.assertIsNone(self.machine.events.profiler)
+
+    def _handler(self, **kwargs):
+        del kwargs
@@ -0,0 +1,56 @@
+from mpf.commands.simulate import SoakSimulator
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class TestSimulate(MpfTestCase):
+
+    def getConfigFile(self):
+        return 'config.yaml'
+
+    def getMachinePath(self):
+        return 'tests/machine_files/simulate/'
+
+    def get_platform(self):
+        return 'smart_virtual'
+
+    def setUp(self):
+        self.machine_config_patches['mpf']['plugins'] = ['mpf.plugins.switch_player.SwitchPlayer']
+        super().setUp()
+
+    def test_soak(self):
+        reports = []
+        simulator = SoakSimulator(self.machine, games=3, seed=1, min_ball_time=5, max_ball_time=10,
+                                  progress_callback=lambda sim: reports.append(sim.get_report()))
+        simulator.start()
+
+        for _ in range(600):
+            if simulator.done.done():
+                break
+            self.advance_time_and_run(1)
+
+        self.assertTrue(simulator.done.done())
+        self.assertIsNone(simulator.done.exception())
+        self.assertEqual(3, simulator.games_started)
+        self.assertEqual(3, simulator.games_ended)
+        self.assertEqual(9, simulator.balls_drained)
+        self.assertEqual([1, 2, 3], [report["games"] for report in reports])
+        self.assertGreater(self.machine.plugins[0].random_hits, 0)
+
+        report = simulator.get_report()
+        self.assertGreater(report["simulated_seconds"], 45)
+        self.assertGreater(report["events"], 0)
+        self.assertIn("Games: 3", SoakSimulator.format_report(report))
+
+        # no more games are started
+        self.advance_time_and_run(30)
+        self.assertIsNone(self.machine.game)
+        self.assertEqual(3, simulator.games_started)
+
+    def test_stuck_game(self):
+        simulator = SoakSimulator(self.machine, games=1, seed=1, min_ball_time=5000, max_ball_time=5000,
+                                  max_game_time=100)
+        simulator.start()
+        self.advance_time_and_run(120)
+
+        self.assertTrue(simulator.done.done())
+        self.assertIsInstance(simulator.done.exception(), AssertionError)
@@ -50,6 +50,44 @@ class TestSwitchController(MpfTestCase):
         self.hit_switch_and_run("s_test", 1)
         monitor.assert_not_called()
 
+    def test_process_switch_changes(self):
+        monitor = MagicMock()
+        self.machine.switch_controller.add_monitor(monitor)
+        platform = self.machine.default_platform
+        invert_hw_state = self.machine.switches.s_test_invert.hw_state
+
+        # s_test and s_test_invert bounce back to their old state and s_test_events is hit
+        self.machine.switch_controller.process_switch_changes(
+            [("1", 1, False), ("2", 1, False), ("1", 0, False), ("4", invert_hw_state ^ 1, False),
+             ("4", invert_hw_state, False), ("123123123", 1, False)],
+            platform)
+        self.advance_time_and_run(.1)
+
+        self.assertSwitchState("s_test", 0)
+        self.assertSwitchState("s_test_events", 1)
+        self.assertSwitchState("s_test_invert", 0)
+        self.assertEqual(4, self.machine.switch_controller.bounces_dropped)
+        # handlers only ran for switches which changed
+        self.assertEqual(["s_test_events", "123123123"], [change[0][0].name for change in monitor.call_args_list])
+
+        # final state is processed once
+        self.machine.switch_controller.process_switch_changes([("1", 1, False), ("1", 0, False), ("1", 1, False)],
+                                                              platform)
+        self.advance_time_and_run(.1)
+        self.assertSwitchState("s_test", 1)
+        self.assertEqual(4, self.machine.switch_controller.bounces_dropped)
+
+        # every edge of a debounced switch is processed
+        monitor.reset_mock()
+        self.machine.switch_controller.process_switch_changes([("1", 0, True), ("1", 1, True), ("2", 0, False)],
+                                                              platform)
+        self.advance_time_and_run(.1)
+        self.assertSwitchState("s_test", 1)
+        self.assertSwitchState("s_test_events", 0)
+        self.assertEqual(4, self.machine.switch_controller.bounces_dropped)
+        self.assertEqual([("s_test", 0), ("s_test", 1), ("s_test_events", 0)],
+                         [(change[0][0].name, change[0][0].state) for change in monitor.call_args_list])
+
     def test_wait_futures(self):
         self.hit_switch_and_run("s_test", 1)
         future = self.machine.switch_controller.wait_for_switch("s_test")
@@ -266,3 +304,18 @@ class TestSwitchController(MpfTestCase):
 
         self.advance_time_and_run(5)
         self.assertEqual(1, self.called2)
+
+    def test_handler_profiling(self):
+        self.machine.events.enable_profiling()
+        callback = MagicMock()
+        callback.__qualname__ = "callback"
+        timed_callback = MagicMock()
+        timed_callback.__qualname__ = "timed_callback"
+        self.machine.switch_controller.add_switch_handler("s_test", callback)
+        self.machine.switch_controller.add_switch_handler("s_test", timed_callback, ms=100)
+
+        self.hit_switch_and_run("s_test", 1)
+        self.assertTrue(callback.called)
+        self.assertTrue(timed_callback.called)
+        self.assertEqual(1, self.machine.events.profiler.stats[("switch:s_test-1", "callback")][0])
+        self.assertEqual(1, self.machine.events.profiler.stats[("switch:s_test-1-100ms", "timed_callback")][0])
@@ -1,24 +1,9 @@
 """Run regression tests."""
 import os
 import sys
-import unittest
 
-from mpf.tests.MpfDocTestCase import MpfDocTestCase
+from mpf.commands.test import run_tests
 
-tests = []
-for subdir, dirs, files in os.walk(os.path.join(os.path.dirname(__file__), "mpf", "tests", "regression_tests")):
-    for file in files:
-        full_path = os.path.join(subdir, file)
-        with open(full_path) as f:
-            config_string = f.read()
-        testcase = MpfDocTestCase(config_string)
-        testcase._testMethodDoc = full_path
-        tests.append(testcase)
-
-suite = unittest.TestSuite()
-suite.addTests(tests)
-result = unittest.TextTestRunner(verbosity=1).run(suite)
-if result.wasSuccessful():
-    sys.exit(0)
-else:
-    sys.exit(1)
+# every file in regression_tests (and its subfolders) is a doc test. they run on one worker per CPU
+sys.exit(not run_tests([os.path.join(os.path.dirname(os.path.abspath(__file__)), "mpf", "tests", "regression_tests")],
+                       jobs=0, doc_pattern="*"))
@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""Benchmark loading mode assets by load key.
+
+Creates many assets spread over many modes and starts every mode once. The
+legacy scan (compare the load key of every asset of every asset class) is
+compared to the load key index of the asset manager. Loading itself is
+replaced by a counter so only the lookup is measured.
+"""
+import argparse
+import time
+
+from mpf.core.assets import AssetClass, BaseAssetManager
+
+
+class FakeAsset:
+
+    """Asset with a config which counts loads."""
+
+    __slots__ = ["name", "config", "loads"]
+
+    def __init__(self, name, load_key):
+        """Initialise unloaded asset."""
+        self.name = name
+        self.config = {'load': load_key, 'priority': 0}
+        self.loads = 0
+
+    def load(self, priority=None):
+        """Count load."""
+        del priority
+        self.loads += 1
+
+
+class FakeMachine:
+
+    """Machine with asset dicts."""
+
+    def __init__(self):
+        """Initialise empty asset dicts."""
+        self.images = dict()
+        self.sounds = dict()
+
+
+class BenchmarkAssetManager(BaseAssetManager):
+
+    """Asset manager without boot handling."""
+
+    def __init__(self, machine):    # pylint: disable-msg=super-init-not-called
+        """Initialise with two asset classes."""
+        self.machine = machine
+        self._assets_by_load_key = dict()
+        self._asset_classes = [AssetClass(attribute=attribute, cls=FakeAsset, path_string=attribute,
+                                          config_section=attribute, disk_asset_section=attribute,
+                                          extensions=[], priority=0, pool_config_section=None, defaults={})
+                               for attribute in ("images", "sounds")]
+
+    def legacy_load_assets_by_load_key(self, key_name, priority=0):
+        """Find assets with a linear scan like before the index."""
+        assets = set()
+        for ac in self._asset_classes:
+            asset_objects = getattr(self.machine, ac.attribute).values()
+            for asset in [x for x in asset_objects if
+                          x.config['load'] == key_name]:
+                asset.load(priority=priority + asset.config['priority'])
+                assets.add(asset)
+
+        return assets
+
+
+def create_manager(asset_count, mode_count):
+    """Create assets. Half of them are machine-wide. The rest is spread over the modes."""
+    manager = BenchmarkAssetManager(FakeMachine())
+    for number in range(asset_count):
+        attribute = "images" if number % 2 else "sounds"
+        if number < asset_count // 2:
+            load_key = "preload" if number % 4 else "on_demand"
+        else:
+            load_key = "mode{}_start".format(number % mode_count)
+        name = "asset{}".format(number)
+        manager.add_asset(attribute, name, FakeAsset(name, load_key))
+    return manager
+
+
+def run(manager, mode_count, legacy, repeat):
+    """Start every mode and return the best time and the number of loaded assets."""
+    load = manager.legacy_load_assets_by_load_key if legacy else manager.load_assets_by_load_key
+    best = None
+    loaded = 0
+    for _ in range(repeat):
+        loaded = 0
+        start = time.perf_counter()
+        for mode in range(mode_count):
+            loaded += len(load("mode{}_start".format(mode), priority=100))
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best, loaded
+
+
+def main():
+    """Run benchmark for the legacy scan and the load key index."""
+    parser = argparse.ArgumentParser(description='Benchmarks loading mode assets by load key')
+    parser.add_argument("--assets", type=int, default=20000, help="Number of assets. Default is 20000")
+    parser.add_argument("--modes", type=int, default=100, help="Number of modes. Default is 100")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant. Best is reported. Default is 3")
+    args = parser.parse_args()
+
+    manager = create_manager(args.assets, args.modes)
+    for name, legacy in (("legacy scan", True), ("load key index", False)):
+        duration, loaded = run(manager, args.modes, legacy, args.repeat)
+        print("{}:".format(name))
+        print("  {:.2f}ms for {} mode starts ({:.1f}us/mode start)".format(
+            duration * 1000, args.modes, duration / args.modes * 1000000))
+        print("  assets loaded: {}".format(loaded))
+
+
+if __name__ == '__main__':
+    main()
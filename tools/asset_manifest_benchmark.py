@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""Benchmark scanning asset folders with and without a manifest.
+
+Creates many files in many folders for five asset classes in a temp folder.
+A cold scan (no manifest, every directory is listed) is compared to a warm
+scan which loads the manifest and only stats unchanged directories.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from mpf.core.asset_manifest import AssetDirectoryScanner
+
+ASSET_CLASSES = ["images", "sounds", "videos", "shows", "fonts"]
+
+
+def create_tree(root, folders, files_per_folder):
+    """Create folders with empty files for every asset class and return the roots."""
+    roots = []
+    for asset_class in ASSET_CLASSES:
+        asset_root = os.path.join(root, asset_class)
+        for number in range(folders):
+            path = os.path.join(asset_root, "group{}".format(number // 10), "sub{}".format(number % 10))
+            os.makedirs(path, exist_ok=True)
+            for i in range(files_per_folder):
+                open(os.path.join(path, "asset{}.dat".format(i)), 'w').close()
+
+        # make every directory older than the racy window
+        past = time.time() - 100
+        for path, _, _ in os.walk(asset_root):
+            os.utime(path, (past, past))
+        roots.append(asset_root)
+    return roots
+
+
+def scan(manifest_file, roots, load):
+    """Scan all roots and store the manifest. Return time, files and the scanner."""
+    start = time.perf_counter()
+    scanner = AssetDirectoryScanner(manifest_file)
+    if load:
+        scanner.load()
+    listings = scanner.scan_all(roots)
+    scanner.save()
+    duration = time.perf_counter() - start
+    return duration, sum(len(files) for listing in listings.values() for _, _, files in listing), scanner
+
+
+def main():
+    """Run benchmark for a cold and a warm scan."""
+    parser = argparse.ArgumentParser(description='Benchmarks scanning asset folders with a manifest')
+    parser.add_argument("--folders", type=int, default=100,
+                        help="Leaf folders per asset class. Default is 100")
+    parser.add_argument("--files", type=int, default=100, help="Files per leaf folder. Default is 100")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp()
+    try:
+        roots = create_tree(root, args.folders, args.files)
+        manifest_file = os.path.join(root, "manifest")
+        for name, load in (("cold (no manifest)", False), ("warm (manifest)", True)):
+            duration, files, scanner = scan(manifest_file, roots, load)
+            print("{}:".format(name))
+            print("  {:.2f}ms for {} files".format(duration * 1000, files))
+            print("  directories listed: {}. reused: {}".format(scanner.dirs_listed, scanner.dirs_reused))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""Benchmark the latency from Driver.pulse() to the hw_driver.pulse() call.
+
+Boots the driver test machine on the smart_virtual platform and pulses a coil
+many times. The legacy pulse path (verify settings, allocate PulseSettings and
+send a BCP driver event on every pulse) is compared to the cached pulse
+profiles with and without a BCP client monitoring drivers.
+"""
+import argparse
+import time
+
+from mpf.core.flight_recorder import KIND_PULSE
+from mpf.platforms.interfaces.driver_platform_interface import PulseSettings
+from mpf.tests.test_DeviceDriver import TestDeviceDriver
+
+
+def legacy_pulse(driver, pulse_ms=None, pulse_power=None, max_wait_ms=None):
+    """Pulse a driver like before pulse profiles were cached."""
+    # pylint: disable-msg=protected-access
+    pulse_ms = driver.get_and_verify_pulse_ms(pulse_ms)
+    pulse_power = driver.get_and_verify_pulse_power(pulse_power)
+    del max_wait_ms
+    driver.config['psu'].notify_about_instant_pulse(pulse_ms)
+    if driver.machine.events.flight_recorder:
+        driver.machine.events.flight_recorder.record(KIND_PULSE, driver.name, pulse_ms)
+    driver.info_log("Pulsing Driver for %sms (%s pulse_power)", pulse_ms, pulse_power)
+    driver.hw_driver.pulse(PulseSettings(power=pulse_power, duration=pulse_ms))
+    driver.machine.bcp.interface.send_driver_event(action="pulse", name=driver.name,
+                                                   number=driver.config['number'],
+                                                   pulse_ms=pulse_ms, pulse_power=pulse_power)
+
+
+class NullBcpClient:
+
+    """BCP client which drops all messages."""
+
+    encoding_key = None
+
+    def send(self, bcp_command, kwargs):
+        """Drop message."""
+
+
+class Benchmark:
+
+    """Pulses a coil and records the time until the platform is called."""
+
+    def __init__(self):
+        """Boot test machine."""
+        self.test = TestDeviceDriver("test_pulse_profiles")
+        self.test.setUp()
+        self.coil = self.test.machine.coils.coil_02
+        # info logging is off in a production machine
+        self.coil._info_to_console = False     # pylint: disable-msg=protected-access
+        self.coil.hw_driver.pulse = self._hw_pulse
+        self._start = 0.0
+        self.latencies = []
+        self.durations = []
+
+    def _hw_pulse(self, pulse_settings):
+        del pulse_settings
+        self.latencies.append(time.perf_counter() - self._start)
+
+    def run(self, pulse, count):
+        """Pulse count times and return sorted latencies and sorted durations of the pulse() calls."""
+        self.latencies = []
+        self.durations = []
+        for _ in range(count):
+            self._start = time.perf_counter()
+            pulse()
+            self.durations.append(time.perf_counter() - self._start)
+        return sorted(self.latencies), sorted(self.durations)
+
+    def stop(self):
+        """Stop test machine."""
+        self.test.tearDown()
+
+
+def _format_percentiles(values):
+    return "p50 {:.2f}us p99 {:.2f}us max {:.2f}us".format(
+        values[len(values) // 2] * 1000000, values[int(len(values) * .99)] * 1000000, values[-1] * 1000000)
+
+
+def main():
+    """Run benchmark for the legacy and the cached pulse path."""
+    parser = argparse.ArgumentParser(description='Benchmarks Driver.pulse()')
+    parser.add_argument("--pulses", type=int, default=20000, help="Number of pulses. Default is 20000")
+    args = parser.parse_args()
+
+    benchmark = Benchmark()
+    client = NullBcpClient()
+    transport = benchmark.test.machine.bcp.transport
+    coil = benchmark.coil
+    variants = [
+        ("legacy", lambda: legacy_pulse(coil), False),
+        ("pulse profile, no BCP monitor", coil.pulse, False),
+        ("pulse profile, BCP monitor", coil.pulse, True),
+    ]
+    for name, pulse, monitor in variants:
+        if monitor:
+            transport.add_handler_to_transport("_monitor_drivers", client)
+        latencies, durations = benchmark.run(pulse, args.pulses)
+        if monitor:
+            transport.remove_transport_from_handle("_monitor_drivers", client)
+        print("{}:".format(name))
+        print("  pulse() to hw_driver.pulse(): {}".format(_format_percentiles(latencies)))
+        print("  whole pulse() call: {}".format(_format_percentiles(durations)))
+
+    benchmark.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/python3
+"""Benchmark the LISY switch poller against a simulated serial link.
+
+A fake LISY answers every poll after the time it takes to transfer the request
+and the reply at the given baud rate. The benchmark measures how many switch
+changes per second can be drained and the latency from a switch change on the
+fake hardware until MPF sees it.
+"""
+import argparse
+import asyncio
+import socket
+import time
+from collections import deque
+
+from mpf.platforms.lisy.defines import LisyDefines
+from mpf.platforms.lisy.lisy import LisySwitchPoller
+
+
+class FakeLisy(asyncio.Protocol):
+
+    """Answers SwitchesGetChangedSwitches with queued switch changes like a LISY on a serial line."""
+
+    def __init__(self, loop, baud):
+        """Initialise fake LISY."""
+        self.loop = loop
+        # 10 bits per byte. one byte request and one byte reply
+        self.round_trip = 20 / baud
+        self.transport = None
+        self.changes = deque()
+        self._busy_until = 0.0
+
+    def connection_made(self, transport):
+        """Store transport."""
+        self.transport = transport
+
+    def data_received(self, data):
+        """Schedule one reply per request. The link can only transfer one request at a time."""
+        for byte in data:
+            assert byte == LisyDefines.SwitchesGetChangedSwitches
+            self._busy_until = max(self._busy_until, self.loop.time()) + self.round_trip
+            self.loop.call_at(self._busy_until, self._reply)
+
+    def _reply(self):
+        if self.changes:
+            number, state, _ = self.changes[0]
+            self.changes.popleft()
+            self.transport.write(bytes([number | (0b10000000 if state else 0)]))
+        else:
+            self.transport.write(bytes([127]))
+
+    def add_change(self, number, state):
+        """Add a switch change with the current time."""
+        self.changes.append((number, state, time.perf_counter()))
+
+
+class Benchmark:
+
+    """Runs the poller against the fake LISY and records latencies."""
+
+    def __init__(self, loop, baud, depth, min_backoff, max_backoff):
+        """Connect poller and fake LISY."""
+        self.loop = loop
+        self.device = FakeLisy(loop, baud)
+        self.sent = deque()
+        self.latencies = []
+        device_socket, mpf_socket = socket.socketpair()
+        loop.run_until_complete(loop.connect_accepted_socket(lambda: self.device, device_socket))
+        reader, writer = loop.run_until_complete(asyncio.open_connection(sock=mpf_socket, loop=loop))
+        self.poller = LisySwitchPoller(reader, writer.write, self._switch_changed, loop, depth, max_backoff,
+                                       min_backoff)
+        self.task = loop.create_task(self.poller.run())
+
+    def _switch_changed(self, number, state):
+        del number
+        del state
+        self.latencies.append(time.perf_counter() - self.sent.popleft())
+
+    def add_change(self, number, state):
+        """Change a switch on the fake hardware."""
+        self.device.add_change(number, state)
+        self.sent.append(time.perf_counter())
+
+    def drain(self, count):
+        """Return switch changes per second when count changes are queued at once."""
+        for i in range(count):
+            self.add_change(i % 64, i % 2)
+        start = time.perf_counter()
+        while self.sent:
+            self.loop.run_until_complete(asyncio.sleep(.001, loop=self.loop))
+        return count / (time.perf_counter() - start)
+
+    def bursts(self, bursts, size, interval):
+        """Create bursts of switch changes and return the latencies."""
+        self.latencies = []
+        for _ in range(bursts):
+            for i in range(size):
+                self.add_change(i, 1)
+            self.loop.run_until_complete(asyncio.sleep(interval, loop=self.loop))
+        while self.sent:
+            self.loop.run_until_complete(asyncio.sleep(.001, loop=self.loop))
+        return sorted(self.latencies)
+
+    def stop(self):
+        """Stop poller."""
+        self.task.cancel()
+        try:
+            self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError:
+            pass
+
+
+def main():
+    """Run benchmark for the legacy and the pipelined poller."""
+    parser = argparse.ArgumentParser(description='Benchmarks the LISY switch poller')
+    parser.add_argument("--baud", type=int, default=115200, help="Simulated baud rate. Default is 115200")
+    parser.add_argument("--depth", type=int, default=4, help="Requests in flight. Default is 4")
+    parser.add_argument("--poll-hz", type=int, default=1000, help="Idle poll rate. Default is 1000")
+    parser.add_argument("--changes", type=int, default=5000, help="Changes for the drain test. Default is 5000")
+    parser.add_argument("--bursts", type=int, default=50, help="Number of bursts. Default is 50")
+    parser.add_argument("--burst-size", type=int, default=8, help="Changes per burst. Default is 8")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    max_backoff = 1 / args.poll_hz
+    variants = [("legacy (1 in flight, fixed sleep)", 1, max_backoff),
+                ("pipelined ({} in flight, adaptive)".format(args.depth), args.depth, None)]
+
+    for name, depth, min_backoff in variants:
+        benchmark = Benchmark(loop, args.baud, depth, min_backoff, max_backoff)
+        rate = benchmark.drain(args.changes)
+        latencies = benchmark.bursts(args.bursts, args.burst_size, .02)
+        polls = benchmark.poller.polls
+        benchmark.stop()
+        print("{}:".format(name))
+        print("  drain: {:.0f} switch changes/s".format(rate))
+        print("  burst latency: p50 {:.3f}ms p99 {:.3f}ms max {:.3f}ms".format(
+            latencies[len(latencies) // 2] * 1000, latencies[int(len(latencies) * .99)] * 1000,
+            latencies[-1] * 1000))
+        print("  polls sent: {}".format(polls))
+
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
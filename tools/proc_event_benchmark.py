@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+"""Benchmark P-ROC event dispatch and switch processing.
+
+Synthetic get_events() batches are fed to the legacy if/elif dispatch (one
+process_switch_by_num call with a linear switch scan per event) and to the
+dispatch table with batched switch processing. Switch handlers are replaced by
+a counter so only dispatch, lookup and bounce filtering are measured.
+"""
+import argparse
+import random
+import time
+
+from mpf.core.switch_controller import SwitchController
+from mpf.platforms.p_roc_common import PROCBasePlatform
+
+
+class EventTypes:
+
+    """Event type constants like in pinproc."""
+
+    EventTypeSwitchClosedDebounced = 1
+    EventTypeSwitchOpenDebounced = 2
+    EventTypeSwitchClosedNondebounced = 3
+    EventTypeSwitchOpenNondebounced = 4
+    EventTypeDMDFrameDisplayed = 5
+
+
+class FakeHwSwitch:
+
+    """Hardware switch with a number."""
+
+    def __init__(self, number):
+        """Set number."""
+        self.number = number
+
+
+class FakeSwitch:
+
+    """Switch with the attributes used by the switch lookup."""
+
+    def __init__(self, number, platform):
+        """Initialise inactive switch."""
+        self.hw_switch = FakeHwSwitch(number)
+        self.platform = platform
+        self.hw_state = 0
+
+
+class FakeMachine:
+
+    """Machine with switches and a switch controller."""
+
+    def __init__(self):
+        """Initialise empty machine."""
+        self.switches = []
+        self.switch_controller = None
+
+
+class BenchmarkSwitchController(SwitchController):
+
+    """Switch controller which counts handler runs instead of running handlers."""
+
+    def __init__(self, machine):    # pylint: disable-msg=super-init-not-called
+        """Initialise without registering for events."""
+        self.machine = machine
+        self._initialised = True
+        self._switches_by_number = dict()
+        self.bounces_dropped = 0
+        self.handler_runs = 0
+
+    def process_switch_obj(self, obj, state, logical):
+        """Count handler run and update hw state."""
+        del logical
+        self.handler_runs += 1
+        obj.hw_state = state
+
+    def legacy_process_switch_by_num(self, num, state, platform):
+        """Find the switch with a linear scan like before the index."""
+        for switch in self.machine.switches:
+            if switch.hw_switch.number == num and switch.platform == platform:
+                self.process_switch_obj(obj=switch, state=state, logical=False)
+                return
+
+
+class FakePlatform:
+
+    """Platform with the dispatch tables of PROCBasePlatform."""
+
+    def __init__(self, machine):
+        """Build dispatch tables."""
+        self.machine = machine
+        self.pinproc = EventTypes
+        self.log = None
+        self._switch_event_states = {
+            EventTypes.EventTypeSwitchClosedDebounced: (1, True),
+            EventTypes.EventTypeSwitchOpenDebounced: (0, True),
+            EventTypes.EventTypeSwitchClosedNondebounced: (1, False),
+            EventTypes.EventTypeSwitchOpenNondebounced: (0, False),
+        }
+        self._event_handlers = {EventTypes.EventTypeDMDFrameDisplayed: lambda value, changes: None}
+
+    def tick(self, events):
+        """Dispatch events using the dispatch table."""
+        PROCBasePlatform._process_events(self, events)  # pylint: disable-msg=protected-access
+
+    def legacy_tick(self, events):
+        """Dispatch events like the old if/elif chain."""
+        for event in events:
+            event_type = event['type']
+            event_value = event['value']
+            if event_type == self.pinproc.EventTypeDMDFrameDisplayed:
+                pass
+            elif event_type == self.pinproc.EventTypeSwitchClosedDebounced:
+                self.machine.switch_controller.legacy_process_switch_by_num(
+                    state=1, num=event_value, platform=self)
+            elif event_type == self.pinproc.EventTypeSwitchOpenDebounced:
+                self.machine.switch_controller.legacy_process_switch_by_num(
+                    state=0, num=event_value, platform=self)
+            elif event_type == self.pinproc.EventTypeSwitchClosedNondebounced:
+                self.machine.switch_controller.legacy_process_switch_by_num(
+                    state=1, num=event_value, platform=self)
+            elif event_type == self.pinproc.EventTypeSwitchOpenNondebounced:
+                self.machine.switch_controller.legacy_process_switch_by_num(
+                    state=0, num=event_value, platform=self)
+
+
+def generate_batches(count, switch_count, batch_size, bounce_rate, seed):
+    """Return batches of count events. Switches toggle and bounce back with bounce_rate."""
+    rand = random.Random(seed)
+    states = [0] * switch_count
+    events = []
+    while len(events) < count:
+        if rand.random() < .02:
+            events.append({'type': EventTypes.EventTypeDMDFrameDisplayed, 'value': 0})
+            continue
+        number = rand.randrange(switch_count)
+        debounced = rand.random() < .5
+        states[number] ^= 1
+        events.append({'type': _event_type(states[number], debounced), 'value': number})
+        if rand.random() < bounce_rate:
+            states[number] ^= 1
+            events.append({'type': _event_type(states[number], debounced), 'value': number})
+    events = events[:count]
+    return [events[i:i + batch_size] for i in range(0, count, batch_size)]
+
+
+def _event_type(state, debounced):
+    if debounced:
+        return EventTypes.EventTypeSwitchClosedDebounced if state else EventTypes.EventTypeSwitchOpenDebounced
+    return EventTypes.EventTypeSwitchClosedNondebounced if state else EventTypes.EventTypeSwitchOpenNondebounced
+
+
+def run(batches, switch_count, legacy, repeat):
+    """Feed all batches and return the best time and the number of handler runs."""
+    best = None
+    handler_runs = 0
+    for _ in range(repeat):
+        machine = FakeMachine()
+        platform = FakePlatform(machine)
+        machine.switch_controller = BenchmarkSwitchController(machine)
+        machine.switches = [FakeSwitch(number, platform) for number in range(switch_count)]
+        tick = platform.legacy_tick if legacy else platform.tick
+        start = time.perf_counter()
+        for batch in batches:
+            tick(batch)
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+        handler_runs = machine.switch_controller.handler_runs
+    return best, handler_runs
+
+
+def main():
+    """Run benchmark for the legacy and the table driven dispatch."""
+    parser = argparse.ArgumentParser(description='Benchmarks P-ROC event dispatch')
+    parser.add_argument("--events", type=int, default=10000, help="Number of events. Default is 10000")
+    parser.add_argument("--switches", type=int, default=128, help="Number of switches. Default is 128")
+    parser.add_argument("--batch-size", type=int, default=64, help="Events per get_events(). Default is 64")
+    parser.add_argument("--bounce-rate", type=float, default=.1,
+                        help="Probability that a change bounces back in the same batch. Default is 0.1")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant. Best is reported. Default is 5")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed. Default is 1")
+    args = parser.parse_args()
+
+    batches = generate_batches(args.events, args.switches, args.batch_size, args.bounce_rate, args.seed)
+    for name, legacy in (("legacy (if/elif, one call per event)", True), ("dispatch table, batched", False)):
+        duration, handler_runs = run(batches, args.switches, legacy, args.repeat)
+        print("{}:".format(name))
+        print("  {:.2f}ms for {} events ({:.2f}us/event)".format(duration * 1000, args.events,
+                                                               duration / args.events * 1000000))
+        print("  switch handler runs: {}".format(handler_runs))
+
+
+if __name__ == '__main__':
+    main()
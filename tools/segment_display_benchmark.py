@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+"""Benchmark segment displays showing player variables.
+
+Creates many score displays which each show a player variable and have some
+lower priority texts on their stack. All variables change at 60Hz. The legacy
+display (sort the stack, build and format a new template and subscribe again
+on every change, never cancel subscriptions of variables which did not
+change) is compared to the priority-indexed stack with cached, compiled
+templates.
+"""
+import argparse
+import asyncio
+import time
+from operator import attrgetter
+
+from functools import partial
+
+from mpf.core.placeholder_manager import MpfFormatter, TemplateEvalError
+from mpf.core.utility_functions import Util
+from mpf.devices.segment_display import SegmentDisplay, TextStack
+from mpf.tests.test_SegmentDisplay import TestSegmentDisplay
+
+
+class LegacyTextTemplate:
+
+    """Text template which formats the text with a new formatter on every evaluation."""
+
+    def __init__(self, machine, text):
+        """Initialise template."""
+        self.machine = machine
+        self.text = text
+
+    def evaluate_and_subscribe(self, parameters):
+        """Evaluate placeholder to string and subscribe to changes."""
+        f = MpfFormatter(self.machine, parameters, True)
+        value = f.format(self.text)
+        subscriptions = f.subscriptions
+        if not subscriptions:
+            future = asyncio.Future(loop=self.machine.clock.loop)
+        elif len(subscriptions) == 1:
+            future = subscriptions[0]
+        else:
+            future = Util.any(subscriptions, loop=self.machine.clock.loop)
+        return value, Util.ensure_future(future, loop=self.machine.clock.loop)
+
+
+def legacy_evaluate_and_subscribe_template(placeholder_manager, template, parameters):
+    """Evaluate and subscribe template without cancelling the other subscriptions."""
+    # pylint: disable-msg=protected-access
+    try:
+        value, subscriptions = placeholder_manager._eval(template, parameters, True)
+    except TemplateEvalError as e:
+        value = e
+        subscriptions = e.subscriptions
+
+    loop = placeholder_manager.machine.clock.loop
+    if not subscriptions:
+        future = asyncio.Future(loop=loop)
+    elif len(subscriptions) == 1:
+        future = subscriptions[0]
+    else:
+        future = Util.any(subscriptions, loop=loop)
+    return value, Util.ensure_future(future, loop=loop)
+
+
+class LegacySegmentDisplay(SegmentDisplay):
+
+    """Segment display like before the text stack was indexed."""
+
+    def add_text(self, text, priority=0, key=None):
+        """Add text to display stack."""
+        self._text_stack[:] = [x for x in self._text_stack if x.key != key]
+        self._text_stack.append(TextStack(text, priority, key))
+        self._update_stack()
+
+    def _update_stack(self):
+        """Sort stack and show top entry on display."""
+        self._text_stack.sort(key=attrgetter("priority"), reverse=True)
+        self._current_placeholder = LegacyTextTemplate(self.machine, self._text_stack[0].text)
+        self._legacy_update_display()
+
+    def _legacy_update_display(self, *args, **kwargs):
+        """Update display to current text."""
+        del args
+        del kwargs
+        new_text, future = self._current_placeholder.evaluate_and_subscribe({})
+        future.add_done_callback(self._legacy_update_display)
+        if new_text != self.text:
+            self.text = new_text
+            self.hw_display.set_text(self.text, flashing=self.flashing)
+
+
+class CountingHwDisplay:
+
+    """Hardware display which counts updates."""
+
+    def __init__(self):
+        """Initialise empty display."""
+        self.updates = 0
+        self.text = ""
+
+    def set_text(self, text, flashing):
+        """Count update."""
+        del flashing
+        self.updates += 1
+        self.text = text
+
+
+class Benchmark:
+
+    """Runs a game with many displays on the test machine."""
+
+    def __init__(self, display_cls, displays, texts_per_display, legacy):
+        """Boot test machine, start a game and add displays."""
+        self.test = TestSegmentDisplay("test_scoring")
+        self.test.setUp()
+        if legacy:
+            machine = self.test.machine
+            machine.placeholder_manager.evaluate_and_subscribe_template = partial(
+                legacy_evaluate_and_subscribe_template, machine.placeholder_manager)
+        self.test.start_game()
+        self.player = self.test.machine.game.player
+        self.displays = []
+        for number in range(displays):
+            display = display_cls(self.test.machine, "bench{}".format(number))
+            display.hw_display = CountingHwDisplay()
+            self.player["bench_score{}".format(number)] = 0
+            # texts of other shows/modes below the score
+            for text_number in range(texts_per_display - 1):
+                display.add_text("TEXT{}".format(text_number), -1 - text_number, "text{}".format(text_number))
+            display.add_text("{{current_player.bench_score{}:d}}".format(number), 0, "score")
+            self.displays.append(display)
+
+    def run(self, frames):
+        """Change all variables every frame and return time per frame and display updates."""
+        start = time.perf_counter()
+        for _ in range(frames):
+            for number in range(len(self.displays)):
+                self.player["bench_score{}".format(number)] += 10
+            self.test.advance_time_and_run(1 / 60)
+        duration = time.perf_counter() - start
+        for number, display in enumerate(self.displays):
+            assert display.hw_display.text == str(frames * 10), display.hw_display.text
+            del number
+        return duration / frames, sum(display.hw_display.updates for display in self.displays)
+
+    def stop(self):
+        """Stop test machine."""
+        self.test.tearDown()
+
+
+def main():
+    """Run benchmark for the legacy and the indexed display."""
+    parser = argparse.ArgumentParser(description='Benchmarks segment displays')
+    parser.add_argument("--displays", type=int, default=48, help="Number of score displays. Default is 48")
+    parser.add_argument("--texts", type=int, default=3, help="Texts on the stack of every display. Default is 3")
+    parser.add_argument("--frames", type=int, default=60, help="Number of frames at 60Hz. Default is 60")
+    args = parser.parse_args()
+
+    variants = [
+        ("legacy", LegacySegmentDisplay, True),
+        ("indexed stack, cached templates", SegmentDisplay, False),
+    ]
+    for name, display_cls, legacy in variants:
+        benchmark = Benchmark(display_cls, args.displays, args.texts, legacy)
+        frame_time, updates = benchmark.run(args.frames)
+        handlers = len(benchmark.test.machine.events.registered_handlers.get("player_turn_started", []))
+        benchmark.stop()
+        print("{}:".format(name))
+        print("  {:.2f}ms per frame for {} displays".format(frame_time * 1000, args.displays))
+        print("  hardware updates: {}. player_turn_started handlers: {}".format(updates, handlers))
+
+
+if __name__ == '__main__':
+    main()